@@ -7,9 +7,34 @@ FFmpeg를 subprocess로 직접 호출 (Python 3.13 호환)
 """
 
 import os
+import re
 import subprocess
 import shutil
 import json
+import threading
+import time
+import wave
+from collections import deque
+
+from cache_store import LruFileCache, default_cache_dir, file_digest, make_key
+
+
+FFMPEG_NOT_FOUND_MSG = ("FFmpeg not found. Please install FFmpeg and add to PATH.\n"
+                        "Download: https://ffmpeg.org/download.html")
+
+# FFmpeg stderr 출력에서 입력 길이 추출 (ffprobe가 없을 때 사용)
+_DURATION_RE = re.compile(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)')
+
+# 분석/정규화 변환에서 공통으로 사용하는 Mono 다운믹스 필터
+_MONO_DOWNMIX_FILTER = 'aformat=channel_layouts=mono'
+
+# silencedetect 필터 출력
+_SILENCE_START_RE = re.compile(r'silence_start:\s*(-?[\d.]+)')
+_SILENCE_END_RE = re.compile(r'silence_end:\s*(-?[\d.]+)')
+
+# 변환 캐시 설정 (환경 변수로 변경 가능)
+CACHE_MAX_MB_ENV = 'AUDIO_MUX_CACHE_MAX_MB'
+DEFAULT_CACHE_MAX_MB = 2048
 
 
 class AudioConverter:
@@ -19,96 +44,253 @@ class AudioConverter:
     SAMPLE_WIDTH = 2  # 16-bit
     CHANNELS = 1  # Mono
 
+    # 변환 명령(FFmpeg 인수)이 바뀌면 올려서 이전 캐시 무효화
+    CONVERTER_VERSION = 1
+
+    # 음량 정규화 (EBU R128)
+    TARGET_LUFS = -16.0  # 목표 통합 음량
+    TRUE_PEAK_LIMIT = -1.0  # 정규화 후 최대 True Peak (dBTP)
+
+    # 무음 판정 기준
+    SILENCE_THRESHOLD_DB = -50
+    SILENCE_MIN_SEC = 0.1
+
+    # 분석 방법이 바뀌면 올려서 이전 분석 결과 무효화
+    ANALYSIS_VERSION = 2
+
+    # 변환 결과 캐시 (get_cache()로 생성)
+    _cache = None
+    cache_enabled = True
+
+    # 분석 결과 캐시 (파일별 JSON)
+    _analysis_cache = None
+
+    @staticmethod
+    def configure_cache(directory=None, max_bytes=None, enabled=True):
+        """
+        변환 캐시 설정
+
+        Args:
+            directory: 캐시 디렉토리 (None이면 기본 위치)
+            max_bytes: 최대 용량 (None이면 기본값)
+            enabled: False면 캐시 사용 안 함
+        """
+        if max_bytes is None:
+            max_mb = int(os.environ.get(CACHE_MAX_MB_ENV, DEFAULT_CACHE_MAX_MB))
+            max_bytes = max_mb * 1024 * 1024
+
+        AudioConverter._cache = LruFileCache(
+            directory or default_cache_dir('convert'),
+            max_bytes=max_bytes,
+            suffix='.wav'
+        )
+        AudioConverter.cache_enabled = enabled
+        return AudioConverter._cache
+
+    @staticmethod
+    def get_cache():
+        """변환 캐시 반환 (최초 호출 시 기본 설정으로 생성)"""
+        if AudioConverter._cache is None:
+            AudioConverter.configure_cache(enabled=AudioConverter.cache_enabled)
+        return AudioConverter._cache
+
+    @staticmethod
+    def target_spec():
+        """출력 스펙 문자열 (캐시 키 구성용)"""
+        return (f"wav/{AudioConverter.SAMPLE_RATE}Hz/"
+                f"{AudioConverter.CHANNELS}ch/{AudioConverter.SAMPLE_WIDTH * 8}bit")
+
+    @staticmethod
+    def cache_key(input_path, processing=''):
+        """입력 파일 내용 해시 + 출력 스펙 + 처리 옵션 + 변환기 버전으로 캐시 키 생성"""
+        return make_key(file_digest(input_path),
+                        AudioConverter.target_spec(),
+                        processing,
+                        AudioConverter.CONVERTER_VERSION)
+
+    @staticmethod
+    def get_analysis_cache():
+        """분석 결과 캐시 반환"""
+        if AudioConverter._analysis_cache is None:
+            AudioConverter._analysis_cache = LruFileCache(
+                default_cache_dir('analysis'),
+                max_bytes=16 * 1024 * 1024,
+                suffix='.json'
+            )
+        return AudioConverter._analysis_cache
+
+    @staticmethod
+    def analyze(file_path, use_cache=True):
+        """
+        음량(EBU R128) 및 앞뒤 무음 분석 (FFmpeg 1회 실행)
+
+        결과는 파일 내용 해시 기준으로 캐시되어 같은 파일은 다시 분석하지 않음
+
+        Args:
+            file_path: 오디오 파일 경로
+            use_cache: 분석 캐시 사용 여부
+
+        Returns:
+            dict: 분석 결과 (integrated_lufs, true_peak_dbtp, lra, duration_sec,
+                  lead_silence_sec, trail_silence_sec), 실패 시 None
+        """
+        try:
+            cache = AudioConverter.get_analysis_cache() if use_cache else None
+            key = None
+            if cache is not None:
+                key = make_key(file_digest(file_path), 'analysis',
+                               AudioConverter.SILENCE_THRESHOLD_DB,
+                               AudioConverter.SILENCE_MIN_SEC,
+                               AudioConverter.ANALYSIS_VERSION)
+                cached_path = cache.get(key)
+                if cached_path:
+                    with open(cached_path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+
+            ffmpeg_path = find_ffmpeg_tool("ffmpeg")
+            if not ffmpeg_path:
+                return None
+
+            result = _run_analysis(ffmpeg_path, file_path)
+            if result and cache is not None:
+                cache.put_bytes(key, json.dumps(result).encode('utf-8'))
+            return result
+
+        except Exception:
+            return None
+
+    @staticmethod
+    def normalization_gain(analysis):
+        """
+        목표 음량까지의 게인 계산 (True Peak 한계 내로 제한)
+
+        Args:
+            analysis: analyze() 결과
+
+        Returns:
+            float: 게인 (dB)
+        """
+        lufs = analysis.get('integrated_lufs')
+        if lufs is None or lufs == float('-inf'):
+            return 0.0  # 무음 파일
+
+        gain = AudioConverter.TARGET_LUFS - lufs
+
+        true_peak = analysis.get('true_peak_dbtp')
+        if true_peak is not None and true_peak != float('-inf'):
+            gain = min(gain, AudioConverter.TRUE_PEAK_LIMIT - true_peak)
+
+        return round(gain, 2)
+
     @staticmethod
-    def convert(input_path, output_path):
+    def convert(input_path, output_path, use_cache=True,
+                normalize=False, trim_silence=False):
         """
         오디오 파일을 32kHz 16-bit Mono WAV로 변환
 
+        같은 입력 + 같은 스펙의 변환 결과가 캐시에 있으면 FFmpeg 없이 바로 복사
+        (진행률/취소가 필요하면 ConversionJob 사용)
+
         Args:
             input_path: 입력 파일 경로 (MP3, WAV, FLAC, etc.)
             output_path: 출력 WAV 파일 경로
+            use_cache: 변환 캐시 사용 여부
+            normalize: 목표 음량(TARGET_LUFS)으로 정규화
+            trim_silence: 앞뒤 무음 제거
 
         Returns:
             (success, message): 성공 여부 및 메시지
 
         """
-        try:
-            # 입력 파일 확인
-            if not os.path.exists(input_path):
-                return False, "Input file not found"
+        return ConversionJob(input_path, output_path, use_cache=use_cache,
+                             normalize=normalize, trim_silence=trim_silence).run()
 
-            # FFmpeg 확인
-            if not check_ffmpeg_installed():
-                return False, ("FFmpeg not found. Please install FFmpeg and add to PATH.\n"
-                             "Download: https://ffmpeg.org/download.html")
-
-            # 원본 파일 정보 가져오기
-            orig_info = AudioConverter.get_audio_info(input_path)
+    @staticmethod
+    def decode_pcm(file_path, sample_rate=22050, channels=1):
+        """
+        오디오 파일을 16-bit PCM으로 디코딩 (FFmpeg 파이프)
 
-            # FFmpeg 경로 찾기
-            ffmpeg_path = shutil.which("ffmpeg")
-            if not ffmpeg_path:
-                # PATH에 없으면 일반적인 설치 위치 확인
-                common_paths = [
-                    r"C:\ffmpeg\bin\ffmpeg.exe",
-                    r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-                ]
-                for path in common_paths:
-                    if os.path.exists(path):
-                        ffmpeg_path = path
-                        break
+        Args:
+            file_path: 오디오 파일 경로
+            sample_rate: 출력 샘플레이트 (Hz)
+            channels: 출력 채널 수
 
+        Returns:
+            bytes: s16le PCM 데이터 (실패 시 None)
+        """
+        try:
+            ffmpeg_path = find_ffmpeg_tool("ffmpeg")
             if not ffmpeg_path:
-                return False, ("FFmpeg not found. Please install FFmpeg and add to PATH.\n"
-                             "Download: https://ffmpeg.org/download.html")
+                return None
 
-            # FFmpeg 명령어 구성
-            # -i: 입력 파일
-            # -ar: 샘플레이트 (32000Hz)
-            # -ac: 채널 수 (1 = Mono)
-            # -sample_fmt: 샘플 형식 (s16 = 16-bit signed)
-            # -y: 기존 파일 덮어쓰기
             cmd = [
                 ffmpeg_path,
-                '-i', input_path,
-                '-ar', str(AudioConverter.SAMPLE_RATE),
-                '-ac', str(AudioConverter.CHANNELS),
-                '-sample_fmt', 's16',
-                '-y',
-                output_path
+                '-nostdin',
+                '-v', 'error',
+                '-i', file_path,
+                '-vn', '-sn',
+                '-ar', str(sample_rate),
+                '-ac', str(channels),
+                '-f', 's16le',
+                'pipe:1'
             ]
 
-            # FFmpeg 실행
             result = subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
             )
 
             if result.returncode != 0:
-                error_msg = result.stderr.decode('utf-8', errors='ignore')
-                return False, f"FFmpeg error: {error_msg[:200]}"
+                return None
 
-            # 변환 정보
-            if orig_info:
-                message = (f"Converted successfully\n"
-                          f"Original: {orig_info.get('sample_rate', 'unknown')}Hz, "
-                          f"{orig_info.get('channels', 'unknown')}ch, "
-                          f"{orig_info.get('bit_depth', 'unknown')}bit\n"
-                          f"Output: {AudioConverter.SAMPLE_RATE}Hz, "
-                          f"{AudioConverter.CHANNELS}ch, {AudioConverter.SAMPLE_WIDTH*8}bit")
-            else:
-                message = "Converted successfully"
+            return result.stdout
 
-            return True, message
+        except Exception:
+            return None
 
-        except FileNotFoundError:
-            return False, ("FFmpeg not found. Please install FFmpeg and add to PATH.\n"
-                         "Download: https://ffmpeg.org/download.html")
+    @staticmethod
+    def decode_pcm_file(file_path, output_path, sample_rate=44100, channels=2):
+        """
+        오디오 파일을 16-bit PCM 파일로 디코딩 (큰 파일을 메모리에 올리지 않음)
 
-        except Exception as e:
-            return False, f"Conversion error: {str(e)}"
+        Args:
+            file_path: 오디오 파일 경로
+            output_path: 출력 s16le 파일 경로
+            sample_rate: 출력 샘플레이트 (Hz)
+            channels: 출력 채널 수
+
+        Returns:
+            bool: 성공 여부
+        """
+        ffmpeg_path = find_ffmpeg_tool("ffmpeg")
+        if not ffmpeg_path:
+            return False
+
+        cmd = [
+            ffmpeg_path,
+            '-nostdin',
+            '-v', 'error',
+            '-y',
+            '-i', file_path,
+            '-vn', '-sn',
+            '-ar', str(sample_rate),
+            '-ac', str(channels),
+            '-f', 's16le',
+            output_path
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+        except OSError:
+            return False
+        return result.returncode == 0
 
     @staticmethod
     def get_audio_info(file_path):
@@ -123,18 +305,7 @@ class AudioConverter:
         """
         try:
             # ffprobe 경로 찾기
-            ffprobe_path = shutil.which("ffprobe")
-            if not ffprobe_path:
-                # PATH에 없으면 일반적인 설치 위치 확인
-                common_paths = [
-                    r"C:\ffmpeg\bin\ffprobe.exe",
-                    r"C:\Program Files\ffmpeg\bin\ffprobe.exe",
-                ]
-                for path in common_paths:
-                    if os.path.exists(path):
-                        ffprobe_path = path
-                        break
-
+            ffprobe_path = find_ffmpeg_tool("ffprobe")
             if not ffprobe_path:
                 return None
 
@@ -212,19 +383,493 @@ class AudioConverter:
         return True  # 변환 필요
 
 
-def check_ffmpeg_installed():
-    """FFmpeg 설치 여부 확인"""
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path:
-        return True
+class ConversionJob:
+    """
+    FFmpeg 변환 작업
+
+    - `-progress pipe:1`로 진행률(out_time)을 받아 입력 길이 대비 비율 계산
+    - cancel() / timeout으로 중단 가능
+    - stderr는 마지막 N줄만 보관 (메모리 제한)
+
+    run()은 블로킹 호출이므로 QThread 또는 executor에서 실행하고,
+    asyncio 루프에서는 run_async()를 await 한다.
+    """
+
+    STDERR_TAIL_LINES = 50
+
+    def __init__(self, input_path, output_path, use_cache=True,
+                 timeout=None, on_progress=None,
+                 normalize=False, trim_silence=False):
+        """
+        Args:
+            input_path: 입력 파일 경로
+            output_path: 출력 WAV 파일 경로
+            use_cache: 변환 캐시 사용 여부
+            timeout: 최대 변환 시간 (초, None이면 무제한)
+            on_progress: 진행률 콜백 f(fraction) - 0.0 ~ 1.0, 작업 스레드에서 호출됨
+            normalize: 목표 음량(TARGET_LUFS)으로 정규화
+            trim_silence: 앞뒤 무음 제거
+        """
+        self.input_path = input_path
+        self.output_path = output_path
+        self.use_cache = use_cache
+        self.normalize = normalize
+        self.trim_silence = trim_silence
+        self.timeout = timeout
+        self.on_progress = on_progress
+
+        self.progress = 0.0
+        self.duration_sec = None
+        self.stderr_tail = deque(maxlen=self.STDERR_TAIL_LINES)
+        self.cancelled = False
+        self.timed_out = False
+        self._process = None
+
+    def cancel(self):
+        """변환 취소 (다른 스레드에서 호출 가능)"""
+        self.cancelled = True
+
+    def run(self):
+        """
+        변환 실행 (블로킹)
+
+        Returns:
+            (success, message): 성공 여부 및 메시지
+        """
+        input_path = self.input_path
+        output_path = self.output_path
+        tmp_path = output_path + '.part'
+
+        try:
+            # 입력 파일 확인
+            if not os.path.exists(input_path):
+                return False, "Input file not found"
+
+            # 캐시 확인
+            cache = None
+            cache_key = None
+            if self.use_cache and AudioConverter.cache_enabled:
+                cache = AudioConverter.get_cache()
+                cache_key = AudioConverter.cache_key(input_path, self._processing_spec())
+                if cache.fetch(cache_key, output_path):
+                    self._set_progress(1.0)
+                    return True, (f"Converted successfully (cache hit)\n"
+                                  f"Output: {AudioConverter.SAMPLE_RATE}Hz, "
+                                  f"{AudioConverter.CHANNELS}ch, {AudioConverter.SAMPLE_WIDTH*8}bit")
+
+            # FFmpeg 경로 찾기
+            ffmpeg_path = find_ffmpeg_tool("ffmpeg")
+            if not ffmpeg_path:
+                return False, FFMPEG_NOT_FOUND_MSG
+
+            # 원본 파일 정보 가져오기 (진행률 계산용 길이 포함)
+            orig_info = AudioConverter.get_audio_info(input_path)
+            if orig_info and orig_info.get('duration_sec'):
+                self.duration_sec = orig_info['duration_sec']
+
+            # 음량/무음 분석 결과로 필터 구성
+            filters, notes = self._build_filters()
+
+            # FFmpeg 명령어 구성
+            # -i: 입력 파일
+            # -af: 무음 제거(atrim) / 음량 보정(volume) 필터
+            # -ar: 샘플레이트 (32000Hz)
+            # -ac: 채널 수 (1 = Mono)
+            # -sample_fmt: 샘플 형식 (s16 = 16-bit signed)
+            # -f wav: 출력 형식 (임시 파일 확장자 대신 명시)
+            # -progress pipe:1: 진행 상황을 stdout으로 (key=value)
+            # -nostats: stderr 통계 출력 끔
+            # -y: 기존 파일 덮어쓰기
+            # 임시 파일로 변환 후 교체 (캐시와 하드링크된 기존 출력 파일 보호)
+            cmd = [
+                ffmpeg_path,
+                '-nostdin',
+                '-i', input_path,
+            ]
+            if filters:
+                cmd += ['-af', ','.join(filters)]
+            cmd += [
+                '-ar', str(AudioConverter.SAMPLE_RATE),
+                '-ac', str(AudioConverter.CHANNELS),
+                '-sample_fmt', 's16',
+                '-f', 'wav',
+                '-progress', 'pipe:1',
+                '-nostats',
+                '-y',
+                tmp_path
+            ]
+
+            returncode = self._run_ffmpeg(cmd)
+
+            if returncode != 0:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if self.cancelled:
+                    return False, "Cancelled by user"
+                if self.timed_out:
+                    return False, f"Conversion timeout ({self.timeout}s)"
+                error_msg = '\n'.join(self.stderr_tail)
+                return False, f"FFmpeg error: {error_msg[-200:]}"
+
+            os.replace(tmp_path, output_path)
+            self._set_progress(1.0)
+
+            # 캐시에 저장
+            if cache is not None:
+                try:
+                    cache.put(cache_key, output_path)
+                except OSError:
+                    pass  # 캐시 저장 실패는 변환 결과에 영향 없음
+
+            # 변환 정보
+            if orig_info:
+                message = (f"Converted successfully\n"
+                          f"Original: {orig_info.get('sample_rate', 'unknown')}Hz, "
+                          f"{orig_info.get('channels', 'unknown')}ch, "
+                          f"{orig_info.get('bit_depth', 'unknown')}bit\n"
+                          f"Output: {AudioConverter.SAMPLE_RATE}Hz, "
+                          f"{AudioConverter.CHANNELS}ch, {AudioConverter.SAMPLE_WIDTH*8}bit")
+            else:
+                message = "Converted successfully"
+
+            if notes:
+                message += "\n" + "\n".join(notes)
+
+            return True, message
+
+        except FileNotFoundError:
+            return False, FFMPEG_NOT_FOUND_MSG
+
+        except Exception as e:
+            return False, f"Conversion error: {str(e)}"
+
+    def _processing_spec(self):
+        """정규화/무음 제거 옵션 문자열 (캐시 키 구성용)"""
+        parts = []
+        if self.normalize:
+            parts.append(f"norm={AudioConverter.TARGET_LUFS}/{AudioConverter.TRUE_PEAK_LIMIT}")
+        if self.trim_silence:
+            parts.append(f"trim={AudioConverter.SILENCE_THRESHOLD_DB}dB/{AudioConverter.SILENCE_MIN_SEC}s")
+        if parts:
+            parts.append(f"analysis={AudioConverter.ANALYSIS_VERSION}")
+        return ';'.join(parts)
+
+    def _build_filters(self):
+        """
+        분석 결과에 따른 FFmpeg 오디오 필터 구성
+
+        Returns:
+            (filters, notes): 필터 목록, 변환 메시지에 추가할 설명
+        """
+        filters = []
+        notes = []
+
+        if not (self.normalize or self.trim_silence):
+            return filters, notes
+
+        analysis = AudioConverter.analyze(self.input_path)
+        if not analysis:
+            notes.append("Analysis failed - loudness/silence processing skipped")
+            return filters, notes
+
+        # 분석 패스와 같은 방식으로 Mono 다운믹스 (측정값과 게인 기준 일치)
+        filters.append(_MONO_DOWNMIX_FILTER)
+
+        if self.trim_silence:
+            duration = analysis['duration_sec']
+            start = analysis['lead_silence_sec']
+            end = duration - analysis['trail_silence_sec']
+            if duration > 0 and end - start > AudioConverter.SILENCE_MIN_SEC and (start > 0 or end < duration):
+                filters.append(f"atrim=start={start:.3f}:end={end:.3f}")
+                filters.append("asetpts=PTS-STARTPTS")
+                self.duration_sec = end - start
+                notes.append(f"Trimmed silence: {start:.2f}s lead, "
+                             f"{analysis['trail_silence_sec']:.2f}s tail")
+
+        if self.normalize:
+            gain = AudioConverter.normalization_gain(analysis)
+            if gain != 0.0:
+                filters.append(f"volume={gain:.2f}dB")
+            notes.append(f"Loudness: {analysis['integrated_lufs']:.1f} LUFS, "
+                         f"gain {gain:+.1f}dB (target {AudioConverter.TARGET_LUFS:.0f} LUFS)")
+
+        return filters, notes
+
+    async def run_async(self):
+        """
+        asyncio용 변환 실행
+
+        on_progress 콜백은 이벤트 루프 스레드에서 호출되고,
+        await 중인 태스크가 취소되면 FFmpeg도 중단된다.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        callback = self.on_progress
+        if callback is not None:
+            self.on_progress = lambda fraction: loop.call_soon_threadsafe(callback, fraction)
+
+        try:
+            return await loop.run_in_executor(None, self.run)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        finally:
+            self.on_progress = callback
+
+    def _run_ffmpeg(self, cmd):
+        """FFmpeg 실행 및 진행률/취소/타임아웃 감시"""
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+
+        readers = [
+            threading.Thread(target=self._read_progress, daemon=True),
+            threading.Thread(target=self._read_stderr, daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        start_time = time.monotonic()
+        while True:
+            try:
+                returncode = self._process.wait(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            if self.cancelled:
+                self._process.kill()
+            elif self.timeout and (time.monotonic() - start_time) > self.timeout:
+                self.timed_out = True
+                self._process.kill()
+
+        for reader in readers:
+            reader.join(timeout=1.0)
+
+        return returncode
+
+    def _read_progress(self):
+        """stdout의 -progress 출력 파싱 (out_time_us 기준)"""
+        for raw in self._process.stdout:
+            line = raw.decode('ascii', errors='ignore').strip()
+            key, _, value = line.partition('=')
+
+            if key == 'out_time_us' and self.duration_sec:
+                try:
+                    out_sec = int(value) / 1000000.0
+                except ValueError:
+                    continue  # 초반에는 'N/A'
+                self._set_progress(min(out_sec / self.duration_sec, 0.99))
+
+    def _read_stderr(self):
+        """stderr를 줄 단위로 읽어 마지막 N줄만 보관"""
+        for raw in self._process.stderr:
+            line = raw.decode('utf-8', errors='ignore').rstrip()
+            if not line:
+                continue
+            self.stderr_tail.append(line)
+
+            # ffprobe가 없으면 FFmpeg 입력 정보에서 길이 추출
+            if self.duration_sec is None:
+                match = _DURATION_RE.search(line)
+                if match:
+                    h, m, sec = match.groups()
+                    self.duration_sec = int(h) * 3600 + int(m) * 60 + float(sec)
+
+    def _set_progress(self, fraction):
+        """진행률 갱신 및 콜백 호출"""
+        self.progress = fraction
+        if self.on_progress is not None:
+            self.on_progress(fraction)
+
+
+def _run_analysis(ffmpeg_path, file_path):
+    """
+    FFmpeg 분석 패스 (silencedetect + loudnorm 측정) 실행 및 결과 파싱
+
+    stderr를 줄 단위로 처리하므로 긴 파일도 출력 전체를 메모리에 두지 않음
+    """
+    cmd = [
+        ffmpeg_path,
+        '-nostdin',
+        '-hide_banner',
+        '-i', file_path,
+        '-vn', '-sn',
+        # 출력과 같은 채널 구성(Mono)으로 측정해야 게인이 정확함
+        '-af', (f"{_MONO_DOWNMIX_FILTER},"
+                f"silencedetect=noise={AudioConverter.SILENCE_THRESHOLD_DB}dB"
+                f":d={AudioConverter.SILENCE_MIN_SEC},"
+                f"loudnorm=I={AudioConverter.TARGET_LUFS}"
+                f":TP={AudioConverter.TRUE_PEAK_LIMIT}:print_format=json"),
+        '-f', 'null', '-'
+    ]
+
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+    )
+
+    duration = 0.0
+    silences = []  # [start, end] (end가 None이면 파일 끝까지 무음)
+    json_lines = None
+
+    for raw in process.stderr:
+        line = raw.decode('utf-8', errors='ignore').strip()
+
+        if json_lines is not None:
+            json_lines.append(line)
+            if line.startswith('}'):
+                break
+            continue
+
+        if line.startswith('{'):
+            json_lines = [line]
+            continue
+
+        match = _DURATION_RE.search(line)
+        if match and not duration:
+            h, m, sec = match.groups()
+            duration = int(h) * 3600 + int(m) * 60 + float(sec)
+            continue
+
+        match = _SILENCE_START_RE.search(line)
+        if match:
+            silences.append([max(float(match.group(1)), 0.0), None])
+            continue
+
+        match = _SILENCE_END_RE.search(line)
+        if match and silences:
+            silences[-1][1] = float(match.group(1))
+
+    process.stderr.read()  # 남은 출력 비우기
+    if process.wait() != 0 or not json_lines:
+        return None
+
+    loudness = json.loads('\n'.join(json_lines))
+
+    # 앞쪽 무음: 0초에서 시작하는 첫 무음 구간
+    lead = 0.0
+    if silences and silences[0][0] <= 0.01:
+        lead = silences[0][1] if silences[0][1] is not None else duration
+
+    # 뒤쪽 무음: 파일 끝까지 이어지는 마지막 무음 구간
+    trail = 0.0
+    if silences:
+        start, end = silences[-1]
+        if end is None or end >= duration - 0.01:
+            trail = max(duration - start, 0.0)
+    if lead >= duration:
+        trail = 0.0  # 전체가 무음
+
+    return {
+        'integrated_lufs': float(loudness['input_i']),
+        'true_peak_dbtp': float(loudness['input_tp']),
+        'lra': float(loudness['input_lra']),
+        'duration_sec': duration,
+        'lead_silence_sec': round(lead, 3),
+        'trail_silence_sec': round(trail, 3),
+    }
+
+
+def read_wav_header(file_path):
+    """
+    WAV 헤더만 읽기 (FFmpeg 없이, 데이터는 읽지 않음)
+
+    Args:
+        file_path: WAV 파일 경로
+
+    Returns:
+        dict: {'sample_rate', 'channels', 'sample_width', 'frames', 'duration_sec'}
+
+    Raises:
+        wave.Error: WAV 형식이 아닌 경우 (PCM이 아닌 WAV 포함)
+        OSError: 파일을 읽을 수 없는 경우
+    """
+    with wave.open(file_path, 'rb') as wav_file:
+        framerate = wav_file.getframerate()
+        frames = wav_file.getnframes()
+        return {
+            'sample_rate': framerate,
+            'channels': wav_file.getnchannels(),
+            'sample_width': wav_file.getsampwidth(),
+            'frames': frames,
+            'duration_sec': frames / framerate if framerate else 0.0,
+        }
+
+
+def wav_spec_errors(sample_rate, sample_width, channels):
+    """
+    메인 보드 스펙(32000Hz, 16-bit, Mono) 불일치 항목
+
+    Returns:
+        list: 불일치 항목 설명 (비어 있으면 스펙 일치)
+    """
+    errors = []
+
+    if sample_rate != AudioConverter.SAMPLE_RATE:
+        errors.append(f"샘플레이트: {sample_rate}Hz (필요: {AudioConverter.SAMPLE_RATE}Hz)")
+
+    if sample_width != AudioConverter.SAMPLE_WIDTH:
+        errors.append(f"비트 깊이: {sample_width*8}bit (필요: {AudioConverter.SAMPLE_WIDTH*8}bit)")
+
+    if channels != AudioConverter.CHANNELS:
+        errors.append(f"채널: {channels}ch (필요: 1ch Mono)")
+
+    return errors
+
+
+def check_wav_spec(file_path):
+    """
+    WAV 파일이 메인 보드 스펙(32000Hz, 16-bit, Mono)에 맞는지 검사
+
+    Args:
+        file_path: WAV 파일 경로
+
+    Returns:
+        list: 불일치 항목 설명 (비어 있으면 스펙 일치)
+
+    Raises:
+        wave.Error: WAV 형식이 아닌 경우
+        OSError: 파일을 읽을 수 없는 경우
+    """
+    header = read_wav_header(file_path)
+    return wav_spec_errors(header['sample_rate'], header['sample_width'], header['channels'])
+
+
+def find_ffmpeg_tool(name):
+    """
+    FFmpeg 도구(ffmpeg, ffprobe) 실행 파일 경로 찾기
+
+    Args:
+        name: 도구 이름 ('ffmpeg' 또는 'ffprobe')
+
+    Returns:
+        str: 실행 파일 경로 (없으면 None)
+    """
+    tool_path = shutil.which(name)
+    if tool_path:
+        return tool_path
 
     # PATH에 없으면 일반적인 설치 위치 확인
     common_paths = [
-        r"C:\ffmpeg\bin\ffmpeg.exe",
-        r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+        rf"C:\ffmpeg\bin\{name}.exe",
+        rf"C:\Program Files\ffmpeg\bin\{name}.exe",
     ]
     for path in common_paths:
         if os.path.exists(path):
-            return True
+            return path
+
+    return None
 
-    return False
+
+def check_ffmpeg_installed():
+    """FFmpeg 설치 여부 확인"""
+    return find_ffmpeg_tool("ffmpeg") is not None
@@ -0,0 +1,53 @@
+"""
+bench_ansi.py
+
+로그 표시 성능
+- ansi_to_html(): 보드 로그 1줄 변환
+- MainWindow.log_message(): 로그 창에 1줄 추가 (2000줄까지 쌓이는 동안의 평균)
+"""
+
+import pytest
+
+from ansi_parser import ansi_to_html
+
+
+LOG_LINES = [
+    'OK Playing ch0: /audio/ch0/test.wav',
+    '\x1b[32mINFO: Receiving... 50%\x1b[0m',
+    '\x1b[1;31mERR 404 File not found: /audio/ch3/<missing>.wav\x1b[0m',
+    '\x1b[33mWARN\x1b[0m buffer underrun on \x1b[36mch2\x1b[0m (3 times)',
+]
+LOG_APPEND_ROUNDS = 2000
+
+
+def test_ansi_to_html(benchmark):
+    benchmark.extra_info['lines'] = len(LOG_LINES)
+
+    def convert_all():
+        return [ansi_to_html(line) for line in LOG_LINES]
+
+    assert len(benchmark(convert_all)) == len(LOG_LINES)
+
+
+@pytest.fixture(scope='module')
+def window():
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    import main
+
+    window = main.MainWindow()
+    yield window
+    window.close()
+    app.processEvents()
+
+
+@pytest.mark.parametrize('use_ansi', [False, True], ids=['plain', 'ansi'])
+def test_log_message(benchmark, window, use_ansi):
+    window.clear_log()
+    lines = iter(LOG_LINES * LOG_APPEND_ROUNDS)
+
+    def append():
+        window.log_message(next(lines), color='blue', use_ansi=use_ansi)
+
+    benchmark.pedantic(append, rounds=LOG_APPEND_ROUNDS, iterations=1)
@@ -0,0 +1,52 @@
+"""
+bench_serial.py
+
+수신 처리 성능
+- LineFramer: 같은 응답 스트림을 여러 버스트 크기로 나눠 입력
+- RxBuffer: Y-MODEM처럼 1바이트 단위 읽기
+"""
+
+import pytest
+
+from serial_core import LineFramer, RxBuffer
+
+
+LINES = [
+    'OK Playing ch0: /audio/ch0/test.wav',
+    '\x1b[32mINFO: Receiving... 50%\x1b[0m',
+    'OK STATUS',
+    '   CH0: PLAYING /audio/ch0/intro.wav',
+    '   SD: OK 15234MB free',
+    'END',
+]
+STREAM = ''.join(line + '\r\n' for line in LINES * 500).encode('utf-8')
+STREAM_LINES = len(LINES) * 500
+
+
+@pytest.mark.parametrize('burst', [1, 16, 256, 4096])
+def test_line_framer(benchmark, burst):
+    chunks = [STREAM[i:i + burst] for i in range(0, len(STREAM), burst)]
+    benchmark.extra_info['bytes'] = len(STREAM)
+    benchmark.extra_info['lines'] = STREAM_LINES
+
+    def frame_all():
+        framer = LineFramer()
+        count = 0
+        for chunk in chunks:
+            count += len(framer.feed(chunk))
+        return count
+
+    assert benchmark(frame_all) == STREAM_LINES
+
+
+def test_rx_buffer_byte_reads(benchmark):
+    acks = bytes(1024)
+
+    def feed_and_read():
+        rx = RxBuffer()
+        rx.feed(acks)
+        for _ in range(len(acks)):
+            rx.read(1, timeout=0)
+        return len(rx)
+
+    assert benchmark(feed_and_read) == 0
@@ -0,0 +1,69 @@
+"""
+bench_transfer.py
+
+Y-MODEM 전체 경로 성능 (SerialComm + YModemSender → pty 가상 보드)
+
+송신 큐, 수신 스레드 분배, 프로토콜, 가상 보드 수신까지 포함한 처리량 (POSIX 전용)
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='pty loopback requires POSIX')
+
+FILE_SIZE = 256 * 1024
+
+
+@pytest.fixture(scope='module')
+def board():
+    from loopback import LoopbackBoard
+
+    board = LoopbackBoard()
+    board.start()
+    yield board
+    board.close()
+
+
+@pytest.fixture(scope='module')
+def session(board):
+    from cli import BoardSession
+
+    session = BoardSession(board.port)
+    assert session.open()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope='module')
+def payload_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp('transfer') / 'payload.wav'
+    path.write_bytes(random.Random(2).randbytes(FILE_SIZE))
+    return str(path)
+
+
+def test_ymodem_pty_loopback(benchmark, board, session, payload_file):
+    from ymodem import YModemSender
+
+    durations = []
+
+    def start_upload():
+        if durations:
+            session.read_response(timeout=2.0)  # 이전 전송의 저장 완료 응답
+        reply = session.command(f"UPLOAD 0 {os.path.basename(payload_file)}")
+        assert reply['ok'], reply
+        return (YModemSender(session.serial, payload_file),), {}
+
+    def transfer(sender):
+        start = time.perf_counter()
+        sender.run()
+        durations.append(time.perf_counter() - start)
+
+    benchmark.pedantic(transfer, setup=start_upload, rounds=5, iterations=1)
+
+    benchmark.extra_info['bytes'] = FILE_SIZE
+    benchmark.extra_info['best_bytes_per_sec'] = round(FILE_SIZE / min(durations))
+    with open(payload_file, 'rb') as f:
+        assert board.files[os.path.basename(payload_file)] == f.read()
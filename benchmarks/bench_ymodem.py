@@ -0,0 +1,67 @@
+"""
+bench_ymodem.py
+
+Y-MODEM 프로토콜 단독 성능 (입출력 없음)
+- CRC-16, 패킷 구성
+- 메모리 안에서 바로 ACK하는 수신측으로 send_file() 실행 (프로토콜 자체의 오버헤드)
+"""
+
+import collections
+import random
+
+import pytest
+
+from ymodem_core import ACK, BLOCK_SIZE, CRC16, EOT, build_packet, crc16, run_blocking, send_file
+
+
+PAYLOAD = random.Random(0).randbytes(BLOCK_SIZE)
+FILE_SIZE = 1024 * 1024
+
+
+@pytest.fixture(scope='module')
+def payload_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp('ymodem') / 'payload.bin'
+    path.write_bytes(random.Random(1).randbytes(FILE_SIZE))
+    return str(path)
+
+
+def test_crc16_1k(benchmark):
+    benchmark.extra_info['bytes'] = BLOCK_SIZE
+    assert benchmark(crc16, PAYLOAD) == crc16(PAYLOAD)
+
+
+def test_build_packet_1k(benchmark):
+    benchmark.extra_info['bytes'] = BLOCK_SIZE
+    assert len(benchmark(build_packet, 1, PAYLOAD)) == BLOCK_SIZE + 5
+
+
+def test_build_packet_128(benchmark):
+    data = PAYLOAD[:128]
+    assert len(benchmark(build_packet, 0, data)) == 128 + 5
+
+
+def _instant_receiver():
+    """모든 프레임에 즉시 ACK (Packet 0과 EOT 뒤에는 'C')"""
+    pending = collections.deque([CRC16])
+
+    def write(frame):
+        pending.append(ACK)
+        if frame[0] == EOT or (len(frame) > 3 and frame[1] == 0 and frame[3] != 0):
+            pending.append(CRC16)
+        return True
+
+    def read(size, timeout):
+        return bytes([pending.popleft()]) if pending else b''
+
+    return write, read
+
+
+def test_send_file_in_memory(benchmark, payload_file):
+    benchmark.extra_info['bytes'] = FILE_SIZE
+
+    def transfer():
+        write, read = _instant_receiver()
+        return run_blocking(send_file(payload_file), write, read)
+
+    success, _ = benchmark.pedantic(transfer, rounds=5, iterations=1)
+    assert success
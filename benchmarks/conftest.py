@@ -0,0 +1,52 @@
+"""
+benchmarks/conftest.py
+
+pytest-benchmark 기반 성능 측정 (하드웨어 없이 실행)
+
+    pip install pytest-benchmark
+    python -m pytest benchmarks --benchmark-autosave          # 결과 저장 (.benchmarks/)
+    python -m pytest benchmarks --benchmark-compare           # 마지막 저장 결과와 비교
+    python -m pytest benchmarks --benchmark-compare=0001 --benchmark-compare-fail=mean:10%
+
+bench_*.py는 benchmarks 디렉토리를 직접 지정했을 때만 수집한다
+(일반 테스트 실행에는 포함되지 않음, pytest-benchmark가 없으면 수집하지 않음).
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+HAVE_PYTEST_BENCHMARK = importlib.util.find_spec('pytest_benchmark') is not None
+
+
+def _requested(config):
+    """명령줄에서 benchmarks 디렉토리(또는 그 안의 파일)를 지정했는지"""
+    for arg in config.args:
+        path = os.path.abspath(str(arg).split('::')[0])
+        if path == BENCH_DIR or path.startswith(BENCH_DIR + os.sep):
+            return True
+    return False
+
+
+def pytest_collect_file(file_path, parent):
+    """bench_*.py 수집 (명령줄에서 파일을 직접 지정한 경우는 pytest가 이미 수집)"""
+    if not (file_path.name.startswith('bench_') and file_path.suffix == '.py'):
+        return None
+    if not HAVE_PYTEST_BENCHMARK or not _requested(parent.config):
+        return None
+    if parent.session.isinitpath(file_path):
+        return None
+    return pytest.Module.from_parent(parent, path=file_path)
+
+
+def pytest_report_header(config):
+    if not HAVE_PYTEST_BENCHMARK and _requested(config):
+        return "pytest-benchmark not installed: bench_*.py not collected (pip install pytest-benchmark)"
+    return None
@@ -0,0 +1,78 @@
+"""
+equalizer_paint.py
+
+EqualizerWidget 그리기 성능 측정 (화면 없이 실행)
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/equalizer_paint.py
+
+막대 개수별로 update_bars() + 그리기 1프레임의 CPU 시간을 측정하고
+60 FPS 기준 CPU 사용률을 추정한다.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from equalizer_widget import EqualizerWidget
+
+
+FRAMES = 600  # 60 FPS로 10초
+TARGET_FPS = 60
+
+
+def bench(app, num_bars, width=800, height=100):
+    """막대 개수별 프레임당 CPU 시간 측정"""
+    widget = EqualizerWidget()
+    widget.set_num_bars(num_bars)
+    widget.resize(width, height)
+    widget.show()
+    app.processEvents()
+
+    # 재생 중인 음악과 비슷하게 천천히 변하는 레벨
+    rng = np.random.default_rng(0)
+    levels = np.clip(np.cumsum(rng.normal(0, 0.08, (FRAMES, num_bars)), axis=0) % 1.0, 0, 1)
+    frame = [0]
+    widget.current_levels = lambda: levels[frame[0]]
+
+    widget.start()
+    widget.timer.stop()  # 타이머 대신 직접 프레임 진행
+    widget._schedule_timer = lambda *args, **kwargs: None
+    app.processEvents()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i in range(FRAMES):
+        frame[0] = i
+        widget.update_bars()
+        app.processEvents()  # 대기 중인 paintEvent 처리
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    widget.stop()
+    widget.close()
+
+    per_frame_ms = cpu / FRAMES * 1000
+    return per_frame_ms, wall / FRAMES * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+
+    print(f"=== EqualizerWidget paint benchmark ({FRAMES} frames, "
+          f"platform={app.platformName()}) ===\n")
+    print(f"{'bars':>6} {'cpu ms/frame':>14} {'wall ms/frame':>15} {'cpu @60fps':>12}")
+
+    for num_bars in (20, 64, 128):
+        cpu_ms, wall_ms = bench(app, num_bars)
+        load = cpu_ms * TARGET_FPS / 10  # ms/frame * fps / 1000ms * 100%
+        print(f"{num_bars:>6} {cpu_ms:>14.3f} {wall_ms:>15.3f} {load:>11.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+loopback.py
+
+벤치마크용 가상 보드 (pty, POSIX 전용)
+
+pty의 한쪽 끝을 시리얼 포트로 열고, 다른 쪽에서 이 스레드가 보드처럼 응답한다.
+- HELLO → OK AUDIO_MUX loopback
+- UPLOAD <CH> <FILE> → OK Ready for Y-MODEM 후 Y-MODEM 수신 (배치 포함)
+- 그 외 → ERR 400
+"""
+
+import os
+import select
+import threading
+
+from ymodem_core import SOH, STX, EOT, ACK, NAK, CAN, CRC16, crc16
+
+
+class LoopbackBoard(threading.Thread):
+    """pty 가상 보드"""
+
+    def __init__(self):
+        import pty
+        import tty
+
+        super().__init__(daemon=True)
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self.files = {}  # 수신한 파일: 이름 → 내용
+        self._buffer = bytearray()
+        self._running = True
+
+    def close(self):
+        """종료"""
+        self._running = False
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def run(self):
+        try:
+            while self._running:
+                line = self._readline()
+                if line == 'HELLO':
+                    self._write(b'OK AUDIO_MUX loopback\r\n')
+                elif line.startswith('UPLOAD'):
+                    self._write(b'OK Ready for Y-MODEM\r\n')
+                    saved = self._receive_batch()
+                    for name in saved:
+                        self._write(f'OK Upload complete /audio/{name}\r\n'.encode())
+                elif line:
+                    self._write(f'ERR 400 Invalid command: {line}\r\n'.encode())
+        except (OSError, TimeoutError):
+            pass  # close() 또는 송신측 중단
+
+    def _write(self, data):
+        os.write(self._master, data)
+
+    def _fill(self, timeout):
+        readable, _, _ = select.select([self._master], [], [], timeout)
+        if not readable:
+            raise TimeoutError
+        self._buffer += os.read(self._master, 65536)
+
+    def _read(self, size, timeout=5.0):
+        while len(self._buffer) < size:
+            self._fill(timeout)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _readline(self):
+        while b'\n' not in self._buffer:
+            self._fill(None)
+        index = self._buffer.index(b'\n')
+        line = bytes(self._buffer[:index]).strip().decode(errors='replace')
+        del self._buffer[:index + 1]
+        return line
+
+    def _read_packet(self):
+        """패킷 1개 수신: (헤더, 번호, 데이터) - CRC 오류는 데이터 None"""
+        header = self._read(1)[0]
+        if header == EOT:
+            return header, None, None
+        if header == CAN:
+            raise TimeoutError
+        size = 128 if header == SOH else 1024
+        packet = self._read(2 + size + 2)
+        data = packet[2:2 + size]
+        if header not in (SOH, STX) or crc16(data) != (packet[-2] << 8 | packet[-1]):
+            return header, packet[0], None
+        return header, packet[0], data
+
+    def _receive_batch(self):
+        """Y-MODEM 배치 수신 (Null Packet 0까지)"""
+        saved = []
+        self._write(bytes([CRC16]))
+
+        while True:
+            _, number, info = self._read_packet()
+            if info is None or number != 0:
+                self._write(bytes([NAK]))
+                continue
+            if info[0] == 0:
+                self._write(bytes([ACK]))  # Null Packet 0: 배치 종료
+                return saved
+
+            name, _, rest = info.partition(b'\0')
+            size = int(rest.split(b'\0')[0].split(b' ')[0])
+            self._write(bytes([ACK, CRC16]))
+
+            content = bytearray()
+            expected = 1
+            while True:
+                header, number, data = self._read_packet()
+                if header == EOT:
+                    self._write(bytes([ACK, CRC16]))
+                    break
+                if data is None:
+                    self._write(bytes([NAK]))
+                    continue
+                if number == expected & 0xFF:
+                    content += data
+                    expected += 1
+                self._write(bytes([ACK]))  # 중복 패킷도 ACK
+
+            self.files[name.decode()] = bytes(content[:size])
+            saved.append(name.decode())
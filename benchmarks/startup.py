@@ -0,0 +1,149 @@
+"""
+startup.py
+
+프로그램 시작 시간 측정 (프로세스 시작 → 첫 화면 그리기)
+
+    python benchmarks/startup.py [--runs 5]
+
+각 실행은 새 프로세스에서 측정하며 다음 세 경우를 비교한다.
+- uic.loadUi: 기존 방식 (매번 .ui XML 파싱)
+- ui cache cold: 컴파일된 UI 캐시가 없는 첫 실행 (컴파일 + 저장 포함)
+- ui cache warm: 컴파일된 UI 캐시 사용
+
+마지막에 -X importtime 기준 import 시간 상위 모듈을 출력한다.
+화면이 없는 환경에서는 QT_QPA_PLATFORM=offscreen으로 실행된다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def child(spawn_time, use_loadui):
+    """측정 대상 프로세스: MainWindow 표시 후 첫 paint에서 종료"""
+    sys.path.insert(0, ROOT)
+    t_import = time.time()
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+
+    if use_loadui:
+        import ui_loader
+        from PyQt5 import uic
+        ui_loader.load_ui = lambda path, widget: uic.loadUi(path, widget)
+
+    app = QApplication(sys.argv[:1])
+    import main
+    t_imported = time.time()
+
+    times = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'paint' not in times:
+                times['paint'] = time.time()
+                QTimer.singleShot(0, window.close)
+            return False
+
+    window = main.MainWindow()
+    t_window = time.time()
+    watcher = FirstPaint()
+    window.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(5000, window.close)  # paint 이벤트가 없는 플랫폼 대비
+    app.exec_()
+
+    print(json.dumps({
+        'interpreter': t_import - spawn_time,
+        'imports': t_imported - t_import,
+        'window': t_window - t_imported,
+        'first_paint': times.get('paint', time.time()) - spawn_time,
+    }))
+
+
+def run_child(env, use_loadui):
+    """측정 프로세스 1회 실행"""
+    args = [sys.executable, os.path.abspath(__file__), '--child', str(time.time())]
+    if use_loadui:
+        args.append('--loadui')
+    out = subprocess.run(args, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(label, runs, use_loadui, fresh_cache):
+    """여러 번 실행 후 중앙값 출력"""
+    cache_dir = tempfile.mkdtemp(prefix='audio_mux_startup_')
+    env = dict(os.environ, AUDIO_MUX_CACHE_DIR=cache_dir)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    try:
+        if not fresh_cache and not use_loadui:
+            run_child(env, use_loadui)  # 캐시 준비
+
+        samples = []
+        for _ in range(runs):
+            if fresh_cache:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+            samples.append(run_child(env, use_loadui))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def median_ms(key):
+        return statistics.median(s[key] for s in samples) * 1000
+
+    print(f"{label:<16} {median_ms('interpreter'):>12.1f} {median_ms('imports'):>10.1f} "
+          f"{median_ms('window'):>10.1f} {median_ms('first_paint'):>13.1f}")
+
+
+def import_breakdown(top=12):
+    """-X importtime 결과에서 누적 시간 상위 모듈"""
+    code = "import sys; from PyQt5.QtWidgets import QApplication; app = QApplication(sys.argv); import main"
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    print(f"\n=== import time (top {top} cumulative, -X importtime) ===\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup time benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', metavar='SPAWN_TIME', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--loadui', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child, args.loadui)
+        return
+
+    print(f"=== Startup benchmark (median of {args.runs} runs, ms) ===\n")
+    print(f"{'mode':<16} {'interpreter':>12} {'imports':>10} {'window':>10} {'first paint':>13}")
+    measure('uic.loadUi', args.runs, use_loadui=True, fresh_cache=False)
+    measure('ui cache cold', args.runs, use_loadui=False, fresh_cache=True)
+    measure('ui cache warm', args.runs, use_loadui=False, fresh_cache=False)
+
+    import_breakdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""
+cache_store.py
+
+디스크 캐시 공용 모듈
+콘텐츠 해시 기반 키 + 총 용량 기준 LRU 제거
+"""
+
+import os
+import shutil
+import hashlib
+import threading
+import time
+
+
+# 캐시 루트 디렉토리 (환경 변수로 변경 가능)
+CACHE_DIR_ENV = 'AUDIO_MUX_CACHE_DIR'
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser('~'), '.audio_mux', 'cache')
+
+# 파일 해시 메모 (경로, 크기, mtime) → digest
+_digest_memo = {}
+_digest_lock = threading.Lock()
+
+
+def default_cache_dir(name=None):
+    """
+    캐시 디렉토리 경로 반환
+
+    Args:
+        name: 하위 디렉토리 이름 (예: 'convert')
+
+    Returns:
+        str: 캐시 디렉토리 경로
+    """
+    root = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_ROOT
+    return os.path.join(root, name) if name else root
+
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    """
+    파일 내용의 SHA-256 해시 계산
+
+    같은 파일(경로, 크기, 수정 시각 동일)은 다시 읽지 않고 메모된 값을 사용
+
+    Args:
+        file_path: 파일 경로
+        chunk_size: 읽기 단위 (바이트)
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    st = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+
+    with _digest_lock:
+        digest = _digest_memo.get(memo_key)
+    if digest:
+        return digest
+
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+def make_key(*parts):
+    """여러 요소(해시, 스펙, 버전 등)를 하나의 캐시 키로 결합"""
+    text = '|'.join(str(p) for p in parts)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class LruFileCache:
+    """
+    파일 단위 디스크 캐시
+
+    - 키마다 파일 하나 저장 (<directory>/<key[:2]>/<key><suffix>)
+    - 최근 사용 시각은 파일 mtime으로 기록
+    - 총 용량이 max_bytes를 넘으면 오래된 항목부터 제거
+    """
+
+    def __init__(self, directory, max_bytes=2 * 1024 ** 3, suffix=''):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None  # 첫 사용 시 계산
+
+    def path_for(self, key):
+        """키에 해당하는 캐시 파일 경로"""
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key):
+        """
+        캐시 조회
+
+        Returns:
+            str: 캐시 파일 경로 (없으면 None)
+        """
+        path = self.path_for(key)
+        with self._lock:
+            if os.path.isfile(path):
+                self.hits += 1
+                self._touch(path)
+                return path
+            self.misses += 1
+            return None
+
+    def fetch(self, key, dest_path):
+        """
+        캐시 항목을 dest_path로 꺼내기 (하드링크, 실패 시 복사)
+
+        Returns:
+            bool: 캐시 적중 여부
+        """
+        path = self.get(key)
+        if not path:
+            return False
+
+        try:
+            _replace_with_link(path, dest_path)
+        except OSError:
+            # 다른 드라이브 등 하드링크 불가 → 복사
+            tmp_path = dest_path + '.part'
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        return True
+
+    def put(self, key, src_path):
+        """
+        파일을 캐시에 저장 (하드링크, 실패 시 복사)
+
+        Returns:
+            str: 캐시 파일 경로
+        """
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = _size_or_zero(path)
+
+        try:
+            _replace_with_link(src_path, path)
+        except OSError:
+            tmp_path = path + '.part'
+            shutil.copyfile(src_path, tmp_path)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += os.path.getsize(path) - old_size
+            self._touch(path)
+            self._evict_locked(keep=path)
+        return path
+
+    def put_bytes(self, key, data):
+        """바이트 데이터를 캐시에 저장"""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = _size_or_zero(path)
+
+        tmp_path = path + '.part'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - old_size
+            self._evict_locked(keep=path)
+        return path
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._total_bytes = 0
+
+    def total_bytes(self):
+        """캐시 총 용량 (바이트)"""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            return self._total_bytes
+
+    def stats(self):
+        """캐시 통계"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'evictions': self.evictions,
+            'total_bytes': self.total_bytes(),
+            'max_bytes': self.max_bytes,
+        }
+
+    def stats_text(self):
+        """로그 출력용 통계 문자열"""
+        s = self.stats()
+        return (f"Cache: {s['hits']} hit / {s['misses']} miss "
+                f"({s['hit_rate'] * 100:.0f}%), "
+                f"{s['total_bytes'] / (1024 * 1024):.1f}MB / "
+                f"{s['max_bytes'] / (1024 * 1024):.0f}MB")
+
+    def _touch(self, path):
+        """최근 사용 시각 갱신"""
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def _scan(self):
+        """캐시 파일 목록 (경로, 크기, 최근 사용 시각)"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if not entry.is_file() or entry.name.endswith('.part'):
+                    continue
+                st = entry.stat()
+                entries.append((entry.path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict_locked(self, keep=None):
+        """용량 초과 시 오래된 항목 제거 (lock 보유 상태에서 호출)"""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+
+        self._total_bytes = total
+
+
+def _replace_with_link(src_path, dest_path):
+    """dest_path를 src_path의 하드링크로 교체 (기존 파일은 새 inode로 대체)"""
+    # 이미 같은 파일이면 그대로 (같은 inode끼리의 rename은 아무 동작도 하지 않음)
+    if os.path.exists(dest_path) and os.path.samefile(src_path, dest_path):
+        return
+
+    tmp_path = dest_path + '.part'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    os.link(src_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def _size_or_zero(path):
+    """파일 크기 (없으면 0)"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
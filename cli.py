@@ -0,0 +1,918 @@
+"""
+cli.py
+
+Audio Mux 명령줄 도구 (GUI 없이 보드 제어 / 오디오 변환 / 업로드)
+
+사용 예:
+    python -m cli ports
+    python -m cli cmd -p COM3 HELLO STATUS
+    python -m cli convert song1.mp3 song2.flac --out-dir converted --normalize
+    python -m cli upload -p COM3 -c 0 converted/song1_32k16m.wav
+    python -m cli upload -p COM3 -c 0 --batch converted/*.wav  (실험적)
+    python -m cli upload -p COM3 -c 0 --batch --auto-convert library/*.mp3
+    python -m cli preflight -p COM3 converted/*.wav
+    python -m cli fleet --plan provision.json
+    python -m cli cmd -p COM3 --capture session.amcap LS STATUS
+    python -m cli replay session.amcap --speed 0
+    python -m cli log --since 2h --channel 0
+    python -m cli scene -p COM3 opening.json
+    python -m cli library scan D:/sounds
+    python -m cli library find --nonconforming rain
+    python -m cli --metrics upload.prom --metrics-label firmware=v1.2 upload -p COM3 -c 0 a.wav
+
+결과는 stdout에 JSON으로, 진행 상황은 stderr로 출력한다.
+종료 코드: 0 성공, 1 일부/전체 실패, 2 사용법 오류, 3 연결 실패
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from datetime import datetime
+
+import instrumentation
+from serial_core import RESPONSE_TIMEOUT, RESPONSE_IDLE
+
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+EXIT_CONNECTION = 3
+
+TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}  # log --since 2h 등
+
+
+class BoardSession:
+    """
+    명령줄용 보드 세션
+
+    SerialComm 수신 스레드의 시그널을 DirectConnection으로 받아
+    Qt 이벤트 루프 없이 줄 단위 응답을 큐로 전달한다.
+    """
+
+    def __init__(self, port, baudrate=115200):
+        from PyQt5.QtCore import Qt
+        from serial_comm import SerialComm
+
+        self.port = port
+        self.lines = queue.Queue()
+        self.errors = []
+
+        self.serial = SerialComm()
+        self.serial.set_port(port, baudrate=baudrate)
+        self.serial.received.connect(self.lines.put, Qt.DirectConnection)
+        self.serial.error.connect(self.errors.append, Qt.DirectConnection)
+
+    def open(self):
+        """포트 연결"""
+        return self.serial.connect()
+
+    def close(self):
+        """포트 연결 해제 (캡처 중이면 종료)"""
+        if self.serial.is_connected():
+            self.serial.disconnect()
+            self.serial.wait()
+        self.serial.stop_capture()
+
+    def drain(self):
+        """이전에 수신된 줄 버리기"""
+        while True:
+            try:
+                self.lines.get_nowait()
+            except queue.Empty:
+                return
+
+    def read_response(self, timeout=RESPONSE_TIMEOUT, idle=RESPONSE_IDLE):
+        """
+        응답 줄 수집
+
+        첫 줄은 timeout까지 기다리고, 이후에는 idle 동안 추가 줄이 없거나
+        여러 줄 응답의 끝(END)을 받으면 종료
+
+        Returns:
+            list: 수신된 줄
+        """
+        lines = []
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait = (deadline - time.monotonic()) if not lines else idle
+            if wait <= 0:
+                break
+            try:
+                line = self.lines.get(timeout=wait)
+            except queue.Empty:
+                break
+
+            lines.append(line)
+            if line == 'END':
+                break
+
+        return lines
+
+    def command(self, command, timeout=RESPONSE_TIMEOUT):
+        """
+        명령 전송 및 응답 수집
+
+        Returns:
+            dict: {'command', 'ok', 'response'}
+        """
+        from ansi_parser import strip_ansi
+
+        self.drain()
+        if not self.serial.send_command(command):
+            return {'command': command, 'ok': False, 'response': [], 'error': 'send failed'}
+
+        response = [strip_ansi(line) for line in self.read_response(timeout)]
+        ok = bool(response) and not any(line.startswith('ERR') for line in response)
+        return {'command': command, 'ok': ok, 'response': response}
+
+
+def log(args, message):
+    """진행 상황 출력 (stderr)"""
+    if not args.quiet:
+        print(message, file=sys.stderr, flush=True)
+
+
+def emit(result):
+    """결과 JSON 출력 (stdout)"""
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def open_session(args):
+    """보드 세션 열기 (실패 시 None)"""
+    session = BoardSession(args.port, baudrate=args.baud)
+    if not session.open():
+        emit({'ok': False, 'port': args.port,
+              'error': session.errors[-1] if session.errors else 'connection failed'})
+        return None
+    log(args, f"Connected to {args.port} at {args.baud} baud")
+
+    if getattr(args, 'capture', None):
+        ok, message = session.serial.start_capture(args.capture)
+        log(args, message)
+        if not ok:
+            session.close()
+            emit({'ok': False, 'port': args.port, 'error': message})
+            return None
+    return session
+
+
+def cmd_ports(args):
+    """시리얼 포트 목록"""
+    from serial_comm import list_serial_ports
+
+    ports = list_serial_ports()
+    emit({'ok': True, 'ports': ports})
+    return EXIT_OK
+
+
+def cmd_command(args):
+    """명령 실행"""
+    session = open_session(args)
+    if session is None:
+        return EXIT_CONNECTION
+
+    results = []
+    try:
+        for command in args.commands:
+            log(args, f">> {command}")
+            result = session.command(command, timeout=args.timeout)
+            for line in result['response']:
+                log(args, f"<< {line}")
+            results.append(result)
+    finally:
+        session.close()
+
+    ok = all(r['ok'] for r in results)
+    emit({'ok': ok, 'port': args.port, 'results': results})
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def cmd_convert(args):
+    """일괄 변환"""
+    from concurrent.futures import ThreadPoolExecutor
+    from audio_converter import AudioConverter
+
+    if args.no_cache:
+        AudioConverter.cache_enabled = False
+
+    def output_path_for(input_path):
+        base = os.path.splitext(os.path.basename(input_path))[0] + "_32k16m.wav"
+        out_dir = args.out_dir or os.path.dirname(os.path.abspath(input_path))
+        return os.path.join(out_dir, base)
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    def convert_one(input_path):
+        output_path = output_path_for(input_path)
+        start = time.monotonic()
+        success, message = AudioConverter.convert(
+            input_path, output_path,
+            normalize=args.normalize, trim_silence=args.trim_silence
+        )
+        elapsed = time.monotonic() - start
+        log(args, f"{'OK ' if success else 'ERR'} {input_path} ({elapsed:.2f}s)")
+        return {'input': input_path, 'output': output_path, 'ok': success,
+                'message': message, 'seconds': round(elapsed, 3)}
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(convert_one, args.inputs))
+
+    ok = all(r['ok'] for r in results)
+    summary = {'ok': ok, 'results': results}
+    if AudioConverter.cache_enabled:
+        summary['cache'] = AudioConverter.get_cache().stats()
+    emit(summary)
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def wav_spec_errors(file_path):
+    """보드 스펙 검증 (읽기 실패도 오류로 반환)"""
+    from audio_converter import check_wav_spec
+
+    try:
+        return check_wav_spec(file_path)
+    except Exception as e:
+        return [f"WAV 파일 읽기 오류: {e}"]
+
+
+def upload_file(args, session, file_path):
+    """파일 1개 업로드 (UPLOAD 명령 + Y-MODEM)"""
+    from PyQt5.QtCore import Qt
+    from ymodem import YModemSender
+
+    file_name = os.path.basename(file_path)
+    result = {'file': file_path, 'channel': args.channel, 'ok': False}
+
+    # 스펙 검증
+    spec_errors = wav_spec_errors(file_path)
+    if spec_errors and not args.force:
+        result['error'] = 'spec mismatch'
+        result['spec_errors'] = spec_errors
+        return result
+
+    # UPLOAD 명령 → 보드 Y-MODEM 준비 응답 대기
+    log(args, f">> UPLOAD {args.channel} {file_name}")
+    reply = session.command(f"UPLOAD {args.channel} {file_name}")
+    result['upload_response'] = reply['response']
+    if any(line.startswith('ERR') for line in reply['response']):
+        result['error'] = 'board rejected upload'
+        return result
+
+    # Y-MODEM 전송 (현재 스레드에서 동기 실행)
+    sender = YModemSender(session.serial, file_path)
+    outcome = {}
+    last_percent = [-1]
+
+    def on_progress(percent):
+        if percent // 10 != last_percent[0] // 10:
+            log(args, f"   {file_name}: {percent}%")
+        last_percent[0] = percent
+
+    sender.progress.connect(on_progress, Qt.DirectConnection)
+    sender.finished.connect(lambda ok, msg: outcome.update(ok=ok, message=msg),
+                            Qt.DirectConnection)
+
+    start = time.monotonic()
+    sender.run()
+    elapsed = time.monotonic() - start
+
+    result['ok'] = outcome.get('ok', False)
+    result['message'] = outcome.get('message', '')
+    result['seconds'] = round(elapsed, 3)
+    if elapsed > 0:
+        result['bytes_per_sec'] = round(os.path.getsize(file_path) / elapsed)
+    result['transfer'] = sender.stats.as_dict()
+
+    # 보드 저장 완료 응답 (있으면 기록)
+    result['complete_response'] = session.read_response(timeout=3.0)
+    return result
+
+
+def board_supports_batch(args, session):
+    """HELLO 응답으로 배치 업로드 (UPLOAD <CH> *) 지원 여부 확인"""
+    from ymodem_core import supports_batch
+
+    supported = supports_batch(session.command('HELLO')['response'])
+    if not supported:
+        log(args, "Board does not report batch upload support; uploading files one by one")
+    return supported
+
+
+def upload_batch(args, session, file_paths):
+    """
+    여러 파일을 Y-MODEM 세션 하나로 업로드 (실험적, UPLOAD 명령 1회, 파일 사이 핸드셰이크 없음)
+
+    HELLO 응답에 BATCH가 있는 펌웨어만 지원 (board_supports_batch)
+
+    Returns:
+        list: 파일별 결과 (스펙 불일치로 제외된 파일 포함) + 배치 결과
+    """
+    from PyQt5.QtCore import Qt
+    from ymodem import YModemSender
+    from ymodem_core import BATCH_FILE_NAME
+
+    results = []
+    batch = []
+    for file_path in file_paths:
+        spec_errors = wav_spec_errors(file_path)
+        if spec_errors and not args.force:
+            results.append({'file': file_path, 'channel': args.channel, 'ok': False,
+                            'error': 'spec mismatch', 'spec_errors': spec_errors})
+        else:
+            batch.append(file_path)
+
+    if not batch:
+        return results
+    result = {'files': batch, 'channel': args.channel, 'ok': False}
+    results.append(result)
+
+    # UPLOAD 명령 → 보드 Y-MODEM 준비 응답 대기
+    log(args, f">> UPLOAD {args.channel} {BATCH_FILE_NAME} ({len(batch)} files)")
+    reply = session.command(f"UPLOAD {args.channel} {BATCH_FILE_NAME}")
+    result['upload_response'] = reply['response']
+    if any(line.startswith('ERR') for line in reply['response']):
+        result['error'] = 'board rejected upload'
+        return results
+
+    # Y-MODEM 배치 전송 (현재 스레드에서 동기 실행)
+    sender = YModemSender(session.serial, batch)
+    outcome = {}
+    current = {'name': '', 'percent': -1}
+
+    def on_file_started(index, count, name):
+        current.update(name=name, percent=-1)
+        log(args, f"   [{index + 1}/{count}] {name}")
+
+    def on_file_progress(index, percent):
+        if percent // 10 != current['percent'] // 10:
+            log(args, f"   {current['name']}: {percent}%")
+        current['percent'] = percent
+
+    sender.file_started.connect(on_file_started, Qt.DirectConnection)
+    sender.file_progress.connect(on_file_progress, Qt.DirectConnection)
+    sender.finished.connect(lambda ok, msg: outcome.update(ok=ok, message=msg),
+                            Qt.DirectConnection)
+
+    start = time.monotonic()
+    sender.run()
+    elapsed = time.monotonic() - start
+
+    result['ok'] = outcome.get('ok', False)
+    result['message'] = outcome.get('message', '')
+    result['seconds'] = round(elapsed, 3)
+    if elapsed > 0:
+        result['bytes_per_sec'] = round(sum(os.path.getsize(p) for p in batch) / elapsed)
+    result['transfer'] = sender.stats.as_dict()
+
+    # 보드 저장 완료 응답 (파일별, 있으면 기록)
+    result['complete_response'] = session.read_response(timeout=3.0)
+    return results
+
+
+def query_sd_free(args, session):
+    """STATUS 명령으로 SD 여유 공간 조회 (바이트, 알 수 없으면 None)"""
+    from ansi_parser import strip_ansi
+    from preflight import parse_sd_free
+
+    reply = session.command('STATUS')
+    free = parse_sd_free([strip_ansi(line) for line in reply['response']])
+    log(args, f"SD free: {free // (1024 * 1024)}MB" if free is not None else "SD free: unknown")
+    return free
+
+
+def auto_convert(args, file_paths):
+    """
+    변환 필요 파일 자동 변환 (동시 변환, 결과 파일은 다시 점검)
+
+    Returns:
+        list: 변환 결과 파일의 check_file() 결과 (변환 실패는 status FAIL, 원본 경로)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from audio_converter import AudioConverter
+    from preflight import FAIL, check_file, converted_path
+
+    def convert_one(input_path):
+        output_path = converted_path(input_path)
+        success, message = AudioConverter.convert(
+            input_path, output_path,
+            normalize=args.normalize, trim_silence=args.trim_silence
+        )
+        log(args, f"{'OK ' if success else 'ERR'} convert {input_path}")
+        if not success:
+            return {'file': input_path, 'status': FAIL, 'errors': [message], 'spec_errors': []}
+        return check_file(output_path)
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        return list(pool.map(convert_one, file_paths))
+
+
+def upload_preflight(args, session):
+    """
+    업로드 전 사전 점검 (전송 시작 전에 배치 전체 확인)
+
+    Returns:
+        tuple: (업로드할 파일 목록, 보고서) - 점검 실패로 중단하면 파일 목록이 None
+    """
+    from preflight import PASS, card_bytes, preflight, fits, summary_text, report_lines
+
+    sd_free = query_sd_free(args, session)
+    report = preflight(args.files, sd_free, include_conversions=args.auto_convert)
+    log(args, summary_text(report))
+    for text, status in report_lines(report):
+        log(args, f"  [{status}] {text}")
+
+    files = list(report['passed'])
+    if args.auto_convert and report['convert']:
+        report['converted'] = auto_convert(args, report['convert'])
+        files += [r['file'] for r in report['converted'] if r['status'] == PASS]
+        # 예상 크기 대신 실제 변환 결과 크기로 공간 다시 확인
+        report['upload_bytes'] = sum(card_bytes(os.path.getsize(p)) for p in files)
+        report['fits'] = fits(report, sd_free)
+        ready = len(files) == len(args.files) - len(report['failed'])
+    else:
+        ready = not report['convert']
+
+    if args.force:
+        return list(args.files), report  # 점검 결과와 무관하게 지정한 파일 그대로
+    if report['failed'] or not ready or report['fits'] is False:
+        return None, report
+    return files, report
+
+
+def cmd_preflight(args):
+    """일괄 업로드 사전 점검만 실행 (보드 연결 시 SD 여유 공간 포함)"""
+    from preflight import PREFLIGHT_WORKERS, preflight, summary_text
+
+    sd_free = args.sd_free * 1024 * 1024 if args.sd_free is not None else None
+    if args.port:
+        session = open_session(args)
+        if session is None:
+            return EXIT_CONNECTION
+        try:
+            sd_free = query_sd_free(args, session)
+        finally:
+            session.close()
+
+    report = preflight(args.files, sd_free, workers=args.jobs or PREFLIGHT_WORKERS)
+    log(args, summary_text(report))
+    emit(report)
+    return EXIT_OK if report['ok'] else EXIT_FAILURE
+
+
+def cmd_upload(args):
+    """일괄 업로드"""
+    missing = [p for p in args.files if not os.path.isfile(p)]
+    if missing:
+        emit({'ok': False, 'error': 'file not found', 'files': missing})
+        return EXIT_USAGE
+
+    session = open_session(args)
+    if session is None:
+        return EXIT_CONNECTION
+
+    results = []
+    try:
+        files, report = upload_preflight(args, session)
+        if files is None:
+            emit({'ok': False, 'port': args.port, 'error': 'preflight failed', 'preflight': report})
+            return EXIT_FAILURE
+
+        if args.batch and board_supports_batch(args, session):
+            results = upload_batch(args, session, files)
+            for result in results:
+                names = result.get('files', [result.get('file')])
+                log(args, f"{'OK ' if result['ok'] else 'ERR'} {', '.join(names)}")
+        else:
+            for file_path in files:
+                result = upload_file(args, session, file_path)
+                log(args, f"{'OK ' if result['ok'] else 'ERR'} {file_path}")
+                results.append(result)
+                if not result['ok'] and args.stop_on_error:
+                    break
+    finally:
+        session.close()
+
+    uploaded = sum(len(r.get('files', [None])) for r in results)
+    ok = uploaded == len(files) and all(r['ok'] for r in results)
+    emit({'ok': ok, 'port': args.port, 'results': results, 'preflight': report})
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def cmd_replay(args):
+    """캡처 재생 (수신 → 줄 분리 경로 성능 측정)"""
+    import session_capture
+
+    if not session_capture.capture_files(args.capture):
+        emit({'ok': False, 'error': 'capture not found', 'capture': args.capture})
+        return EXIT_USAGE
+
+    try:
+        summary = session_capture.summarize(args.capture)
+    except (OSError, ValueError) as e:
+        emit({'ok': False, 'error': f"invalid capture: {e}", 'capture': args.capture})
+        return EXIT_USAGE
+    if args.info:
+        emit(dict(summary, ok=True))
+        return EXIT_OK
+
+    session = BoardSession(session_capture.replay_url(args.capture, args.speed))
+    if not session.open():
+        emit({'ok': False, 'error': session.errors[-1] if session.errors else 'replay failed'})
+        return EXIT_CONNECTION
+
+    log(args, f"Replaying {summary['rx_bytes']} bytes "
+              f"({summary['seconds']:.1f}s captured, speed {args.speed:g})")
+    replay = session.serial.ser
+    start = time.monotonic()
+    try:
+        while not replay.finished:
+            time.sleep(0.01)
+        elapsed = time.monotonic() - start
+        time.sleep(0.1)  # 수신 스레드가 마지막 데이터를 처리할 시간
+    finally:
+        session.close()
+    lines = session.lines.qsize()
+
+    emit({
+        'ok': True,
+        'capture': args.capture,
+        'rx_bytes': summary['rx_bytes'],
+        'captured_seconds': summary['seconds'],
+        'lines': lines,
+        'seconds': round(elapsed, 3),
+        'lines_per_sec': round(lines / elapsed) if elapsed > 0 else 0,
+        'bytes_per_sec': round(summary['rx_bytes'] / elapsed) if elapsed > 0 else 0,
+    })
+    return EXIT_OK
+
+
+def parse_time(value):
+    """
+    시각 인자 해석 ('2h', '30m' 등은 현재 기준 이전, 그 외는 ISO 형식)
+
+    Returns:
+        float: time.time() 기준 시각
+    """
+    unit = TIME_UNITS.get(value[-1:].lower())
+    if unit:
+        try:
+            return time.time() - float(value[:-1]) * unit
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time: {value} (e.g. 2h, 30m, 2025-01-31T09:00)")
+
+
+def cmd_log(args):
+    """저장된 송수신 로그 조회 (GUI 세션 기록)"""
+    import log_store
+    from ansi_parser import strip_ansi
+
+    path = args.db or log_store.default_log_path()
+    if not path or not os.path.exists(path):
+        emit({'ok': False, 'error': 'log database not found', 'db': path})
+        return EXIT_USAGE
+
+    if args.sessions:
+        rows = log_store.sessions(path)
+        for row in rows:
+            for key in ('started', 'first', 'last'):
+                if row[key] is not None:
+                    row[key] = datetime.fromtimestamp(row[key]).isoformat(timespec='seconds')
+        emit({'ok': True, 'db': path, 'sessions': rows})
+        return EXIT_OK
+
+    entries = log_store.query(path, start=args.since, end=args.until, channel=args.channel,
+                              direction=args.direction, session=args.session,
+                              contains=args.grep, limit=args.limit)
+    for entry in entries:
+        entry['time'] = datetime.fromtimestamp(entry.pop('ts')).isoformat(timespec='milliseconds')
+        entry['text'] = strip_ansi(entry['text'])
+    emit({'ok': True, 'db': path, 'count': len(entries), 'entries': entries})
+    return EXIT_OK
+
+
+def cmd_library(args):
+    """오디오 라이브러리 색인 / 검색"""
+    import library_index
+
+    path = args.db or library_index.default_library_path()
+
+    if args.action == 'scan':
+        index = library_index.LibraryIndex(path)
+        try:
+            folders = args.terms or [r['path'] for r in index.roots()]
+            if not folders:
+                emit({'ok': False, 'error': 'no folders to scan', 'db': path})
+                return EXIT_USAGE
+            results = []
+            for folder in folders:
+                if not os.path.isdir(folder):
+                    results.append({'root': folder, 'ok': False, 'error': 'not a directory'})
+                    continue
+                log(args, f"Indexing {folder}")
+                result = index.scan(folder, on_progress=lambda files, changed: log(
+                    args, f"  {files} files, {changed} read"))
+                result['ok'] = True
+                results.append(result)
+        finally:
+            index.close()
+        ok = all(r['ok'] for r in results)
+        emit({'ok': ok, 'db': path, 'results': results})
+        return EXIT_OK if ok else EXIT_FAILURE
+
+    if not os.path.exists(path):
+        emit({'ok': False, 'error': 'library index not found (run: library scan DIR)', 'db': path})
+        return EXIT_USAGE
+
+    if args.action == 'roots':
+        emit({'ok': True, 'db': path, 'roots': library_index.roots(path)})
+        return EXIT_OK
+
+    conforms = True if args.conforming else False if args.nonconforming else None
+    files = library_index.query(path, contains=' '.join(args.terms), conforms=conforms,
+                                formats=args.format, root=args.root, limit=args.limit)
+    if args.paths:
+        for entry in files:
+            print(entry['path'])
+        return EXIT_OK
+    emit({'ok': True, 'db': path, 'count': len(files), 'files': files})
+    return EXIT_OK
+
+
+def cmd_scene(args):
+    """장면 실행 (여러 채널 명령을 미리 계산한 일정대로 전송)"""
+    from ansi_parser import strip_ansi
+    from scene_engine import load_scene, compile_scene, scene_duration, SceneScheduler
+
+    try:
+        scene = load_scene(args.scene)
+        schedule = compile_scene(scene)
+    except (OSError, ValueError) as e:
+        emit({'ok': False, 'scene': args.scene, 'error': str(e)})
+        return EXIT_USAGE
+
+    if args.dry_run:
+        emit({'ok': True, 'scene': scene['name'], 'duration': scene_duration(schedule),
+              'schedule': [{'at': t, 'commands': commands} for t, commands in schedule]})
+        return EXIT_OK
+    if not args.port:
+        emit({'ok': False, 'scene': scene['name'], 'error': 'port required (-p)'})
+        return EXIT_USAGE
+
+    session = open_session(args)
+    if session is None:
+        return EXIT_CONNECTION
+
+    def on_dispatch(t, commands, error):
+        log(args, f">> [{t:.3f}s {error * 1000:+.2f}ms] {'; '.join(commands)}")
+
+    log(args, f"Scene '{scene['name']}': {sum(len(c) for _, c in schedule)} commands, "
+              f"{scene_duration(schedule):.1f}s")
+    scheduler = SceneScheduler(schedule, write=session.serial.send_commands_now,
+                               on_dispatch=on_dispatch)
+    try:
+        try:
+            success, message = scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop_playing()
+            success, message = False, "Scene interrupted"
+        responses = [strip_ansi(line) for line in session.read_response(timeout=RESPONSE_IDLE)]
+    finally:
+        session.close()
+
+    log(args, message)
+    errors = [line for line in responses if line.startswith('ERR')]
+    emit(dict(scheduler.summary(), ok=success and not errors, scene=scene['name'],
+              message=message, errors=errors))
+    return EXIT_OK if success and not errors else EXIT_FAILURE
+
+
+def cmd_fleet(args):
+    """여러 보드 동시 실행"""
+    import asyncio
+    import fleet
+
+    # 계획 구성 (계획 파일 + 명령줄 단계)
+    try:
+        steps = fleet.load_plan(args.plan) if args.plan else []
+        steps += fleet.parse_plan(args.steps or [])
+    except (OSError, ValueError) as e:
+        emit({'ok': False, 'error': f"invalid plan: {e}"})
+        return EXIT_USAGE
+    if not steps:
+        emit({'ok': False, 'error': 'no steps (use --plan, --command or --upload)'})
+        return EXIT_USAGE
+
+    # 업로드 파일 사전 검증 (보드마다 반복하지 않도록 한 번만)
+    upload_files = sorted({s[2] for s in steps if s[0] == 'upload'})
+    missing = [p for p in upload_files if not os.path.isfile(p)]
+    if missing:
+        emit({'ok': False, 'error': 'file not found', 'files': missing})
+        return EXIT_USAGE
+    if not args.force:
+        spec_errors = {}
+        for path in upload_files:
+            errors = wav_spec_errors(path)
+            if errors:
+                spec_errors[path] = errors
+        if spec_errors:
+            emit({'ok': False, 'error': 'spec mismatch', 'spec_errors': spec_errors})
+            return EXIT_FAILURE
+
+    last_decile = {}
+
+    def on_event(port, kind, value):
+        if kind == 'step':
+            log(args, f"[{port}] >> {value}")
+        elif kind == 'progress' and value // 10 != last_decile.get(port):
+            last_decile[port] = value // 10
+            log(args, f"[{port}]    {value}%")
+
+    async def run():
+        ports = args.ports
+        if not ports:
+            candidates = [p for p in fleet.list_serial_ports() if p not in args.exclude]
+            boards = await fleet.discover(candidates, args.baud)
+            for board in boards:
+                log(args, f"[{board['port']}] {board['hello']}")
+            ports = [board['port'] for board in boards]
+        if not ports:
+            return None
+        return await fleet.run_fleet(ports, steps, args.baud, on_event=on_event,
+                                     stop_on_error=not args.continue_on_error)
+
+    report = asyncio.run(run())
+    if report is None:
+        emit({'ok': False, 'error': 'no boards found'})
+        return EXIT_CONNECTION
+
+    log(args, f"{report['succeeded']}/{report['boards']} boards OK, "
+              f"{report['bytes']} bytes in {report['seconds']:.1f}s "
+              f"({report['bytes_per_sec'] / 1024:.1f} KB/s aggregate)")
+    emit(report)
+    return EXIT_OK if report['ok'] else EXIT_FAILURE
+
+
+class _AppendStep(argparse.Action):
+    """--command / --upload를 입력 순서대로 계획 단계에 추가"""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        steps = getattr(namespace, self.dest, None) or []
+        if option_string == '--command':
+            steps.append({'command': values})
+        else:
+            steps.append({'upload': values[1], 'channel': values[0]})
+        setattr(namespace, self.dest, steps)
+
+
+def build_parser():
+    """명령줄 인수 정의"""
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Audio Mux Control Panel - command line interface'
+    )
+    parser.add_argument('-q', '--quiet', action='store_true', help='진행 상황 출력 안 함')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='전송 계측값 내보내기 (.prom/.txt: Prometheus, 그 외: JSON)')
+    parser.add_argument('--metrics-label', metavar='KEY=VALUE', action='append', default=[],
+                        help='계측값 라벨 추가 (예: firmware=v1.2, 여러 번 지정 가능)')
+    sub = parser.add_subparsers(dest='command_name', required=True)
+
+    def add_port_args(p):
+        p.add_argument('-p', '--port', required=True, help='시리얼 포트 (예: COM3, /dev/ttyUSB0)')
+        p.add_argument('-b', '--baud', type=int, default=115200, help='보드레이트 (기본 115200)')
+        p.add_argument('--capture', metavar='FILE', help='송수신 데이터 캡처 (replay로 재생)')
+
+    p = sub.add_parser('ports', help='시리얼 포트 목록')
+    p.set_defaults(func=cmd_ports)
+
+    p = sub.add_parser('cmd', help='명령 실행 (예: HELLO STATUS "LS /audio")')
+    add_port_args(p)
+    p.add_argument('commands', nargs='+', help='전송할 명령')
+    p.add_argument('--timeout', type=float, default=RESPONSE_TIMEOUT, help='응답 대기 시간 (초)')
+    p.set_defaults(func=cmd_command)
+
+    p = sub.add_parser('convert', help='오디오 파일 일괄 변환 (32kHz 16-bit Mono)')
+    p.add_argument('inputs', nargs='+', help='입력 파일')
+    p.add_argument('-o', '--out-dir', help='출력 디렉토리 (기본: 입력 파일 위치)')
+    p.add_argument('-j', '--jobs', type=int, default=max((os.cpu_count() or 2) // 2, 1),
+                   help='동시 변환 개수')
+    p.add_argument('--normalize', action='store_true', help='음량 정규화')
+    p.add_argument('--trim-silence', action='store_true', help='앞뒤 무음 제거')
+    p.add_argument('--no-cache', action='store_true', help='변환 캐시 사용 안 함')
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('upload', help='WAV 파일 일괄 업로드 (Y-MODEM)')
+    add_port_args(p)
+    p.add_argument('-c', '--channel', type=int, required=True, choices=range(6), help='채널 (0~5)')
+    p.add_argument('files', nargs='+', help='업로드할 WAV 파일')
+    p.add_argument('--force', action='store_true', help='스펙 불일치 파일도 업로드')
+    p.add_argument('--stop-on-error', action='store_true', help='실패 시 나머지 파일 중단')
+    p.add_argument('--batch', action='store_true',
+                   help='(실험적) 모든 파일을 Y-MODEM 세션 하나로 전송 (UPLOAD 명령 1회). '
+                        'HELLO 응답에 BATCH가 없는 펌웨어에서는 파일마다 업로드')
+    p.add_argument('--auto-convert', action='store_true',
+                   help='스펙 불일치/WAV 아닌 파일을 변환 후 업로드 (*_32k16m.wav)')
+    p.add_argument('-j', '--jobs', type=int, default=max((os.cpu_count() or 2) // 2, 1),
+                   help='동시 변환 개수 (--auto-convert)')
+    p.add_argument('--normalize', action='store_true', help='자동 변환 시 음량 정규화')
+    p.add_argument('--trim-silence', action='store_true', help='자동 변환 시 앞뒤 무음 제거')
+    p.set_defaults(func=cmd_upload)
+
+    p = sub.add_parser('preflight', help='일괄 업로드 사전 점검 (스펙, 잘림, SD 여유 공간)')
+    p.add_argument('files', nargs='+', help='업로드할 파일')
+    p.add_argument('-p', '--port', help='SD 여유 공간을 조회할 시리얼 포트 (생략 시 공간 확인 안 함)')
+    p.add_argument('-b', '--baud', type=int, default=115200, help='보드레이트 (기본 115200)')
+    p.add_argument('--sd-free', type=int, metavar='MB', help='SD 여유 공간 직접 지정 (MB)')
+    p.add_argument('-j', '--jobs', type=int, help='동시에 점검할 파일 수 (기본 8)')
+    p.set_defaults(func=cmd_preflight)
+
+    p = sub.add_parser('fleet', help='여러 보드에서 같은 작업 계획 동시 실행')
+    p.add_argument('--ports', nargs='+', help='대상 포트 (기본: HELLO에 응답하는 모든 포트)')
+    p.add_argument('--exclude', nargs='+', default=[], help='검색에서 제외할 포트')
+    p.add_argument('-b', '--baud', type=int, default=115200, help='보드레이트 (기본 115200)')
+    p.add_argument('--plan', help='작업 계획 파일 (JSON)')
+    p.add_argument('--command', dest='steps', action=_AppendStep, metavar='CMD',
+                   help='명령 단계 추가 (반복 가능)')
+    p.add_argument('--upload', dest='steps', action=_AppendStep, nargs=2,
+                   metavar=('CHANNEL', 'FILE'), help='업로드 단계 추가 (반복 가능)')
+    p.add_argument('--continue-on-error', action='store_true',
+                   help='단계 실패 시에도 해당 보드의 남은 단계 계속 실행')
+    p.add_argument('--force', action='store_true', help='스펙 불일치 파일도 업로드')
+    p.set_defaults(func=cmd_fleet)
+
+    p = sub.add_parser('replay', help='캡처 파일 재생 (수신 경로 성능 측정, 보드 불필요)')
+    p.add_argument('capture', help='캡처 파일 (--capture 또는 AUDIO_MUX_CAPTURE로 기록)')
+    p.add_argument('--speed', type=float, default=0,
+                   help='재생 속도 (1 실시간, 2 두 배속, 0 최대 속도 - 기본)')
+    p.add_argument('--info', action='store_true', help='재생하지 않고 캡처 요약만 출력')
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser('scene', help='장면 실행 (여러 채널 동시 재생/루프/페이드)')
+    p.add_argument('scene', help='장면 파일 (JSON, scene_engine.py 참고)')
+    p.add_argument('-p', '--port', help='시리얼 포트 (--dry-run이 아니면 필수)')
+    p.add_argument('-b', '--baud', type=int, default=115200, help='보드레이트 (기본 115200)')
+    p.add_argument('--capture', metavar='FILE', help='송수신 데이터 캡처 (replay로 재생)')
+    p.add_argument('--dry-run', action='store_true', help='전송하지 않고 계산한 일정만 출력')
+    p.set_defaults(func=cmd_scene)
+
+    p = sub.add_parser('library', help='오디오 라이브러리 색인 / 검색 (형식, 길이, 스펙 일치 여부)')
+    p.add_argument('action', choices=('scan', 'find', 'roots'),
+                   help='scan: 폴더 색인 (바뀐 파일만), find: 검색, roots: 등록된 폴더')
+    p.add_argument('terms', nargs='*',
+                   help='scan: 폴더 (기본: 등록된 모든 폴더), find: 검색어 (모두 포함)')
+    p.add_argument('--db', help='색인 파일 (기본: AUDIO_MUX_LIBRARY_DB 또는 ~/.audio_mux/library.sqlite3)')
+    group = p.add_mutually_exclusive_group()
+    group.add_argument('--conforming', action='store_true', help='스펙 일치 파일만 (업로드 가능)')
+    group.add_argument('--nonconforming', action='store_true', help='변환이 필요한 파일만')
+    p.add_argument('--format', nargs='+', help='형식 (예: WAV MP3)')
+    p.add_argument('--root', help='이 폴더 아래만')
+    p.add_argument('-n', '--limit', type=int, default=None, help='최대 개수')
+    p.add_argument('--paths', action='store_true',
+                   help='JSON 대신 경로만 한 줄씩 출력 (upload/convert 인수로 사용)')
+    p.set_defaults(func=cmd_library)
+
+    p = sub.add_parser('log', help='저장된 송수신 로그 조회 (시간 범위 / 채널)')
+    p.add_argument('--db', help='로그 파일 (기본: AUDIO_MUX_LOG_DB 또는 ~/.audio_mux/logs.sqlite3)')
+    p.add_argument('--since', type=parse_time, help='시작 시각 (예: 2h, 30m, 2025-01-31T09:00)')
+    p.add_argument('--until', type=parse_time, help='끝 시각')
+    p.add_argument('-c', '--channel', type=int, choices=range(6), help='채널 (0~5)')
+    p.add_argument('--direction', choices=('rx', 'tx'), help='수신 / 송신만')
+    p.add_argument('--session', type=int, help='세션 id (--sessions로 확인)')
+    p.add_argument('--grep', help='포함 문자열')
+    p.add_argument('-n', '--limit', type=int, help='마지막 N줄만')
+    p.add_argument('--sessions', action='store_true', help='세션 목록 출력')
+    p.set_defaults(func=cmd_log)
+
+    return parser
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = build_parser().parse_args(argv)
+
+    if args.metrics:
+        labels = dict(label.partition('=')[::2] for label in args.metrics_label)
+        instrumentation.enable(labels)
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        emit({'ok': False, 'error': 'interrupted'})
+        return EXIT_FAILURE
+    finally:
+        if args.metrics:
+            instrumentation.export(args.metrics)
+            log(args, f"Metrics written to {args.metrics}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
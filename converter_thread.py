@@ -0,0 +1,54 @@
+"""
+converter_thread.py
+
+오디오 변환 스레드 (ConversionJob의 Qt 어댑터)
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from audio_converter import ConversionJob, check_ffmpeg_installed
+
+
+class ConverterThread(QThread):
+    """오디오 변환 스레드"""
+
+    # 시그널
+    progress = pyqtSignal(int)  # 진행률 (0~100)
+    finished = pyqtSignal(bool, str)  # (성공 여부, 메시지)
+
+    def __init__(self, input_path, output_path, timeout=None,
+                 normalize=False, trim_silence=False):
+        super().__init__()
+        self.job = ConversionJob(input_path, output_path,
+                                 timeout=timeout,
+                                 on_progress=self._on_progress,
+                                 normalize=normalize,
+                                 trim_silence=trim_silence)
+        self._last_percent = -1
+
+    def cancel(self):
+        """변환 취소"""
+        self.job.cancel()
+
+    def run(self):
+        """변환 실행"""
+        success, message = self.job.run()
+        self.finished.emit(success, message)
+
+    def _on_progress(self, fraction):
+        """진행률 콜백 (1% 단위로만 시그널 발생)"""
+        percent = int(fraction * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress.emit(percent)
+
+
+class FFmpegCheckThread(QThread):
+    """FFmpeg 설치 확인 스레드 (PATH 검색이 느린 환경에서 시작 지연 방지)"""
+
+    # 시그널
+    result = pyqtSignal(bool)  # 설치 여부
+
+    def run(self):
+        """설치 확인"""
+        self.result.emit(check_ffmpeg_installed())
@@ -2,121 +2,460 @@
 equalizer_widget.py
 
 그래픽 이퀄라이저 위젯
+
+numpy와 분석 모듈은 처음 재생/파일 로드 시 import (프로그램 시작 시간 단축)
 """
 
-import random
+import time
+
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import QTimer, Qt
-from PyQt5.QtGui import QPainter, QColor, QLinearGradient
+from PyQt5.QtCore import QTimer, Qt, QThread, QRect, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QLinearGradient, QPixmap
+
+
+class SpectrogramThread(QThread):
+    """미리 듣기 파일 스펙트로그램 사전 계산 스레드 (디스크 캐시 사용)"""
+
+    # 시그널
+    decoded = pyqtSignal(str, object)  # (파일 경로, int16 Mono PCM) - 계산 중 실시간 분석용
+    ready = pyqtSignal(str, object)  # (파일 경로, SpectrogramData)
+
+    def __init__(self, file_path, analyzer, samples=None):
+        super().__init__()
+        self.file_path = file_path
+        self.analyzer = analyzer
+        self.samples = samples  # 이미 디코딩된 PCM (미리 듣기 플레이어 버퍼에서 생성)
+
+    def run(self):
+        """캐시 조회 또는 디코딩 + 계산"""
+        import spectrogram_cache  # 오디오 변환 모듈 포함, 미리 듣기 전에는 불필요
+
+        data = spectrogram_cache.load_or_build(
+            self.file_path, self.analyzer,
+            on_samples=lambda samples: self.decoded.emit(self.file_path, samples),
+            samples=self.samples
+        )
+        if data is not None:
+            self.ready.emit(self.file_path, data)
 
 
 class EqualizerWidget(QWidget):
-    """그래픽 이퀄라이저 위젯"""
+    """그래픽 이퀄라이저 위젯 (스펙트럼 분석기)"""
+
+    # 시그널
+    waveform_ready = pyqtSignal(object)  # 사전 계산된 파형 개요 (SpectrogramData.waveform, 새 파일이면 None)
+
+    # 분석용 디코딩 샘플레이트
+    ANALYSIS_RATE = 22050
+
+    # 막대 반응 속도 (20 FPS 기준 프레임당 목표값에 다가가는 비율, 실제 FPS에 맞춰 환산)
+    ATTACK = 0.6  # 상승
+    DECAY = 0.15  # 하강
+    REFERENCE_FPS = 20
+
+    # 피크 표시
+    PEAK_HOLD_SEC = 0.5  # 최고점 유지 시간
+    PEAK_FALLOFF = 0.8  # 유지 후 하강 속도 (레벨/초)
+    PEAK_HEIGHT = 2  # 피크 표시 두께 (px)
+
+    # 프레임 레이트
+    MAX_FPS = 60  # 최대 (데이터가 더 빨라도 이 이상 그리지 않음)
+    IDLE_FPS = 10  # 재생 중이지만 막대가 정지한 상태 (무음 등)
+
+    # 그리기 설정
+    BAR_MARGIN = 5  # 위/아래 여백 (px)
+    BACKGROUND_COLOR = QColor(26, 26, 26)
+    TEXT_COLOR = QColor(100, 100, 100)
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
         # 이퀄라이저 설정
         self.num_bars = 20  # 막대 개수
-        self.bar_values = [0.0] * self.num_bars  # 각 막대의 높이 (0.0 ~ 1.0)
         self.is_playing = False
+        self._clear_bar_state()
 
-        # 애니메이션 타이머
+        # 스펙트럼 분석 (처음 파일을 로드할 때 생성)
+        self.analyzer = None
+        self.samples = None  # 디코딩된 int16 Mono PCM (사전 계산 완료 전까지 사용)
+        self.spectrogram = None  # 사전 계산된 SpectrogramData
+        self.source_path = None
+        self.position_source = None  # 현재 재생 위치(ms)를 반환하는 함수
+        self._decode_threads = []
+
+        # 애니메이션 타이머 (데이터 속도/표시 상태에 따라 간격 조정)
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_bars)
-        self.timer.setInterval(50)  # 50ms (20 FPS)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1000 // self.REFERENCE_FPS)
+        self._last_tick = None
 
-        # 색상 그라디언트
+        # 색상 그라디언트 (막대 아래 → 위)
         self.colors = [
-            QColor(0, 255, 0),      # 녹색 (낮은 주파수)
-            QColor(255, 255, 0),    # 노란색 (중간 주파수)
-            QColor(255, 0, 0)       # 빨간색 (높은 주파수)
+            QColor(0, 255, 0),      # 녹색 (낮은 레벨)
+            QColor(255, 255, 0),    # 노란색 (중간 레벨)
+            QColor(255, 0, 0)       # 빨간색 (높은 레벨)
         ]
 
+        # 그리기 캐시 (위젯 크기/막대 개수가 바뀌면 다시 생성)
+        self._gradient_pixmap = None  # 막대 영역 전체를 그라디언트로 미리 그린 이미지
+        self._bar_x = []  # 막대별 x 좌표
+        self._bar_w = 0  # 막대 폭
+        self._idle = True  # 안내 문구 표시 상태
+
+    def _clear_bar_state(self):
+        """막대 상태 해제 (재생 중이 아닐 때, 다음 start()에서 다시 생성)"""
+        self.bar_values = None  # 각 막대의 높이 (0.0 ~ 1.0)
+        self.peak_values = None  # 피크 높이 (0.0 ~ 1.0)
+        self._peak_hold = None  # 피크 유지 종료 시각
+        self._painted_heights = None  # 마지막으로 그린 막대 높이 (px)
+        self._painted_peaks = None  # 마지막으로 그린 피크 높이 (px)
+
+    def _reset_bar_state(self):
+        """막대 상태 배열 초기화"""
+        import numpy as np
+
+        n = self.num_bars
+        self.bar_values = np.zeros(n, dtype=np.float32)  # 각 막대의 높이 (0.0 ~ 1.0)
+        self.peak_values = np.zeros(n, dtype=np.float32)  # 피크 높이 (0.0 ~ 1.0)
+        self._peak_hold = np.zeros(n, dtype=np.float64)  # 피크 유지 종료 시각
+        self._painted_heights = np.zeros(n, dtype=np.int32)  # 마지막으로 그린 막대 높이 (px)
+        self._painted_peaks = np.zeros(n, dtype=np.int32)  # 마지막으로 그린 피크 높이 (px)
+
+    def set_num_bars(self, num_bars):
+        """
+        막대 개수 변경 (64~128개 등 많은 막대 지원)
+
+        Args:
+            num_bars: 막대 개수
+        """
+        self.num_bars = num_bars
+        if self.bar_values is not None:
+            self._reset_bar_state()
+        self.analyzer = None
+        self._invalidate_geometry()
+
+        # 대역 수가 바뀌었으므로 스펙트로그램 다시 준비
+        if self.source_path:
+            path = self.source_path
+            self.source_path = None
+            self.load_file(path)
+
+    def set_position_source(self, position_source):
+        """
+        재생 위치 함수 설정
+
+        Args:
+            position_source: 현재 재생 위치(ms)를 반환하는 함수 (예: QMediaPlayer.position)
+        """
+        self.position_source = position_source
+
+    def load_file(self, file_path, samples=None):
+        """
+        미리 듣기 파일의 스펙트로그램을 백그라운드에서 준비 (캐시 또는 계산)
+
+        Args:
+            file_path: 오디오 파일 경로
+            samples: 이미 디코딩된 ANALYSIS_RATE Mono PCM (있으면 다시 디코딩하지 않음)
+        """
+        if file_path == self.source_path and (self.spectrogram is not None or self.samples is not None):
+            return
+
+        if self.analyzer is None:
+            from spectrum_analyzer import SpectrumAnalyzer
+
+            self.analyzer = SpectrumAnalyzer(self.ANALYSIS_RATE, num_bands=self.num_bars)
+
+        self.source_path = file_path
+        self.samples = samples  # 스펙트로그램 계산 중에는 실시간 분석
+        self.spectrogram = None
+        self.waveform_ready.emit(None)
+        if samples is not None:
+            self._schedule_timer()
+
+        thread = SpectrogramThread(file_path, self.analyzer, samples)
+        thread.decoded.connect(self.on_pcm_decoded)
+        thread.ready.connect(self.on_spectrogram_ready)
+        thread.finished.connect(lambda t=thread: self._decode_threads.remove(t))
+        self._decode_threads.append(thread)
+        thread.start()
+
+    def on_pcm_decoded(self, file_path, samples):
+        """디코딩 완료 (다른 파일이 선택된 뒤 끝난 결과는 무시)"""
+        if file_path == self.source_path and self.spectrogram is None:
+            self.samples = samples
+            self._schedule_timer()
+
+    def on_spectrogram_ready(self, file_path, spectrogram):
+        """사전 계산 완료 → 이후에는 프레임 조회만 수행"""
+        if file_path == self.source_path:
+            self.spectrogram = spectrogram
+            self.samples = None
+            self._schedule_timer()
+            self.waveform_ready.emit(spectrogram.waveform)
+
     def start(self):
         """이퀄라이저 애니메이션 시작"""
         self.is_playing = True
-        self.timer.start()
+        if self.bar_values is None:
+            self._reset_bar_state()
+        if self._idle:
+            self._idle = False
+            self.update()  # 안내 문구 지우기
+        self._last_tick = None
+        self._schedule_timer()
 
     def stop(self):
         """이퀄라이저 애니메이션 중지"""
         self.is_playing = False
         self.timer.stop()
-        # 모든 막대를 0으로 초기화
-        self.bar_values = [0.0] * self.num_bars
+        # 막대 상태 해제 (다음 재생은 0부터)
+        self._clear_bar_state()
+        self._idle = True
         self.update()
 
+    def data_fps(self):
+        """현재 데이터 소스의 갱신 속도 (프레임/초, 데이터 없으면 0)"""
+        if self.spectrogram is not None:
+            return 1000.0 / self.spectrogram.frame_ms
+        if self.samples is not None:
+            return self.MAX_FPS  # 실시간 분석은 원하는 만큼 자주 가능
+        return 0.0
+
+    def current_levels(self):
+        """현재 재생 위치의 대역별 레벨 (데이터가 없으면 None)"""
+        if self.position_source is None:
+            return None
+
+        position_ms = self.position_source()
+
+        # 사전 계산된 스펙트로그램이 있으면 프레임 조회
+        if self.spectrogram is not None:
+            return self.spectrogram.levels_at(position_ms)
+
+        # 계산 중이면 디코딩된 PCM으로 실시간 분석
+        if self.samples is not None:
+            index = position_ms * self.ANALYSIS_RATE // 1000
+            return self.analyzer.analyze_at(self.samples, index)
+
+        return None
+
     def update_bars(self):
-        """막대 값 업데이트 (애니메이션)"""
+        """막대 값 업데이트 (애니메이션, 전체 막대를 배열 연산으로 처리)"""
+        import numpy as np
+
         if not self.is_playing:
             return
 
-        # 각 막대에 랜덤한 값 설정 (부드러운 움직임을 위해 이전 값 고려)
-        for i in range(self.num_bars):
-            # 타겟 값 (0.1 ~ 1.0)
-            target = random.uniform(0.1, 1.0)
+        # 화면에 보이지 않으면 (창 최소화, 숨김) 타이머 정지 → showEvent에서 재개
+        if not self._is_shown():
+            self.timer.stop()
+            return
 
-            # 부드러운 전환 (이전 값의 70% + 새 값의 30%)
-            self.bar_values[i] = self.bar_values[i] * 0.7 + target * 0.3
+        now = time.monotonic()
+        dt = 1.0 / self.REFERENCE_FPS if self._last_tick is None else min(now - self._last_tick, 0.2)
+        self._last_tick = now
 
-        # 화면 업데이트
-        self.update()
+        levels = self.current_levels()
+        values = self.bar_values
+
+        # 타겟 값 (디코딩 전이면 0으로 내려감)
+        if levels is None:
+            target = np.zeros_like(values)
+        else:
+            target = np.asarray(levels, dtype=np.float32)
+
+        # 상승은 빠르게, 하강은 천천히 (프레임 간격에 맞춰 환산)
+        frames = dt * self.REFERENCE_FPS
+        attack = 1.0 - (1.0 - self.ATTACK) ** frames
+        decay = 1.0 - (1.0 - self.DECAY) ** frames
+        values += (target - values) * np.where(target > values, attack, decay).astype(np.float32)
+
+        # 피크: 막대가 올라오면 갱신 후 유지, 유지 시간이 지나면 천천히 하강
+        peaks = self.peak_values
+        rising = values >= peaks
+        peaks[rising] = values[rising]
+        self._peak_hold[rising] = now + self.PEAK_HOLD_SEC
+
+        falling = ~rising & (now > self._peak_hold)
+        peaks[falling] = np.maximum(peaks[falling] - self.PEAK_FALLOFF * dt, values[falling])
+
+        # 변경된 막대 영역만 다시 그리기
+        changed = self._update_changed_bars()
+
+        # 다음 프레임 간격 결정
+        self._schedule_timer(changed=changed, has_data=levels is not None)
+
+    def _schedule_timer(self, changed=True, has_data=True):
+        """
+        타이머 간격 조정
+
+        - 막대가 움직이는 중: 데이터 갱신 속도 (최대 MAX_FPS)
+        - 데이터는 있지만 막대 정지 (무음 등): IDLE_FPS
+        - 데이터 없고 막대 정지: 타이머 정지 (데이터 도착/재생 시작 시 재개)
+        """
+        if not self.is_playing or not self._is_shown():
+            self.timer.stop()
+            return
+
+        if changed:
+            fps = min(self.data_fps() or self.REFERENCE_FPS, self.MAX_FPS)
+        elif has_data:
+            fps = self.IDLE_FPS
+        else:
+            self.timer.stop()
+            return
+
+        interval = int(1000 / fps)
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
+        if not self.timer.isActive():
+            self._last_tick = None
+            self.timer.start()
+
+    def _is_shown(self):
+        """화면에 실제로 보이는지 (숨김/최소화 제외)"""
+        return self.isVisible() and not self.window().isMinimized()
+
+    def showEvent(self, event):
+        """다시 보이면 애니메이션 재개"""
+        super().showEvent(event)
+        if self.is_playing:
+            self._schedule_timer()
+
+    def hideEvent(self, event):
+        """숨겨지면 (창 최소화 포함) 애니메이션 정지"""
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def resizeEvent(self, event):
+        """크기 변경 시 그리기 캐시 무효화"""
+        self._invalidate_geometry()
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
-        """이퀄라이저 그리기"""
+        """이퀄라이저 그리기 (다시 그릴 영역만)"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        dirty = event.rect()
 
         # 배경색
-        painter.fillRect(self.rect(), QColor(26, 26, 26))
+        painter.fillRect(dirty, self.BACKGROUND_COLOR)
 
-        if not self.is_playing and all(v == 0.0 for v in self.bar_values):
+        if self._idle:
             # 재생 중이 아니면 중앙에 텍스트 표시
-            painter.setPen(QColor(100, 100, 100))
+            painter.setPen(self.TEXT_COLOR)
             painter.drawText(self.rect(), Qt.AlignCenter, "이퀄라이저 (미리 듣기 시 표시)")
             return
 
-        # 막대 그리기
-        width = self.width()
-        height = self.height()
+        if self._gradient_pixmap is None:
+            self._build_geometry()
+
+        # 다시 그릴 영역에 걸친 막대만 그라디언트 이미지에서 잘라 붙이기
+        bottom = self.height() - self.BAR_MARGIN
+        pixmap = self._gradient_pixmap
+        bar_w = self._bar_w
+        bar_x = self._bar_x
+        bars = self._bars_in(dirty)
+        heights = self._painted_heights[bars.start:bars.stop].tolist()
+        peaks = self._painted_peaks[bars.start:bars.stop].tolist()
+
+        for i, bar_height, peak_height in zip(bars, heights, peaks):
+            x = bar_x[i]
+            if bar_height > 0:
+                y = bottom - bar_height
+                painter.drawPixmap(x, y, pixmap, x, y, bar_w, bar_height)
+            if peak_height > bar_height:
+                y = bottom - peak_height
+                painter.drawPixmap(x, y, pixmap, x, y, bar_w, self.PEAK_HEIGHT)
+
+    def _invalidate_geometry(self):
+        """그리기 캐시 무효화"""
+        self._gradient_pixmap = None
+        self.update()
+
+    def _build_geometry(self):
+        """막대 위치 계산 및 그라디언트 이미지 생성 (크기당 1회)"""
+        width = max(self.width(), 1)
+        height = max(self.height(), 1)
 
         bar_width = width / self.num_bars
-        spacing = 2  # 막대 간격
-
-        for i in range(self.num_bars):
-            # 막대 위치 및 크기
-            x = i * bar_width + spacing / 2
-            bar_height = self.bar_values[i] * (height - 10)
-            y = height - bar_height - 5
-
-            # 막대 색상 (그라디언트)
-            color = self.get_bar_color(self.bar_values[i])
-
-            # 막대 그리기
-            painter.fillRect(
-                int(x),
-                int(y),
-                int(bar_width - spacing),
-                int(bar_height),
-                color
-            )
-
-    def get_bar_color(self, value):
-        """막대 높이에 따른 색상 반환 (그라디언트)"""
-        if value < 0.33:
-            # 녹색
-            return QColor(0, 255, 0)
-        elif value < 0.66:
-            # 녹색 → 노란색
-            ratio = (value - 0.33) / 0.33
-            r = int(255 * ratio)
-            g = 255
-            b = 0
-            return QColor(r, g, b)
-        else:
-            # 노란색 → 빨간색
-            ratio = (value - 0.66) / 0.34
-            r = 255
-            g = int(255 * (1 - ratio))
-            b = 0
-            return QColor(r, g, b)
+        spacing = 2 if bar_width >= 6 else 1  # 막대 간격 (막대가 많으면 1px)
+        self._bar_x = [int(i * bar_width + spacing / 2) for i in range(self.num_bars)]
+        self._bar_w = max(int(bar_width - spacing), 1)
+
+        # 막대 영역 전체를 아래(녹색) → 위(빨간색) 그라디언트로 채운 이미지
+        pixmap = QPixmap(width, height)
+        pixmap.fill(self.BACKGROUND_COLOR)
+
+        top = self.BAR_MARGIN
+        bottom = height - self.BAR_MARGIN
+        gradient = QLinearGradient(0, bottom, 0, top)
+        gradient.setColorAt(0.0, self.colors[0])
+        gradient.setColorAt(0.33, self.colors[0])
+        gradient.setColorAt(0.66, self.colors[1])
+        gradient.setColorAt(1.0, self.colors[2])
+
+        painter = QPainter(pixmap)
+        painter.fillRect(0, top, width, bottom - top, gradient)
+        painter.end()
+
+        self._gradient_pixmap = pixmap
+        self._painted_heights = self._to_pixels(self.bar_values)
+        self._painted_peaks = self._peak_pixels(self.peak_values)
+
+    def _to_pixels(self, values):
+        """막대 값 배열 → 높이 (px) 배열"""
+        import numpy as np
+
+        usable = self.height() - 2 * self.BAR_MARGIN
+        return (values * usable).astype(np.int32)
+
+    def _peak_pixels(self, peaks):
+        """피크 값 배열 → 피크 표시 위치 (px) 배열 (0이면 표시 안 함)"""
+        import numpy as np
+
+        usable = self.height() - 2 * self.BAR_MARGIN
+        pixels = (peaks * usable).astype(np.int32)
+        return np.where(pixels > 0, np.minimum(pixels + self.PEAK_HEIGHT, usable), 0).astype(np.int32)
+
+    def _bars_in(self, rect):
+        """rect와 겹치는 막대 인덱스 범위"""
+        bar_width = max(self.width(), 1) / self.num_bars
+        first = max(int(rect.left() / bar_width), 0)
+        last = min(int(rect.right() / bar_width) + 1, self.num_bars)
+        return range(first, last)
+
+    def _update_changed_bars(self):
+        """
+        높이가 바뀐 막대들을 감싸는 영역만 update() 요청
+
+        Returns:
+            bool: 변경된 막대가 있었는지
+        """
+        import numpy as np
+
+        if self._gradient_pixmap is None:
+            self.update()  # 첫 그리기 또는 크기 변경 후에는 전체
+            return True
+
+        new_heights = self._to_pixels(self.bar_values)
+        new_peaks = self._peak_pixels(self.peak_values)
+        old_heights = self._painted_heights
+        old_peaks = self._painted_peaks
+
+        changed = np.flatnonzero((new_heights != old_heights) | (new_peaks != old_peaks))
+        if len(changed) == 0:
+            return False  # 변경 없음
+
+        tallest = int(max(new_heights[changed].max(), old_heights[changed].max(),
+                          new_peaks[changed].max(), old_peaks[changed].max()))
+        self._painted_heights = new_heights
+        self._painted_peaks = new_peaks
+
+        left = int(changed[0])
+        right = int(changed[-1])
+        bottom = self.height() - self.BAR_MARGIN
+        x = self._bar_x[left]
+        w = self._bar_x[right] + self._bar_w - x
+        self.update(QRect(x, bottom - tallest, w, tallest))
+        return True
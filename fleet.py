@@ -0,0 +1,265 @@
+"""
+fleet.py
+
+여러 보드 동시 제어 (대량 프로비저닝)
+- 포트 검색 + HELLO로 보드 식별
+- 같은 작업 계획(명령 / 업로드)을 모든 보드에서 동시에 실행
+- 보드별 진행률, 실패 격리 (한 보드 실패가 다른 보드에 영향 없음), 요약 보고서
+
+모든 보드를 이벤트 루프 하나에서 처리 (serial_async.AsyncSerialPort)
+
+계획 파일 (JSON):
+    {
+        "steps": [
+            {"command": "STOP 0"},
+            {"upload": "converted/intro_32k16m.wav", "channel": 0},
+            {"command": "LS 0"}
+        ]
+    }
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from serial_async import AsyncSerialPort
+from serial_core import DEFAULT_BAUDRATE, list_serial_ports
+from ymodem_core import TransferStats, send_file_async
+
+
+HELLO_TIMEOUT = 1.0  # 보드 식별 응답 대기 (초)
+UPLOAD_READY_TIMEOUT = 2.0  # UPLOAD 명령 응답 대기 (초)
+UPLOAD_COMPLETE_TIMEOUT = 5.0  # 전송 후 저장 완료 응답 대기 (초)
+
+
+def parse_plan(data):
+    """
+    작업 계획 검증 및 정규화
+
+    Args:
+        data: {"steps": [...]} 또는 단계 목록
+
+    Returns:
+        list: [('command', 명령) | ('upload', 채널, 파일 경로), ...]
+
+    Raises:
+        ValueError: 잘못된 단계
+    """
+    raw_steps = data.get('steps', []) if isinstance(data, dict) else data
+    steps = []
+
+    for i, step in enumerate(raw_steps):
+        if 'command' in step:
+            steps.append(('command', str(step['command'])))
+        elif 'upload' in step:
+            channel = int(step.get('channel', -1))
+            if not 0 <= channel <= 5:
+                raise ValueError(f"Step {i + 1}: channel must be 0~5")
+            steps.append(('upload', channel, step['upload']))
+        else:
+            raise ValueError(f"Step {i + 1}: unknown step {step!r}")
+
+    return steps
+
+
+def load_plan(plan_path):
+    """
+    계획 파일 읽기 (업로드 파일의 상대 경로는 계획 파일 기준)
+
+    Returns:
+        list: parse_plan() 결과
+    """
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        steps = parse_plan(json.load(f))
+
+    base_dir = os.path.dirname(os.path.abspath(plan_path))
+    return [(s[0], s[1], os.path.join(base_dir, s[2])) if s[0] == 'upload' else s
+            for s in steps]
+
+
+async def identify(port_name, baudrate=DEFAULT_BAUDRATE, timeout=HELLO_TIMEOUT):
+    """
+    HELLO 명령으로 보드 식별
+
+    Returns:
+        dict: {'port', 'ok', 'hello'} (실패 시 'error')
+    """
+    try:
+        async with AsyncSerialPort(port_name, baudrate) as port:
+            response = await port.command("HELLO", timeout=timeout)
+    except Exception as e:
+        return {'port': port_name, 'ok': False, 'error': str(e)}
+
+    hello = next((line for line in response if line.startswith('OK')), None)
+    if hello is None:
+        return {'port': port_name, 'ok': False, 'error': 'no HELLO response',
+                'response': response}
+    return {'port': port_name, 'ok': True, 'hello': hello}
+
+
+async def discover(ports=None, baudrate=DEFAULT_BAUDRATE, timeout=HELLO_TIMEOUT):
+    """
+    연결된 보드 검색 (모든 포트 동시 식별)
+
+    Args:
+        ports: 확인할 포트 목록 (None이면 list_serial_ports())
+
+    Returns:
+        list: identify() 결과 (응답한 보드만)
+    """
+    ports = list_serial_ports() if ports is None else ports
+    results = await asyncio.gather(*(identify(p, baudrate, timeout) for p in ports))
+    return [r for r in results if r['ok']]
+
+
+class BoardJob:
+    """보드 1대에서 작업 계획 실행"""
+
+    def __init__(self, port_name, steps, baudrate=DEFAULT_BAUDRATE,
+                 on_event=None, stop_on_error=True, executor=None):
+        """
+        Args:
+            port_name: 시리얼 포트
+            steps: parse_plan() 결과
+            baudrate: 보드레이트
+            on_event: 진행 콜백 f(port, kind, value)
+                      kind: 'step' (설명), 'progress' (0~100), 'status' (메시지)
+            stop_on_error: 단계 실패 시 남은 단계 중단
+            executor: AsyncSerialPort가 사용할 executor (None이면 루프 기본 executor)
+        """
+        self.port_name = port_name
+        self.steps = steps
+        self.baudrate = baudrate
+        self.on_event = on_event
+        self.stop_on_error = stop_on_error
+        self.executor = executor
+        self.bytes_sent = 0
+
+    def _emit(self, kind, value):
+        if self.on_event:
+            self.on_event(self.port_name, kind, value)
+
+    async def run(self):
+        """
+        계획 실행
+
+        Returns:
+            dict: {'port', 'ok', 'hello', 'steps', 'bytes', 'seconds'}
+        """
+        start = time.monotonic()
+        result = {'port': self.port_name, 'ok': False, 'steps': []}
+
+        try:
+            async with AsyncSerialPort(self.port_name, self.baudrate, self.executor) as port:
+                hello = await port.command("HELLO", timeout=HELLO_TIMEOUT)
+                if not any(line.startswith('OK') for line in hello):
+                    result['error'] = 'no HELLO response'
+                    return result
+                result['hello'] = hello[0]
+
+                for step in self.steps:
+                    if step[0] == 'command':
+                        step_result = await self._run_command(port, step[1])
+                    else:
+                        step_result = await self._run_upload(port, step[1], step[2])
+                    result['steps'].append(step_result)
+
+                    if not step_result['ok'] and self.stop_on_error:
+                        break
+
+        except Exception as e:
+            result['error'] = str(e)
+
+        finally:
+            result['bytes'] = self.bytes_sent
+            result['seconds'] = round(time.monotonic() - start, 3)
+
+        result['ok'] = ('error' not in result
+                        and len(result['steps']) == len(self.steps)
+                        and all(s['ok'] for s in result['steps']))
+        return result
+
+    async def _run_command(self, port, command):
+        """명령 단계"""
+        self._emit('step', command)
+        response = await port.command(command)
+        ok = bool(response) and not any(line.startswith('ERR') for line in response)
+        return {'command': command, 'ok': ok, 'response': response}
+
+    async def _run_upload(self, port, channel, file_path):
+        """업로드 단계 (UPLOAD 명령 + Y-MODEM)"""
+        file_name = os.path.basename(file_path)
+        step_result = {'upload': file_path, 'channel': channel, 'ok': False}
+        self._emit('step', f"UPLOAD {channel} {file_name}")
+
+        response = await port.command(f"UPLOAD {channel} {file_name}",
+                                      timeout=UPLOAD_READY_TIMEOUT, idle=0.05)
+        step_result['response'] = response
+        if any(line.startswith('ERR') for line in response):
+            step_result['message'] = 'board rejected upload'
+            return step_result
+
+        start = time.monotonic()
+        stats = TransferStats()
+        success, message = await send_file_async(
+            port, file_path,
+            on_progress=lambda pct: self._emit('progress', pct),
+            on_status=lambda msg: self._emit('status', msg),
+            stats=stats)
+        elapsed = time.monotonic() - start
+
+        step_result['ok'] = success
+        step_result['message'] = message
+        step_result['seconds'] = round(elapsed, 3)
+        step_result['transfer'] = stats.as_dict()
+        if success:
+            self.bytes_sent += os.path.getsize(file_path)
+            step_result['complete_response'] = await port.read_response(UPLOAD_COMPLETE_TIMEOUT)
+        return step_result
+
+
+async def run_fleet(ports, steps, baudrate=DEFAULT_BAUDRATE, on_event=None,
+                    stop_on_error=True):
+    """
+    모든 보드에서 작업 계획 동시 실행
+
+    Args:
+        ports: 포트 목록
+        steps: parse_plan() 결과
+        baudrate: 보드레이트
+        on_event: 진행 콜백 f(port, kind, value)
+        stop_on_error: 보드별로 단계 실패 시 남은 단계 중단
+
+    Returns:
+        dict: 요약 보고서 {'ok', 'boards', 'succeeded', 'failed', 'bytes',
+              'seconds', 'bytes_per_sec', 'results'}
+    """
+    # add_writer를 쓸 수 없는 환경(Windows)에서는 쓰기가 executor를 사용하므로 포트 수만큼 확보
+    # (실행이 끝나면 종료, 루프 기본 executor는 바꾸지 않음)
+    with ThreadPoolExecutor(max_workers=max(len(ports), 4)) as executor:
+        start = time.monotonic()
+        jobs = [BoardJob(p, steps, baudrate, on_event, stop_on_error, executor) for p in ports]
+        outcomes = await asyncio.gather(*(job.run() for job in jobs), return_exceptions=True)
+        elapsed = time.monotonic() - start
+
+    results = []
+    for job, outcome in zip(jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            outcome = {'port': job.port_name, 'ok': False, 'error': str(outcome),
+                       'steps': [], 'bytes': job.bytes_sent}
+        results.append(outcome)
+
+    total_bytes = sum(r['bytes'] for r in results)
+    succeeded = sum(1 for r in results if r['ok'])
+    return {
+        'ok': succeeded == len(results),
+        'boards': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'bytes': total_bytes,
+        'seconds': round(elapsed, 3),
+        'bytes_per_sec': round(total_bytes / elapsed) if elapsed > 0 else 0,
+        'results': results,
+    }
@@ -0,0 +1,318 @@
+"""
+instrumentation.py
+
+전송 성능 계측 (단계별 타이머, 히스토그램, 카운터)
+- 기본은 비활성: timer()는 공용 no-op 객체를 반환하고 count()/observe()는 즉시 반환
+- 활성화: enable() 또는 환경 변수 AUDIO_MUX_METRICS=<파일 경로> (GUI는 전송마다 이 파일로 내보냄)
+- 내보내기: JSON 또는 Prometheus 텍스트 형식 (node_exporter textfile collector용)
+
+계측 지점:
+- ymodem_core: 파일 읽기, 패킷 구성(CRC), WRITE 요청, ACK 대기, 전송 속도
+- serial_core: 시리얼 write() 호출, 송신 버퍼 비움 대기, 수신 바이트
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+
+
+METRICS_ENV = 'AUDIO_MUX_METRICS'
+PROMETHEUS_PREFIX = 'audio_mux_'
+
+# 히스토그램 구간 (상한값)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0)
+RATE_BUCKETS = (1e3, 5e3, 1e4, 2.5e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+# 이름: (종류, 설명, 히스토그램 구간)
+METRICS = {
+    'ymodem_disk_read_seconds': ('histogram', 'Time reading one block from the file',
+                                 LATENCY_BUCKETS),
+    'ymodem_packet_build_seconds': ('histogram', 'Time building one packet (padding + CRC)',
+                                    LATENCY_BUCKETS),
+    'ymodem_write_seconds': ('histogram', 'Time handing one frame to the serial port',
+                             LATENCY_BUCKETS),
+    'ymodem_ack_latency_seconds': ('histogram', 'Time from frame written to ACK received',
+                                   LATENCY_BUCKETS),
+    'ymodem_throughput_bytes_per_second': ('histogram', 'Effective payload rate per transfer',
+                                           RATE_BUCKETS),
+    'ymodem_transfers_total': ('counter', 'Y-MODEM transfers finished', None),
+    'ymodem_failed_transfers_total': ('counter', 'Y-MODEM transfers that failed', None),
+    'ymodem_bytes_total': ('counter', 'File bytes acknowledged by the receiver', None),
+    'ymodem_retries_total': ('counter', 'Frames retransmitted', None),
+    'ymodem_timeouts_total': ('counter', 'ACK timeouts', None),
+    'ymodem_naks_total': ('counter', 'NAKs received', None),
+    'serial_write_seconds': ('histogram', 'Duration of one serial write() call',
+                             LATENCY_BUCKETS),
+    'serial_drain_wait_seconds': ('histogram', 'Time waiting for the driver TX buffer to drain',
+                                  LATENCY_BUCKETS),
+    'serial_tx_bytes_total': ('counter', 'Bytes written to the serial port', None),
+    'serial_rx_bytes_total': ('counter', 'Bytes read from the serial port', None),
+}
+
+enabled = False
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus 방식) + 최소 / 최대"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        """값 기록"""
+        index = 0
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: {'count', 'sum', 'mean', 'min', 'max', 'buckets': {상한: 누적 개수}}
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, n in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class Registry:
+    """계측값 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.labels = {}
+        self.started = time.time()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                buckets = METRICS.get(name, (None, None, LATENCY_BUCKETS))[2]
+                histogram = self.histograms[name] = Histogram(buckets or LATENCY_BUCKETS)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {'labels', 'started', 'exported', 'counters', 'histograms'}
+        """
+        with self._lock:
+            return {
+                'labels': dict(self.labels),
+                'started': self.started,
+                'exported': time.time(),
+                'counters': dict(self.counters),
+                'histograms': {name: h.as_dict() for name, h in self.histograms.items()},
+            }
+
+
+_registry = Registry()
+
+
+class _Timer:
+    """경과 시간을 히스토그램에 기록하는 컨텍스트 관리자"""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """비활성 상태의 타이머 (아무것도 하지 않음)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def default_labels():
+    """호스트 정보 라벨 (버전별 비교용)"""
+    return {
+        'host_os': platform.system(),
+        'python': platform.python_version(),
+    }
+
+
+def enable(labels=None):
+    """
+    계측 활성화
+
+    Args:
+        labels: 모든 지표에 붙일 라벨 (예: {'firmware': 'v1.2'})
+    """
+    global enabled
+    _registry.labels = default_labels()
+    _registry.labels.update(labels or {})
+    enabled = True
+
+
+def disable():
+    """계측 비활성화 (기록된 값은 유지)"""
+    global enabled
+    enabled = False
+
+
+def enable_from_env():
+    """
+    AUDIO_MUX_METRICS 환경 변수가 있으면 계측 활성화
+
+    Returns:
+        str: 내보낼 파일 경로 (설정되지 않았으면 None)
+    """
+    path = os.environ.get(METRICS_ENV)
+    if path:
+        enable()
+    return path or None
+
+
+def set_label(key, value):
+    """라벨 추가 / 변경 (예: 연결한 보드의 펌웨어 버전)"""
+    _registry.labels[key] = str(value)
+
+
+def reset():
+    """기록된 값 초기화"""
+    _registry.reset()
+
+
+def timer(name):
+    """
+    구간 시간 측정 (with 문)
+
+        with instrumentation.timer('ymodem_disk_read_seconds'):
+            data = f.read(BLOCK_SIZE)
+    """
+    return _Timer(name) if enabled else _NULL_TIMER
+
+
+def observe(name, value):
+    """히스토그램에 값 기록"""
+    if enabled:
+        _registry.observe(name, value)
+
+
+def count(name, n=1):
+    """카운터 증가"""
+    if enabled:
+        _registry.count(name, n)
+
+
+def snapshot():
+    """현재 계측값 (dict)"""
+    return _registry.snapshot()
+
+
+def to_prometheus(snap=None):
+    """
+    Prometheus 텍스트 형식으로 변환
+
+    Returns:
+        str: exposition format 텍스트
+    """
+    snap = snap if snap is not None else snapshot()
+    label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(snap['labels'].items()))
+    lines = []
+
+    def header(name, kind):
+        help_text = METRICS.get(name, (None, name))[1]
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} {kind}")
+
+    def sample(name, value, extra=''):
+        labels = ','.join(part for part in (label_text, extra) if part)
+        lines.append(f"{PROMETHEUS_PREFIX}{name}{{{labels}}} {value}" if labels
+                     else f"{PROMETHEUS_PREFIX}{name} {value}")
+
+    for name, value in sorted(snap['counters'].items()):
+        header(name, 'counter')
+        sample(name, value)
+
+    for name, histogram in sorted(snap['histograms'].items()):
+        header(name, 'histogram')
+        for bound, cumulative in histogram['buckets'].items():
+            sample(f"{name}_bucket", cumulative, f'le="{bound}"')
+        sample(f"{name}_sum", repr(histogram['sum']))
+        sample(f"{name}_count", histogram['count'])
+
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export(path):
+    """
+    파일로 내보내기 (.prom / .txt는 Prometheus 형식, 그 외는 JSON)
+
+    수집기가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+
+    Returns:
+        str: 내보낸 파일 경로
+    """
+    snap = snapshot()
+    if path.endswith(('.prom', '.txt')):
+        text = to_prometheus(snap)
+    else:
+        text = json.dumps(snap, indent=2)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,226 @@
+"""
+library_dialog.py
+
+오디오 라이브러리 창 (색인된 파일 검색 → 변환 입력 / 업로드 파일로 선택)
+"""
+
+import os
+
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QPushButton,
+                             QTableWidget, QTableWidgetItem, QLabel, QFileDialog, QHeaderView,
+                             QAbstractItemView)
+
+import library_index
+from library_thread import LibraryScanThread
+
+
+SEARCH_DELAY_MS = 150  # 입력이 멈춘 뒤 검색 (키 입력마다 조회하지 않음)
+
+COLUMNS = ("파일", "형식", "샘플레이트", "채널", "비트", "길이", "스펙", "폴더")
+FILTERS = (("전체", None), ("스펙 일치 (업로드 가능)", True), ("변환 필요", False))
+
+
+class LibraryDialog(QDialog):
+    """오디오 라이브러리 창"""
+
+    # 시그널
+    convert_requested = pyqtSignal(str)  # 변환 입력 파일로 선택
+    upload_requested = pyqtSignal(str)  # 업로드 파일로 선택
+    message = pyqtSignal(str, str)  # (로그 메시지, 색상)
+
+    def __init__(self, index_path, parent=None):
+        """
+        Args:
+            index_path: 색인 파일 경로
+        """
+        super().__init__(parent)
+        self.setWindowTitle("오디오 라이브러리")
+        self.resize(900, 560)
+
+        self.index = library_index.LibraryIndex(index_path)
+        self.scan_thread = None
+        self.rows = []  # 표에 표시 중인 조회 결과
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.refresh)
+
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        """UI 구성"""
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.lineEdit_Search = QLineEdit()
+        self.lineEdit_Search.setPlaceholderText("검색 (파일 이름/폴더, 공백으로 여러 단어)")
+        self.lineEdit_Search.textChanged.connect(self.search_timer.start)
+        top.addWidget(self.lineEdit_Search, 1)
+
+        self.comboBox_Filter = QComboBox()
+        for label, _ in FILTERS:
+            self.comboBox_Filter.addItem(label)
+        self.comboBox_Filter.currentIndexChanged.connect(self.refresh)
+        top.addWidget(self.comboBox_Filter)
+
+        self.pushButton_AddFolder = QPushButton("폴더 추가...")
+        self.pushButton_AddFolder.clicked.connect(self.add_folder)
+        top.addWidget(self.pushButton_AddFolder)
+
+        self.pushButton_Rescan = QPushButton("다시 색인")
+        self.pushButton_Rescan.clicked.connect(self.toggle_rescan)
+        top.addWidget(self.pushButton_Rescan)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(len(COLUMNS) - 1, QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        self.table.itemDoubleClicked.connect(self.choose_default)
+        layout.addWidget(self.table, 1)
+
+        bottom = QHBoxLayout()
+        self.label_Status = QLabel()
+        bottom.addWidget(self.label_Status, 1)
+
+        self.pushButton_Convert = QPushButton("변환 입력으로")
+        self.pushButton_Convert.clicked.connect(lambda: self.choose(self.convert_requested))
+        bottom.addWidget(self.pushButton_Convert)
+
+        self.pushButton_Upload = QPushButton("업로드 파일로")
+        self.pushButton_Upload.clicked.connect(lambda: self.choose(self.upload_requested))
+        bottom.addWidget(self.pushButton_Upload)
+
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.close)
+        bottom.addWidget(close_btn)
+        layout.addLayout(bottom)
+
+        self.update_buttons()
+
+    def refresh(self):
+        """검색 조건으로 다시 조회 (최대 QUERY_LIMIT개 표시)"""
+        conforms = FILTERS[self.comboBox_Filter.currentIndex()][1]
+        self.rows = self.index.query(contains=self.lineEdit_Search.text(), conforms=conforms)
+        total = library_index.count(self.index.path, conforms)
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(self.rows))
+        for row, entry in enumerate(self.rows):
+            self.set_row(row, entry)
+        self.table.setUpdatesEnabled(True)
+
+        shown = f"{len(self.rows)}개 표시"
+        if len(self.rows) >= library_index.QUERY_LIMIT:
+            shown += " (검색어로 범위를 좁히세요)"
+        self.label_Status.setText(f"{shown} / 색인된 파일 {total}개")
+        self.update_buttons()
+
+    def set_row(self, row, entry):
+        """표 한 줄 설정"""
+        duration = entry['duration']
+        if entry['conforms'] == 1:
+            spec = "OK"
+        elif entry['conforms'] == 0:
+            spec = "변환 필요"
+        else:
+            spec = "확인 불가"
+        values = (
+            entry['name'],
+            entry['format'],
+            f"{entry['sample_rate']}Hz" if entry['sample_rate'] else "",
+            str(entry['channels'] or ""),
+            f"{entry['sample_width'] * 8}bit" if entry['sample_width'] else "",
+            f"{int(duration) // 60}:{int(duration) % 60:02d}" if duration is not None else "",
+            spec,
+            os.path.dirname(entry['path']),
+        )
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if col == 6 and entry['issues']:
+                item.setToolTip(entry['issues'].replace('; ', '\n'))
+            if col == 6 and entry['conforms'] == 0:
+                item.setForeground(Qt.red)
+            self.table.setItem(row, col, item)
+
+    def selected(self):
+        """선택된 항목 (없으면 None)"""
+        rows = self.table.selectionModel().selectedRows()
+        return self.rows[rows[0].row()] if rows else None
+
+    def update_buttons(self):
+        """선택 항목에 따라 버튼 활성화 (업로드는 스펙 일치 파일만)"""
+        entry = self.selected()
+        self.pushButton_Convert.setEnabled(entry is not None)
+        self.pushButton_Upload.setEnabled(entry is not None and entry['conforms'] == 1)
+
+    def choose(self, signal):
+        """선택 파일 전달"""
+        entry = self.selected()
+        if entry is None:
+            return
+        if not os.path.exists(entry['path']):
+            self.message.emit(f"파일이 없습니다 (다시 색인하세요): {entry['path']}", 'red')
+            return
+        signal.emit(entry['path'])
+
+    def choose_default(self, item):
+        """더블 클릭: 스펙 일치 파일은 업로드, 그 외는 변환 입력으로"""
+        entry = self.selected()
+        if entry is not None:
+            self.choose(self.upload_requested if entry['conforms'] == 1 else self.convert_requested)
+
+    def add_folder(self):
+        """폴더 추가 후 색인"""
+        folder = QFileDialog.getExistingDirectory(self, "오디오 라이브러리 폴더 선택")
+        if folder:
+            self.start_scan([folder])
+
+    def toggle_rescan(self):
+        """등록된 모든 폴더 다시 색인 (색인 중에 누르면 중단)"""
+        if self.scan_thread and self.scan_thread.isRunning():
+            self.scan_thread.cancel()
+            return
+        folders = [r['path'] for r in self.index.roots()]
+        if not folders:
+            self.add_folder()
+            return
+        self.start_scan(folders)
+
+    def start_scan(self, folders):
+        """백그라운드 색인 시작 (바뀐 파일만 다시 읽음)"""
+        if self.scan_thread and self.scan_thread.isRunning():
+            return
+        self.scan_thread = LibraryScanThread(self.index, folders)
+        self.scan_thread.progress.connect(self.on_scan_progress)
+        self.scan_thread.finished.connect(self.on_scan_finished)
+        self.scan_thread.start()
+        self.pushButton_Rescan.setText("색인 중지")
+        self.pushButton_AddFolder.setEnabled(False)
+
+    def on_scan_progress(self, files, changed):
+        """색인 진행"""
+        self.label_Status.setText(f"색인 중... {files}개 확인, {changed}개 읽음")
+        self.search_timer.start()  # 새로 기록된 파일 반영
+
+    def on_scan_finished(self, success, message):
+        """색인 완료"""
+        self.pushButton_Rescan.setText("다시 색인")
+        self.pushButton_AddFolder.setEnabled(True)
+        self.message.emit(message, 'blue' if success else 'orange')
+        self.refresh()
+
+    def shutdown(self):
+        """색인 중단 및 색인 파일 닫기 (프로그램 종료 시)"""
+        if self.scan_thread and self.scan_thread.isRunning():
+            self.scan_thread.cancel()
+            self.scan_thread.wait()
+        self.index.close()
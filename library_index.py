@@ -0,0 +1,382 @@
+"""
+library_index.py
+
+오디오 라이브러리 색인 (SQLite, WAL 모드, Qt 비의존)
+- os.scandir로 폴더를 순회하며 오디오 파일의 형식/길이/보드 스펙 일치 여부를 기록
+- WAV는 헤더만 읽고(read_wav_header), 그 외 형식은 ffprobe로 조회 (스레드 풀)
+- 다시 색인할 때는 크기/수정 시각이 바뀐 파일만 다시 읽고, 사라진 파일은 삭제
+- 조회는 별도 연결을 사용하므로 색인 중에도 가능 (GUI 검색, 명령줄 도구)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_converter import AudioConverter, find_ffmpeg_tool, read_wav_header, wav_spec_errors
+
+
+LIBRARY_DB_ENV = 'AUDIO_MUX_LIBRARY_DB'  # 색인 파일 경로
+DEFAULT_LIBRARY_DB = os.path.join(os.path.expanduser('~'), '.audio_mux', 'library.sqlite3')
+
+# 색인 방법(스키마/기록 항목)이 바뀌면 올려서 이전 색인을 다시 만듦
+LIBRARY_VERSION = 1
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a', '.aac', '.wma', '.aiff', '.aif')
+
+BATCH_SIZE = 500  # 이만큼 읽을 때마다 커밋 (진행 상황 보고 단위)
+PROBE_WORKERS = 4  # 동시에 읽을 파일 수 (ffprobe 프로세스 수)
+QUERY_LIMIT = 500  # 조회 기본 최대 개수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    scanned REAL,
+    files INTEGER
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    sample_width INTEGER,
+    duration REAL,
+    conforms INTEGER,
+    issues TEXT,
+    indexed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+CREATE INDEX IF NOT EXISTS files_conforms ON files (conforms);
+"""
+
+_COLUMNS = ('path', 'name', 'format', 'size', 'mtime_ns', 'sample_rate', 'channels',
+            'sample_width', 'duration', 'conforms', 'issues', 'indexed')
+
+
+def default_library_path():
+    """색인 파일 경로 (AUDIO_MUX_LIBRARY_DB 환경 변수 우선)"""
+    return os.environ.get(LIBRARY_DB_ENV) or DEFAULT_LIBRARY_DB
+
+
+def read_file_info(file_path, can_probe=True):
+    """
+    오디오 파일 정보 (색인 항목)
+
+    Args:
+        file_path: 오디오 파일 경로
+        can_probe: ffprobe 사용 가능 여부 (False면 WAV 헤더만 읽음)
+
+    Returns:
+        dict: {'format', 'sample_rate', 'channels', 'sample_width', 'duration', 'conforms', 'issues'}
+              conforms: 1 스펙 일치, 0 불일치(변환 필요), None 확인하지 못함 (ffprobe 없음)
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    info = {'format': ext.lstrip('.').upper(), 'sample_rate': None, 'channels': None,
+            'sample_width': None, 'duration': None, 'conforms': None, 'issues': None}
+
+    if ext == '.wav':
+        try:
+            header = read_wav_header(file_path)
+        except wave.Error:
+            header = None  # PCM이 아닌 WAV (float, 압축 등) - ffprobe로 조회
+        except (OSError, EOFError) as e:
+            info.update(conforms=0, issues=f"읽기 오류: {e}")
+            return info
+
+        if header is not None:
+            errors = wav_spec_errors(header['sample_rate'], header['sample_width'],
+                                     header['channels'])
+            info.update(sample_rate=header['sample_rate'], channels=header['channels'],
+                        sample_width=header['sample_width'],
+                        duration=round(header['duration_sec'], 3),
+                        conforms=0 if errors else 1, issues='; '.join(errors) or None)
+            return info
+
+    if not can_probe:
+        return info
+
+    probe = AudioConverter.get_audio_info(file_path)
+    if not probe:
+        info.update(conforms=0, issues="오디오 정보를 읽을 수 없음")
+        return info
+
+    info.update(sample_rate=probe['sample_rate'], channels=probe['channels'],
+                sample_width=probe['sample_width'], duration=round(probe['duration_sec'], 3),
+                conforms=0)  # WAV(PCM)가 아니면 항상 변환 필요
+    errors = wav_spec_errors(probe['sample_rate'], probe['sample_width'], probe['channels'])
+    info['issues'] = '; '.join([f"형식: {info['format']} (필요: WAV)"] + errors)
+    return info
+
+
+def _range(root):
+    """root 아래 경로의 범위 조건 (기본 키 인덱스 사용)"""
+    prefix = os.path.join(root, '')
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class LibraryIndex:
+    """
+    오디오 라이브러리 색인
+
+    scan()은 호출 측 스레드에서 블로킹하므로 QThread(library_thread) 또는 명령줄에서 실행한다.
+    """
+
+    def __init__(self, path, probe_workers=PROBE_WORKERS):
+        """
+        Args:
+            path: SQLite 파일 경로
+            probe_workers: 동시에 읽을 파일 수
+        """
+        self.path = path
+        self.probe_workers = probe_workers
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        (version,) = self._conn.execute('PRAGMA user_version').fetchone()
+        if version != LIBRARY_VERSION:
+            # 색인은 언제든 다시 만들 수 있으므로 형식이 바뀌면 버림
+            self._conn.executescript('DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS roots;')
+            self._conn.execute(f'PRAGMA user_version={LIBRARY_VERSION}')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()  # _conn 사용 (scan / remove_root)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def scan(self, root, on_progress=None, is_cancelled=None):
+        """
+        폴더 색인 (하위 폴더 포함, 숨김 폴더 제외)
+
+        Args:
+            root: 폴더 경로
+            on_progress: 진행 콜백 f(확인한 파일 수, 새로 읽은 파일 수)
+            is_cancelled: 취소 확인 함수 () → bool
+
+        Returns:
+            dict: {'root', 'files', 'added', 'updated', 'unchanged', 'removed', 'errors',
+                   'cancelled', 'seconds'}
+        """
+        root = os.path.abspath(root)
+        start = time.monotonic()
+        can_probe = find_ffmpeg_tool('ffprobe') is not None
+        stats = {'root': root, 'files': 0, 'added': 0, 'updated': 0, 'unchanged': 0,
+                 'removed': 0, 'errors': 0, 'cancelled': False}
+
+        # 기존 항목 (크기, 수정 시각, 정보 확인 여부)
+        low, high = _range(root)
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT path, size, mtime_ns, sample_rate IS NULL AND conforms IS NULL '
+                'FROM files WHERE path >= ? AND path < ?', (low, high)).fetchall()
+        known = {path: (size, mtime_ns, unprobed) for path, size, mtime_ns, unprobed in rows}
+        seen = set()
+        pending = []
+
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as pool:
+            stack = [root]
+            while stack:
+                if is_cancelled and is_cancelled():
+                    stats['cancelled'] = True
+                    break
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    stats['errors'] += 1
+                    continue
+
+                with entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not entry.name.startswith('.'):
+                                    stack.append(entry.path)
+                                continue
+                            if os.path.splitext(entry.name)[1].lower() not in AUDIO_EXTENSIONS \
+                                    or not entry.is_file():
+                                continue
+                            st = entry.stat()  # Windows는 scandir 결과에 포함 (추가 호출 없음)
+                        except OSError:
+                            stats['errors'] += 1
+                            continue
+
+                        seen.add(entry.path)
+                        old = known.get(entry.path)
+                        if old is not None and old[:2] == (st.st_size, st.st_mtime_ns) \
+                                and not (old[2] and can_probe):
+                            stats['unchanged'] += 1
+                            continue
+                        stats['updated' if old is not None else 'added'] += 1
+                        pending.append((entry.path, entry.name, st.st_size, st.st_mtime_ns))
+
+                        if len(pending) >= BATCH_SIZE:
+                            self._write(pool, pending, can_probe)
+                            pending = []
+                            if on_progress:
+                                on_progress(len(seen), stats['added'] + stats['updated'])
+
+            if pending:
+                self._write(pool, pending, can_probe)
+
+        # 사라진 파일 삭제 (취소된 경우는 순회하지 못한 파일이 있으므로 생략)
+        if not stats['cancelled']:
+            removed = [(path,) for path in known if path not in seen]
+            with self._lock:
+                self._conn.executemany('DELETE FROM files WHERE path = ?', removed)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO roots (path, scanned, files) VALUES (?, ?, ?)',
+                    (root, time.time(), len(seen)))
+                self._conn.commit()
+            stats['removed'] = len(removed)
+
+        stats['files'] = len(seen)
+        stats['seconds'] = round(time.monotonic() - start, 3)
+        if on_progress:
+            on_progress(len(seen), stats['added'] + stats['updated'])
+        return stats
+
+    def _write(self, pool, pending, can_probe):
+        """파일 정보를 읽어 한 트랜잭션으로 기록"""
+        infos = pool.map(lambda item: read_file_info(item[0], can_probe), pending)
+        now = time.time()
+        rows = [(path, name, info['format'], size, mtime_ns, info['sample_rate'],
+                 info['channels'], info['sample_width'], info['duration'], info['conforms'],
+                 info['issues'], now)
+                for (path, name, size, mtime_ns), info in zip(pending, infos)]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO files ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+            self._conn.commit()
+
+    def remove_root(self, root):
+        """
+        폴더를 색인에서 제거 (다른 등록 폴더 아래 파일은 유지)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        root = os.path.abspath(root)
+        low, high = _range(root)
+        with self._lock:
+            self._conn.execute('DELETE FROM roots WHERE path = ?', (root,))
+            covered = any(root.startswith(os.path.join(other, ''))
+                          for (other,) in self._conn.execute('SELECT path FROM roots'))
+            count = 0
+            if not covered:
+                count = self._conn.execute(
+                    'DELETE FROM files WHERE path >= ? AND path < ?', (low, high)).rowcount
+            self._conn.commit()
+        return count
+
+    def query(self, **filters):
+        """파일 조회 (query() 함수와 같음)"""
+        return query(self.path, **filters)
+
+    def roots(self):
+        """등록된 폴더 목록 (roots() 함수와 같음)"""
+        return roots(self.path)
+
+
+def _connect(path):
+    """조회용 연결 (읽기 전용)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Library index not found: {path}")
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA query_only=ON')
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def query(path, contains=None, conforms=None, formats=None, root=None,
+          min_duration=None, max_duration=None, limit=QUERY_LIMIT):
+    """
+    파일 조회 (이름 순서)
+
+    Args:
+        path: SQLite 파일 경로
+        contains: 검색어 (공백으로 나눈 단어가 모두 경로에 포함, 대소문자 무시)
+        conforms: True 스펙 일치만, False 변환 필요만
+        formats: 형식 목록 (예: ['WAV', 'MP3'])
+        root: 이 폴더 아래만
+        min_duration: 최소 길이 (초)
+        max_duration: 최대 길이 (초)
+        limit: 최대 개수 (None이면 전체)
+
+    Returns:
+        list: [{'path', 'name', 'format', 'size', 'mtime_ns', 'sample_rate', 'channels',
+                'sample_width', 'duration', 'conforms', 'issues', 'indexed'}, ...]
+    """
+    conditions = []
+    params = []
+    for word in (contains or '').lower().split():
+        conditions.append("instr(lower(path), ?) > 0")
+        params.append(word)
+    if conforms is not None:
+        conditions.append("conforms = ?")
+        params.append(1 if conforms else 0)
+    if formats:
+        conditions.append(f"format IN ({', '.join('?' * len(formats))})")
+        params.extend(f.upper() for f in formats)
+    if root:
+        conditions.append("path >= ? AND path < ?")
+        params.extend(_range(os.path.abspath(root)))
+    for op, value in (('>=', min_duration), ('<=', max_duration)):
+        if value is not None:
+            conditions.append(f"duration {op} ?")
+            params.append(value)
+
+    sql = f"SELECT {', '.join(_COLUMNS)} FROM files"
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY name, path'
+    if limit:
+        sql += ' LIMIT ?'
+        params.append(limit)
+
+    conn = _connect(path)
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def count(path, conforms=None):
+    """
+    색인된 파일 수
+
+    Args:
+        conforms: True 스펙 일치만, False 변환 필요만, None 전체
+    """
+    conn = _connect(path)
+    try:
+        if conforms is None:
+            return conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+        return conn.execute('SELECT COUNT(*) FROM files WHERE conforms = ?',
+                            (1 if conforms else 0,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def roots(path):
+    """
+    등록된 폴더 목록
+
+    Returns:
+        list: [{'path', 'scanned', 'files'}, ...]
+    """
+    conn = _connect(path)
+    try:
+        return [dict(row) for row in conn.execute('SELECT path, scanned, files FROM roots ORDER BY path')]
+    finally:
+        conn.close()
@@ -0,0 +1,53 @@
+"""
+library_thread.py
+
+라이브러리 색인 스레드 (LibraryIndex.scan의 Qt 어댑터)
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class LibraryScanThread(QThread):
+    """라이브러리 색인 스레드 (여러 폴더를 순서대로)"""
+
+    # 시그널
+    progress = pyqtSignal(int, int)  # (확인한 파일 수, 새로 읽은 파일 수) - 현재 폴더 기준
+    finished = pyqtSignal(bool, str)  # (성공 여부, 메시지)
+
+    def __init__(self, index, roots):
+        """
+        Args:
+            index: library_index.LibraryIndex
+            roots: 색인할 폴더 목록
+        """
+        super().__init__()
+        self.index = index
+        self.roots = list(roots)
+        self.results = []  # 폴더별 scan() 결과
+        self._cancelled = False
+
+    def cancel(self):
+        """색인 중단 (이미 기록한 파일은 유지)"""
+        self._cancelled = True
+
+    def run(self):
+        """색인 실행"""
+        self.results = []
+        try:
+            for root in self.roots:
+                result = self.index.scan(root, on_progress=self.progress.emit,
+                                         is_cancelled=lambda: self._cancelled)
+                self.results.append(result)
+                if result['cancelled']:
+                    self.finished.emit(False, "Indexing cancelled")
+                    return
+        except Exception as e:
+            self.finished.emit(False, f"Indexing failed: {e}")
+            return
+
+        files = sum(r['files'] for r in self.results)
+        changed = sum(r['added'] + r['updated'] for r in self.results)
+        removed = sum(r['removed'] for r in self.results)
+        seconds = sum(r['seconds'] for r in self.results)
+        self.finished.emit(True, f"Indexed {files} files ({changed} new/changed, "
+                                 f"{removed} removed) in {seconds:.1f}s")
@@ -0,0 +1,303 @@
+"""
+log_store.py
+
+송수신 로그 영구 저장 (SQLite, WAL 모드, Qt 비의존)
+- append()는 큐에 추가만 하고 기록 스레드가 모아서 한 트랜잭션으로 커밋
+- 연결마다 세션을 만들고, 명령/응답에서 채널 번호를 추출해 함께 저장
+- 시간 범위, 채널, 방향, 세션, 포함 문자열로 조회 (GUI 로그 창을 지워도 기록은 유지)
+"""
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from ansi_parser import strip_ansi
+
+
+LOG_DB_ENV = 'AUDIO_MUX_LOG_DB'  # 저장 경로 ('off'면 저장하지 않음)
+DEFAULT_LOG_DB = os.path.join(os.path.expanduser('~'), '.audio_mux', 'logs.sqlite3')
+
+RX = 'rx'
+TX = 'tx'
+
+COMMIT_INTERVAL = 0.5  # 기록 스레드 커밋 주기 (초)
+BATCH_SIZE = 1000  # 이만큼 쌓이면 주기와 무관하게 커밋
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    port TEXT,
+    baudrate INTEGER
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session INTEGER,
+    direction TEXT NOT NULL,
+    channel INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS entries_channel_ts ON entries (channel, ts);
+CREATE INDEX IF NOT EXISTS entries_session ON entries (session, id);
+"""
+
+# 채널 번호 추출: 명령 "PLAY 0 ...", 응답 "CH0: IDLE", "OK Stopped ch0", "/audio/ch0/..."
+_COMMAND_CHANNEL = re.compile(r'^(?:PLAY|STOP|VOLUME|LOOP|UPLOAD|LS)\s+(\d)\b', re.IGNORECASE)
+_RESPONSE_CHANNEL = re.compile(r'\bch(\d)\b', re.IGNORECASE)
+
+
+def default_log_path():
+    """
+    로그 저장 경로 (AUDIO_MUX_LOG_DB 환경 변수 우선)
+
+    Returns:
+        str: 파일 경로 (저장하지 않도록 설정된 경우 None)
+    """
+    path = os.environ.get(LOG_DB_ENV)
+    if path is None:
+        return DEFAULT_LOG_DB
+    if path.strip().lower() in ('', 'off', '0', 'none'):
+        return None
+    return path
+
+
+def channel_of(direction, text):
+    """
+    로그 한 줄의 채널 번호
+
+    Args:
+        direction: RX / TX
+        text: 명령 또는 응답 (ANSI 코드 제거된 텍스트)
+
+    Returns:
+        int: 채널 번호 (채널과 무관한 줄은 None)
+    """
+    pattern = _COMMAND_CHANNEL if direction == TX else _RESPONSE_CHANNEL
+    match = pattern.search(text)
+    return int(match.group(1)) if match else None
+
+
+class LogStore:
+    """
+    송수신 로그 저장소
+
+    append()는 어느 스레드에서 호출해도 되며 블로킹하지 않는다.
+    조회는 별도 연결을 사용하므로 기록 중에도 가능 (WAL).
+    """
+
+    def __init__(self, path, commit_interval=COMMIT_INTERVAL, batch_size=BATCH_SIZE):
+        """
+        Args:
+            path: SQLite 파일 경로
+            commit_interval: 커밋 주기 (초)
+            batch_size: 한 번에 커밋할 최대 줄 수
+        """
+        self.path = path
+        self.commit_interval = commit_interval
+        self.batch_size = batch_size
+        self.session = None  # 현재 세션 id
+        self.written = 0  # 커밋된 줄 수
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')  # WAL에서는 커밋마다 fsync하지 않아도 손상 없음
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()  # _conn 사용 (기록 스레드 / start_session)
+
+        self._queue = queue.Queue()
+        self._pending = 0  # 큐에 넣었지만 아직 커밋되지 않은 줄 수
+        self._done = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='log-store', daemon=True)
+        self._thread.start()
+
+    def start_session(self, port='', baudrate=0):
+        """
+        새 세션 시작 (연결할 때 호출)
+
+        Returns:
+            int: 세션 id
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO sessions (started, port, baudrate) VALUES (?, ?, ?)',
+                (time.time(), port, baudrate))
+            self._conn.commit()
+        self.session = cursor.lastrowid
+        return self.session
+
+    def append(self, direction, text, channel=None, ts=None):
+        """
+        로그 한 줄 저장 요청 (블로킹 없음)
+
+        Args:
+            direction: RX / TX
+            text: 수신/송신 텍스트 (ANSI 코드 포함 가능, 원문 그대로 저장)
+            channel: 채널 번호 (None이면 텍스트에서 추출)
+            ts: 시각 (time.time(), 기본 현재)
+        """
+        if channel is None:
+            channel = channel_of(direction, strip_ansi(text))
+        with self._done:
+            self._pending += 1
+        self._queue.put((time.time() if ts is None else ts, self.session, direction, channel, text))
+
+    def flush(self, timeout=5.0):
+        """
+        대기 중인 줄을 모두 커밋할 때까지 대기
+
+        Returns:
+            bool: 시간 안에 완료되면 True
+        """
+        with self._done:
+            return self._done.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self):
+        """남은 줄을 커밋하고 종료"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        self._thread.join()
+        with self._lock:
+            self._conn.close()
+
+    def _run(self):
+        """기록 루프: 첫 줄을 기다린 뒤 commit_interval 동안 더 모아서 한 번에 커밋"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.commit_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        """한 트랜잭션으로 커밋"""
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    'INSERT INTO entries (ts, session, direction, channel, text) '
+                    'VALUES (?, ?, ?, ?, ?)', batch)
+                self._conn.commit()
+                self.written += len(batch)
+            except sqlite3.Error:
+                self._conn.rollback()  # 디스크 오류 등: 로그 저장 실패가 통신을 막지 않도록 버림
+        with self._done:
+            self._pending -= len(batch)
+            if self._pending == 0:
+                self._done.notify_all()
+
+    def query(self, **filters):
+        """
+        로그 조회 (대기 중인 줄을 먼저 커밋, 인자는 query() 함수와 같음)
+
+        Returns:
+            list: 항목 dict 목록
+        """
+        self.flush()
+        return query(self.path, **filters)
+
+    def sessions(self):
+        """세션 목록 (sessions() 함수와 같음)"""
+        self.flush()
+        return sessions(self.path)
+
+
+def _connect(path):
+    """조회용 연결 (읽기 전용)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Log database not found: {path}")
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA query_only=ON')
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def query(path, start=None, end=None, channel=None, direction=None, session=None,
+          contains=None, limit=None):
+    """
+    로그 조회 (시간 순서)
+
+    Args:
+        path: SQLite 파일 경로
+        start: 시작 시각 (time.time() 기준, 포함)
+        end: 끝 시각 (미포함)
+        channel: 채널 번호
+        direction: RX / TX
+        session: 세션 id
+        contains: 포함 문자열
+        limit: 최대 개수 (마지막 N개)
+
+    Returns:
+        list: [{'id', 'ts', 'session', 'direction', 'channel', 'text'}, ...]
+    """
+    conditions = []
+    params = []
+    for column, op, value in (('ts', '>=', start), ('ts', '<', end), ('channel', '=', channel),
+                              ('direction', '=', direction), ('session', '=', session)):
+        if value is not None:
+            conditions.append(f"{column} {op} ?")
+            params.append(value)
+    if contains:
+        conditions.append("instr(text, ?) > 0")
+        params.append(contains)
+
+    sql = 'SELECT id, ts, session, direction, channel, text FROM entries'
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    if limit:
+        # 마지막 N개를 시간 순서로
+        sql = f"SELECT * FROM ({sql} ORDER BY id DESC LIMIT ?) ORDER BY id"
+        params.append(limit)
+    else:
+        sql += ' ORDER BY id'
+
+    conn = _connect(path)
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def sessions(path):
+    """
+    세션 목록
+
+    Returns:
+        list: [{'id', 'started', 'port', 'baudrate', 'entries', 'first', 'last'}, ...]
+    """
+    conn = _connect(path)
+    try:
+        rows = conn.execute(
+            'SELECT s.id, s.started, s.port, s.baudrate, COUNT(e.id) AS entries, '
+            'MIN(e.ts) AS first, MAX(e.ts) AS last '
+            'FROM sessions s LEFT JOIN entries e ON e.session = s.id '
+            'GROUP BY s.id ORDER BY s.id')
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
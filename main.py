@@ -6,19 +6,29 @@ Audio Mux Control Panel - 메인 애플리케이션
 
 import sys
 import os
+import sqlite3
 import wave
 from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QFileDialog, QMessageBox,
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QFileDialog, QMessageBox, QAction,
                               QComboBox, QPushButton, QLabel, QTableWidgetItem, QHBoxLayout, QWidget)
-from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5 import uic
-
-from serial_comm import SerialComm, list_serial_ports
-from ymodem import YModemSender
-from audio_converter import AudioConverter, check_ffmpeg_installed
-from ansi_parser import ansi_to_html
+from PyQt5.QtCore import Qt, QTimer
+
+from serial_comm import SerialComm
+from port_monitor import PortMonitor
+from ansi_parser import ansi_to_html, strip_ansi
 from equalizer_widget import EqualizerWidget
+from waveform_widget import WaveformWidget
+from ui_loader import load_ui
+import instrumentation
+import log_store
+import session_capture
+
+# 시작 속도를 위해 QtMultimedia, 오디오 변환, Y-MODEM, 장면, 라이브러리 모듈은 처음 사용할 때 import
+
+UPLOAD_LOG_CHECKPOINT = 25  # 업로드 진행 로그 간격 (%)
+UPLOAD_NEXT_DELAY_MS = 500  # 일괄 업로드: UPLOAD 명령 후 / 파일 사이 대기 (보드가 준비, 저장할 시간)
+LOG_VIEW_MAX_LINES = 5000  # 로그 창에 유지할 최대 줄 수 (전체 기록은 log_store에 저장)
+PREVIEW_POSITION_INTERVAL_MS = 200  # 미리 듣기 위치 표시 갱신 주기
 
 
 class MainWindow(QMainWindow):
@@ -27,13 +37,14 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        # UI 로드
+        # UI 로드 (미리 컴파일된 모듈 캐시 사용)
         ui_path = os.path.join(os.path.dirname(__file__), 'mainwindow.ui')
-        uic.loadUi(ui_path, self)
+        load_ui(ui_path, self)
 
         # 시리얼 통신 객체
         self.serial = SerialComm()
         self.serial.received.connect(self.on_data_received)
+        self.serial.sent.connect(self.on_data_sent)
         self.serial.error.connect(self.on_serial_error)
         self.serial.connected.connect(self.on_connected)
         self.serial.disconnected.connect(self.on_disconnected)
@@ -41,19 +52,102 @@ class MainWindow(QMainWindow):
         # Y-MODEM 전송 객체
         self.ymodem_sender = None
 
-        # 오디오 미리 듣기 플레이어
-        self.media_player = QMediaPlayer()
+        # 일괄 업로드 (여러 파일 선택 시 사전 점검 후 파일마다 UPLOAD + Y-MODEM으로 전송)
+        self.upload_files = []  # 사전 점검을 통과한 파일 (비어 있으면 단일 파일 업로드)
+        self.upload_queue = []  # 아직 보내지 않은 파일
+        self.upload_results = []  # 보낸 파일의 (경로, 성공 여부, 메시지)
+        self.upload_total = 0  # 진행 중인 일괄 업로드의 파일 수 (0이면 일괄 업로드 중 아님)
+        self.upload_channel = 0
+        self.upload_pending = None  # UPLOAD 명령을 보내고 Y-MODEM 시작을 기다리는 파일 (경로 또는 목록)
+        self.board_batch_upload = False  # HELLO 응답에 BATCH가 있으면 UPLOAD <ch> * 한 번으로 전송
+        self.preflight_thread = None
+        self.autoconvert_thread = None
+        self.sd_free_bytes = None  # 마지막 STATUS 응답의 SD 여유 공간
+
+        # 장면 실행 스레드
+        self.scene_thread = None
+
+        # 오디오 라이브러리 창 (처음 열 때 생성)
+        self.library_dialog = None
+
+        # 전송 계측 (AUDIO_MUX_METRICS 환경 변수로 활성화, 전송마다 파일로 내보냄)
+        self.metrics_path = instrumentation.enable_from_env()
+        self._ymodem_checkpoint = 0  # 마지막으로 로그에 남긴 진행률
+
+        # 송수신 로그 저장 (AUDIO_MUX_LOG_DB 환경 변수로 경로 변경, 'off'면 저장 안 함)
+        self.log_store = None
+        self._log_store_error = None
+        log_path = log_store.default_log_path()
+        if log_path:
+            try:
+                self.log_store = log_store.LogStore(log_path)
+            except (OSError, sqlite3.Error) as e:
+                self._log_store_error = f"Log storage disabled: {e}"
+
+        # 세션 캡처 / 재생 (AUDIO_MUX_CAPTURE, AUDIO_MUX_REPLAY 환경 변수)
+        replay_path = os.environ.get(session_capture.REPLAY_ENV)
+        self.replay_port = session_capture.replay_url(replay_path) if replay_path else None
+
+        # 오디오 변환 스레드
+        self.converter_thread = None
+
+        # 오디오 미리 듣기 플레이어 (처음 재생할 때 생성)
+        self._preview = None
         self.is_playing = False
+        self.preview_timer = QTimer()  # 재생 위치 표시 갱신
+        self.preview_timer.setInterval(PREVIEW_POSITION_INTERVAL_MS)
+        self.preview_timer.timeout.connect(self.update_preview_position)
+
+        # FFmpeg 확인 스레드
+        self.ffmpeg_check_thread = None
+
+        # 포트 감시 스레드 (연결/분리 자동 반영)
+        self.port_monitor = PortMonitor()
+        self.port_monitor.ports_changed.connect(self.on_ports_changed)
 
         # 초기 설정
         self.init_ui()
-        self.refresh_ports()
+        self.port_monitor.start()  # 첫 조회 결과로 포트 목록 채움
 
-        # 이퀄라이저 위젯 설정 (UI 로드 후)
+        # 이퀄라이저 / 파형 위젯 설정 (UI 로드 후)
         self.setup_equalizer()
-
-        # FFmpeg 확인
-        if not check_ffmpeg_installed():
+        self.setup_waveform()
+
+        if self._log_store_error:
+            self.log_message(self._log_store_error, color='orange')
+
+        capture_path = os.environ.get(session_capture.CAPTURE_ENV)
+        if capture_path:
+            success, message = self.serial.start_capture(capture_path)
+            self.log_message(message, color='blue' if success else 'red')
+
+        # FFmpeg 확인 (창 표시 후 백그라운드에서)
+        QTimer.singleShot(0, self.check_ffmpeg)
+
+    @property
+    def preview(self):
+        """미리 듣기 플레이어 (처음 사용할 때 QtMultimedia 로드)"""
+        if self._preview is None:
+            from preview_player import PreviewPlayer
+
+            self._preview = PreviewPlayer(analysis_rate=EqualizerWidget.ANALYSIS_RATE)
+            self._preview.loaded.connect(self.on_preview_loaded)
+            self._preview.analysis_ready.connect(self.equalizer.load_file)
+            self._preview.finished.connect(self.on_preview_finished)
+            self._preview.error.connect(self.on_preview_error)
+        return self._preview
+
+    def check_ffmpeg(self):
+        """FFmpeg 설치 확인 시작"""
+        from converter_thread import FFmpegCheckThread
+
+        self.ffmpeg_check_thread = FFmpegCheckThread()
+        self.ffmpeg_check_thread.result.connect(self.on_ffmpeg_checked)
+        self.ffmpeg_check_thread.start()
+
+    def on_ffmpeg_checked(self, installed):
+        """FFmpeg 확인 결과"""
+        if not installed:
             self.log_message("WARNING: FFmpeg not found. Audio conversion may not work.", color='red')
             self.log_message("Download FFmpeg from https://ffmpeg.org/download.html", color='red')
 
@@ -64,15 +158,34 @@ class MainWindow(QMainWindow):
         self.pushButton_Connect.clicked.connect(self.toggle_connection)
         self.pushButton_Browse.clicked.connect(self.browse_file)
         self.pushButton_Preview.clicked.connect(self.toggle_preview)
+        self.pushButton_PreviewAB.toggled.connect(self.toggle_preview_variant)
+        self.horizontalSlider_PreviewSeek.valueChanged.connect(self.seek_preview)
         self.pushButton_Upload.clicked.connect(self.upload_file)
         self.pushButton_BrowseInput.clicked.connect(self.browse_input_file)
         self.pushButton_Convert.clicked.connect(self.convert_audio)
         self.pushButton_ClearLog.clicked.connect(self.clear_log)
 
+        # 로그 창은 최근 줄만 유지 (오래된 줄은 자동 삭제)
+        self.textEdit_Log.document().setMaximumBlockCount(LOG_VIEW_MAX_LINES)
+
         # 메뉴 액션 연결
         self.actionExit.triggered.connect(self.close)
         self.actionAbout.triggered.connect(self.show_about)
 
+        # 라이브러리 / 장면 메뉴 (파일 메뉴의 종료 앞)
+        self.actionLibrary = QAction("오디오 라이브러리...", self)
+        self.actionLibrary.triggered.connect(self.show_library)
+        self.menuFile.insertAction(self.actionExit, self.actionLibrary)
+        self.menuFile.insertSeparator(self.actionExit)
+        self.actionRunScene = QAction("장면 실행...", self)
+        self.actionRunScene.triggered.connect(self.run_scene)
+        self.actionStopScene = QAction("장면 정지", self)
+        self.actionStopScene.triggered.connect(self.stop_scene)
+        self.actionStopScene.setEnabled(False)
+        self.menuFile.insertAction(self.actionExit, self.actionRunScene)
+        self.menuFile.insertAction(self.actionExit, self.actionStopScene)
+        self.menuFile.insertSeparator(self.actionExit)
+
         # 초기 상태
         self.pushButton_Upload.setEnabled(False)
         self.progressBar_Upload.setValue(0)
@@ -150,42 +263,71 @@ class MainWindow(QMainWindow):
                 'status_label': status_label
             })
 
-    def setup_equalizer(self):
-        """이퀄라이저 위젯 설정"""
-        # 기존 widget_Equalizer를 EqualizerWidget으로 교체
-        layout = self.widget_Equalizer.parentWidget().layout()
+    def replace_placeholder(self, placeholder, widget):
+        """.ui의 자리 표시 위젯을 widget으로 교체 (QGridLayout의 같은 위치, 같은 높이)"""
+        layout = placeholder.parentWidget().layout()
+        widget.setMinimumHeight(placeholder.minimumHeight())
+        widget.setMaximumHeight(placeholder.maximumHeight())
 
         # 기존 위젯의 위치 찾기 (QGridLayout)
-        row, col, rowspan, colspan = -1, -1, 1, 1
         for i in range(layout.count()):
             item = layout.itemAt(i)
-            if item and item.widget() == self.widget_Equalizer:
-                # QGridLayout에서 위치 정보 가져오기
+            if item and item.widget() == placeholder:
                 row, col, rowspan, colspan = layout.getItemPosition(i)
-                # 기존 위젯 제거
-                layout.removeWidget(self.widget_Equalizer)
-                self.widget_Equalizer.deleteLater()
+                # 기존 위젯 제거 후 같은 위치에 추가
+                layout.removeWidget(placeholder)
+                placeholder.deleteLater()
+                layout.addWidget(widget, row, col, rowspan, colspan)
                 break
 
-        # 새 이퀄라이저 위젯 생성
+    def setup_equalizer(self):
+        """이퀄라이저 위젯 설정 (widget_Equalizer 교체)"""
         self.equalizer = EqualizerWidget()
-        self.equalizer.setMinimumHeight(100)
-        self.equalizer.setMaximumHeight(100)
+        self.replace_placeholder(self.widget_Equalizer, self.equalizer)
+
+        # 미리 듣기 재생 위치에 맞춰 스펙트럼 표시
+        self.equalizer.set_position_source(lambda: self.preview.position_ms())
+
+    def setup_waveform(self):
+        """파형 개요 위젯 설정 (widget_Waveform 교체, 이퀄라이저의 사전 계산 결과 사용)"""
+        self.waveform = WaveformWidget()
+        self.replace_placeholder(self.widget_Waveform, self.waveform)
 
-        # QGridLayout에 추가 (같은 위치에)
-        if row >= 0:
-            layout.addWidget(self.equalizer, row, col, rowspan, colspan)
+        self.equalizer.waveform_ready.connect(self.waveform.set_waveform)
+        self.waveform.seek_requested.connect(self.seek_waveform)
 
     def refresh_ports(self):
-        """포트 목록 새로고침"""
+        """포트 목록 새로고침 (백그라운드 조회, 결과는 on_ports_changed)"""
+        self.port_monitor.refresh()
+
+    def on_ports_changed(self, ports, requested):
+        """포트 목록 변경 (새로고침 요청 또는 연결/분리)"""
+        previous = [self.comboBox_Port.itemText(i) for i in range(self.comboBox_Port.count())]
+        current = self.comboBox_Port.currentText()
+        if self.replay_port:
+            ports = ports + [self.replay_port]
+
+        # 선택된 포트 유지
+        self.comboBox_Port.blockSignals(True)
         self.comboBox_Port.clear()
-        ports = list_serial_ports()
+        self.comboBox_Port.addItems(ports)
+        if current in ports:
+            self.comboBox_Port.setCurrentText(current)
+        self.comboBox_Port.blockSignals(False)
+
+        if requested:
+            if ports:
+                self.log_message(f"Found {len(ports)} port(s): {', '.join(ports)}")
+            else:
+                self.log_message("No serial ports found", color='orange')
+            return
 
-        if ports:
-            self.comboBox_Port.addItems(ports)
-            self.log_message(f"Found {len(ports)} port(s): {', '.join(ports)}")
-        else:
-            self.log_message("No serial ports found", color='orange')
+        for port in ports:
+            if port not in previous:
+                self.log_message(f"Port added: {port}", color='blue')
+        for port in previous:
+            if port not in ports:
+                self.log_message(f"Port removed: {port}", color='orange')
 
     def toggle_connection(self):
         """연결/해제 토글"""
@@ -223,6 +365,9 @@ class MainWindow(QMainWindow):
         # 채널 제어 활성화
         self.tableWidget_Channels.setEnabled(True)
 
+        if self.log_store:
+            self.log_store.start_session(self.serial.port, self.serial.baudrate)
+
         # HELLO 명령 전송
         self.serial.send_command("HELLO")
 
@@ -232,6 +377,8 @@ class MainWindow(QMainWindow):
         self.label_Status.setStyleSheet("color: red;")
         self.pushButton_Connect.setText("연결")
         self.pushButton_Upload.setEnabled(False)
+        self.sd_free_bytes = None
+        self.board_batch_upload = False
 
         # 연결 해제 시 포트 및 보드레이트 변경 가능
         self.comboBox_Port.setEnabled(True)
@@ -245,6 +392,27 @@ class MainWindow(QMainWindow):
         """데이터 수신"""
         # ANSI 이스케이프 시퀀스를 포함한 데이터를 그대로 전달
         self.log_message(f"<< {data}", use_ansi=True)
+        if self.log_store:
+            self.log_store.append(log_store.RX, data)
+
+        # STATUS 응답의 SD 여유 공간 (일괄 업로드 공간 확인용)
+        if 'SD:' in data:
+            from preflight import parse_sd_free
+
+            free = parse_sd_free(strip_ansi(data))
+            if free is not None:
+                self.sd_free_bytes = free
+
+        # HELLO 응답의 배치 업로드 지원 표시
+        if 'AUDIO_MUX' in data:
+            from ymodem_core import supports_batch
+
+            self.board_batch_upload = supports_batch([strip_ansi(data)])
+
+    def on_data_sent(self, command):
+        """명령 전송됨 (로그 저장)"""
+        if self.log_store:
+            self.log_store.append(log_store.TX, command)
 
     def on_serial_error(self, error):
         """시리얼 에러"""
@@ -291,6 +459,73 @@ class MainWindow(QMainWindow):
         status_label.setText("재생 중")
         status_label.setStyleSheet("color: green; font-weight: bold;")
 
+    def set_channel_status(self, channel, playing):
+        """채널 상태 라벨 갱신"""
+        status_label = self.channel_widgets[channel]['status_label']
+        if playing:
+            status_label.setText("재생 중")
+            status_label.setStyleSheet("color: green; font-weight: bold;")
+        else:
+            status_label.setText("정지")
+            status_label.setStyleSheet("color: gray;")
+
+    def run_scene(self):
+        """장면 파일을 읽어 여러 채널 명령을 일정대로 실행"""
+        if not self.serial.is_connected():
+            QMessageBox.warning(self, "오류", "장치에 연결되지 않았습니다")
+            return
+        if self.scene_thread and self.scene_thread.isRunning():
+            QMessageBox.warning(self, "오류", "장면이 이미 실행 중입니다")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "장면 파일 선택", "", "Scene Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+
+        from scene_engine import load_scene, compile_scene, scene_duration
+        from scene_thread import SceneThread
+
+        try:
+            scene = load_scene(file_path)
+            schedule = compile_scene(scene)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "장면 오류", str(e))
+            return
+
+        commands = sum(len(c) for _, c in schedule)
+        self.log_message(f"Scene '{scene['name']}': {commands} commands, "
+                         f"{scene_duration(schedule):.1f}s", color='purple')
+
+        self.scene_thread = SceneThread(self.serial, schedule)
+        self.scene_thread.dispatched.connect(self.on_scene_dispatched)
+        self.scene_thread.finished.connect(self.on_scene_finished)
+        self.actionRunScene.setEnabled(False)
+        self.actionStopScene.setEnabled(True)
+        self.scene_thread.start()
+
+    def stop_scene(self):
+        """장면 실행 취소"""
+        if self.scene_thread and self.scene_thread.isRunning():
+            self.scene_thread.cancel()
+
+    def on_scene_dispatched(self, t, commands, error):
+        """장면 명령 전송됨"""
+        self.log_message(f">> [{t:.3f}s {error * 1000:+.2f}ms] {'; '.join(commands)}", color='blue')
+        for command in commands:
+            parts = command.split()
+            if parts[0] in ('PLAY', 'STOP'):
+                self.set_channel_status(int(parts[1]), parts[0] == 'PLAY')
+            elif parts[0] == 'STOPALL':
+                for ch in range(len(self.channel_widgets)):
+                    self.set_channel_status(ch, False)
+
+    def on_scene_finished(self, success, message):
+        """장면 실행 완료"""
+        self.actionRunScene.setEnabled(True)
+        self.actionStopScene.setEnabled(False)
+        self.log_message(message, color='green' if success else 'red')
+
     def stop_channel(self, channel):
         """채널 중지"""
         if not self.serial.is_connected():
@@ -307,22 +542,29 @@ class MainWindow(QMainWindow):
         status_label.setStyleSheet("color: gray;")
 
     def browse_file(self):
-        """파일 선택 - WAV 파일만 허용"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        """파일 선택 - WAV 파일만 허용 (여러 개 선택 시 사전 점검 후 일괄 업로드)"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "WAV 파일 선택",
+            "WAV 파일 선택 (여러 개 선택 가능)",
             "",
-            "WAV Files (*.wav);;All Files (*.*)"
+            "WAV Files (*.wav);;Audio Files (*.wav *.mp3 *.flac *.ogg *.m4a);;All Files (*.*)"
         )
 
-        if file_path:
-            # WAV 파일 스펙 검증
-            if self.validate_wav_file(file_path):
-                self.lineEdit_FilePath.setText(file_path)
-                self.log_message(f"파일 선택: {os.path.basename(file_path)} - 스펙 확인 완료", color='green')
-            else:
-                # 검증 실패 시 파일 경로는 설정하지 않음
-                self.lineEdit_FilePath.clear()
+        if len(file_paths) == 1:
+            self.set_upload_file(file_paths[0])
+        elif file_paths:
+            self.start_preflight(file_paths)
+
+    def set_upload_file(self, file_path):
+        """업로드 파일 설정 (스펙 검증 실패 시 비움)"""
+        self.upload_files = []
+        # WAV 파일 스펙 검증
+        if self.validate_wav_file(file_path):
+            self.lineEdit_FilePath.setText(file_path)
+            self.log_message(f"파일 선택: {os.path.basename(file_path)} - 스펙 확인 완료", color='green')
+        else:
+            # 검증 실패 시 파일 경로는 설정하지 않음
+            self.lineEdit_FilePath.clear()
 
     def validate_wav_file(self, file_path):
         """
@@ -332,29 +574,13 @@ class MainWindow(QMainWindow):
         Returns:
             bool: 스펙 일치 여부
         """
-        try:
-            with wave.open(file_path, 'rb') as wav_file:
-                channels = wav_file.getnchannels()
-                sample_width = wav_file.getsampwidth()
-                framerate = wav_file.getframerate()
+        from audio_converter import check_wav_spec
 
+        try:
             # 스펙 확인
-            is_valid = True
-            errors = []
-
-            if framerate != 32000:
-                errors.append(f"샘플레이트: {framerate}Hz (필요: 32000Hz)")
-                is_valid = False
+            errors = check_wav_spec(file_path)
 
-            if sample_width != 2:  # 2 bytes = 16-bit
-                errors.append(f"비트 깊이: {sample_width*8}bit (필요: 16bit)")
-                is_valid = False
-
-            if channels != 1:
-                errors.append(f"채널: {channels}ch (필요: 1ch Mono)")
-                is_valid = False
-
-            if not is_valid:
+            if errors:
                 # 경고음 출력
                 QApplication.beep()
 
@@ -404,61 +630,222 @@ class MainWindow(QMainWindow):
             self.start_preview()
 
     def start_preview(self):
-        """오디오 미리 듣기 시작 (오디오 변환기 입력 파일)"""
+        """오디오 미리 듣기 시작 (입력 파일, 변환 결과가 있으면 A/B 비교 가능)"""
         file_path = self.lineEdit_InputFile.text()
 
         if not file_path or not os.path.exists(file_path):
             QMessageBox.warning(self, "오류", "먼저 오디오 변환기에서 입력 파일을 선택해주세요")
             return
 
-        # 미디어 설정
-        url = QUrl.fromLocalFile(file_path)
-        content = QMediaContent(url)
-        self.media_player.setMedia(content)
-
-        # 재생 시작
-        self.media_player.play()
+        # 디코딩된 PCM은 캐시되므로 같은 파일을 다시 재생하면 바로 시작
+        output_path = self.lineEdit_OutputFile.text()
+        self.preview.open(file_path, output_path if output_path and os.path.exists(output_path) else None)
+        self.preview.play()
         self.is_playing = True
         self.pushButton_Preview.setText("중지")
+        self.sync_preview_variant()
 
-        # 이퀄라이저 시작
+        # 이퀄라이저 시작 (재생 버퍼에서 만든 샘플로 실제 스펙트럼 표시)
         self.equalizer.start()
-
-        # 재생 완료 시그널 연결 (한 번만)
-        try:
-            self.media_player.stateChanged.disconnect()
-        except:
-            pass
-        self.media_player.stateChanged.connect(self.on_media_state_changed)
+        self.preview_timer.start()
 
         self.log_message(f"재생 시작: {os.path.basename(file_path)}", color='blue')
 
     def stop_preview(self):
         """오디오 미리 듣기 중지"""
-        self.media_player.stop()
+        self.preview.stop()
+        self.finish_preview()
+        self.log_message("재생 중지", color='blue')
+
+    def finish_preview(self):
+        """미리 듣기 종료 후 UI 정리"""
         self.is_playing = False
         self.pushButton_Preview.setText("미리 듣기")
+        self.preview_timer.stop()
+        self.update_preview_position()
 
         # 이퀄라이저 중지
         self.equalizer.stop()
 
-        self.log_message("재생 중지", color='blue')
+    def on_preview_finished(self):
+        """끝까지 재생"""
+        self.finish_preview()
+        self.log_message("재생 완료", color='blue')
 
-    def on_media_state_changed(self, state):
-        """미디어 재생 상태 변경"""
-        # QMediaPlayer.StoppedState = 0
-        if state == QMediaPlayer.StoppedState and self.is_playing:
-            # 재생 완료 (자연스럽게 끝남)
-            self.is_playing = False
-            self.pushButton_Preview.setText("미리 듣기")
+    def on_preview_error(self, message):
+        """미리 듣기 출력 오류"""
+        if self.is_playing:
+            self.finish_preview()
+        self.log_message(f"미리 듣기 오류: {message}", color='red')
+
+    def on_preview_loaded(self, variant, success):
+        """미리 듣기 파일 준비 완료 (A/B 버튼, 위치 표시 갱신)"""
+        if not success:
+            self.log_message(f"미리 듣기 파일 디코딩 실패 ({variant})", color='red')
+            if variant == self.preview.variant and self.is_playing:
+                self.finish_preview()
+        self.sync_preview_variant()
+        self.update_preview_position()
+
+    def sync_preview_variant(self):
+        """A/B 버튼 상태를 플레이어에 맞춤 (변환 결과가 준비되어야 활성화)"""
+        from preview_player import CONVERTED
+
+        converted = self.preview.variant == CONVERTED
+        self.pushButton_PreviewAB.blockSignals(True)
+        self.pushButton_PreviewAB.setChecked(converted)
+        self.pushButton_PreviewAB.blockSignals(False)
+        self.pushButton_PreviewAB.setText("변환" if converted else "원본")
+        self.pushButton_PreviewAB.setEnabled(self.preview.has_variant(CONVERTED))
+
+    def toggle_preview_variant(self, checked):
+        """A/B 전환 (원본 ↔ 변환 결과, 같은 위치에서 계속)"""
+        from preview_player import CONVERTED, SOURCE
+
+        self.preview.set_variant(CONVERTED if checked else SOURCE)
+        self.sync_preview_variant()
+        self.update_preview_position()
+
+    def seek_preview(self, position_ms):
+        """위치 이동 (슬라이더)"""
+        self.preview.seek(position_ms)
+
+    def seek_waveform(self, position_ms):
+        """위치 이동 (파형 클릭, 슬라이더도 함께 갱신)"""
+        self.preview.seek(position_ms)
+        self.update_preview_position()
+
+    def update_preview_position(self):
+        """재생 위치 표시 (슬라이더는 시그널 없이 갱신)"""
+        if self._preview is None:
+            return
+        duration = self.preview.duration_ms()
+        position = min(self.preview.position_ms(), duration)
+
+        slider = self.horizontalSlider_PreviewSeek
+        slider.blockSignals(True)
+        slider.setRange(0, duration)
+        if not slider.isSliderDown():
+            slider.setValue(position)
+        slider.blockSignals(False)
+        slider.setEnabled(duration > 0)
+        self.waveform.set_position(position, duration)
+
+        self.label_PreviewPosition.setText(
+            f"{position // 60000:02d}:{position // 1000 % 60:02d} / "
+            f"{duration // 60000:02d}:{duration // 1000 % 60:02d}")
+
+    def start_preflight(self, file_paths):
+        """
+        일괄 업로드 사전 점검 시작 (백그라운드, 파일마다 대화상자를 띄우지 않고 보고서 하나로)
 
-            # 이퀄라이저 중지
-            self.equalizer.stop()
+        Args:
+            file_paths: 선택한 파일 목록
+        """
+        from preflight_thread import PreflightThread
+
+        if self.preflight_thread and self.preflight_thread.isRunning():
+            return
+        if self.autoconvert_thread and self.autoconvert_thread.isRunning():
+            self.autoconvert_thread.cancel()
+            self.autoconvert_thread.wait()
+
+        # SD 여유 공간 갱신 (응답은 업로드 시작 전에 다시 확인)
+        if self.serial.is_connected():
+            self.serial.send_command("STATUS")
+
+        self.upload_files = []
+        self.lineEdit_FilePath.setText(f"사전 점검 중... ({len(file_paths)}개)")
+        self.log_message(f"사전 점검 시작: {len(file_paths)}개 파일", color='blue')
+
+        self.preflight_thread = PreflightThread(file_paths, self.sd_free_bytes)
+        self.preflight_thread.result.connect(self.on_preflight_result)
+        self.preflight_thread.start()
+
+    def on_preflight_result(self, report):
+        """사전 점검 결과 (로그에 전체 보고서, 문제가 있을 때만 대화상자 1개)"""
+        from preflight import CONVERT, summary_text, report_lines
+
+        self.upload_files = list(report['passed'])
+        self.update_upload_files_text()
 
-            self.log_message("재생 완료", color='blue')
+        color = 'green' if report['ok'] else 'orange'
+        self.log_message(summary_text(report) + f" ({report['seconds']:.2f}s)", color=color)
+        for text, status in report_lines(report):
+            self.log_message(f"  - {text}", color='orange' if status == CONVERT else 'red')
+
+        if report['ok']:
+            return
+
+        QApplication.beep()
+        message = summary_text(report)
+        if report['failed']:
+            message += "\n\n실패한 파일은 업로드 목록에서 제외됩니다 (로그 참고)."
+        if report['fits'] is False:
+            message += "\n\nSD 카드 여유 공간이 부족합니다."
+
+        if report['convert']:
+            answer = QMessageBox.question(
+                self,
+                "사전 점검",
+                message + f"\n\n변환이 필요한 {len(report['convert'])}개 파일을 자동 변환해 "
+                          f"업로드 목록에 추가할까요?\n(원본 옆에 *_32k16m.wav로 저장)",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if answer == QMessageBox.Yes:
+                self.start_auto_convert(report['convert'])
+        else:
+            QMessageBox.warning(self, "사전 점검", message)
+
+    def start_auto_convert(self, file_paths):
+        """변환 필요 파일 자동 변환 (완료된 파일은 다시 점검 후 업로드 목록에 추가)"""
+        from preflight_thread import AutoConvertThread
+
+        self.autoconvert_thread = AutoConvertThread(
+            file_paths,
+            normalize=self.checkBox_Normalize.isChecked(),
+            trim_silence=self.checkBox_TrimSilence.isChecked()
+        )
+        self.autoconvert_thread.converted.connect(self.on_auto_converted)
+        self.autoconvert_thread.failed.connect(
+            lambda path, message: self.log_message(
+                f"자동 변환 실패: {os.path.basename(path)} - {message}", color='red'))
+        self.autoconvert_thread.finished.connect(self.on_auto_convert_finished)
+        self.log_message(f"자동 변환 시작: {len(file_paths)}개 파일", color='blue')
+        self.autoconvert_thread.start()
+
+    def on_auto_converted(self, input_path, result):
+        """파일 하나 자동 변환 완료"""
+        from preflight import PASS
+
+        if result['status'] == PASS:
+            self.upload_files.append(result['file'])
+            self.update_upload_files_text()
+            self.log_message(f"자동 변환: {os.path.basename(input_path)} -> "
+                             f"{os.path.basename(result['file'])}", color='green')
+        else:
+            issues = result['errors'] + result['spec_errors']
+            self.log_message(f"자동 변환 결과 점검 실패: {os.path.basename(result['file'])} - "
+                             f"{'; '.join(issues)}", color='red')
+
+    def on_auto_convert_finished(self, success, message):
+        """자동 변환 전체 완료"""
+        self.log_message(message, color='green' if success else 'orange')
+        self.update_upload_files_text()
+
+    def update_upload_files_text(self):
+        """일괄 업로드 목록 표시"""
+        if self.upload_files:
+            self.lineEdit_FilePath.setText(f"{len(self.upload_files)}개 파일 (일괄 업로드)")
+        else:
+            self.lineEdit_FilePath.clear()
 
     def upload_file(self):
         """파일 업로드 (Y-MODEM) - 검증된 WAV 파일만 업로드"""
+        if self.upload_files:
+            self.upload_batch()
+            return
+
         file_path = self.lineEdit_FilePath.text()
 
         if not file_path or not os.path.exists(file_path):
@@ -486,8 +873,107 @@ class MainWindow(QMainWindow):
         # Y-MODEM 전송 시작
         self.start_ymodem_transfer(file_path)
 
+    def upload_batch(self):
+        """
+        사전 점검을 통과한 파일 업로드
+
+        파일마다 UPLOAD <ch> <이름> + Y-MODEM으로 전송하고 (upload_next), HELLO 응답에 BATCH가
+        있는 보드에만 Y-MODEM 세션 하나로 전송 (UPLOAD <ch> *)
+        """
+        from preflight import card_bytes, SD_RESERVE_BYTES
+
+        if not self.serial.is_connected():
+            QMessageBox.warning(self, "오류", "장치에 연결되지 않았습니다")
+            return
+        if self.autoconvert_thread and self.autoconvert_thread.isRunning():
+            QMessageBox.warning(self, "오류", "자동 변환이 끝난 후 업로드해주세요")
+            return
+
+        # 점검 후 파일이 바뀌었거나 사라졌으면 다시 점검
+        missing = [p for p in self.upload_files if not os.path.exists(p)]
+        if missing:
+            self.log_message(f"파일 없음: {', '.join(os.path.basename(p) for p in missing)}", color='red')
+            self.start_preflight([p for p in self.upload_files if p not in missing])
+            return
+
+        # 최신 SD 여유 공간으로 다시 확인
+        needed = sum(card_bytes(os.path.getsize(p)) for p in self.upload_files)
+        if self.sd_free_bytes is not None and needed > self.sd_free_bytes - SD_RESERVE_BYTES:
+            QApplication.beep()
+            QMessageBox.warning(
+                self, "SD 공간 부족",
+                f"업로드 크기 {needed / (1024 * 1024):.1f}MB, "
+                f"SD 여유 공간 {self.sd_free_bytes // (1024 * 1024)}MB"
+            )
+            return
+
+        channel = self.comboBox_Channel.currentIndex()
+        if not self.board_batch_upload:
+            self.log_message(f"일괄 업로드: {len(self.upload_files)}개 파일, "
+                             f"{needed / (1024 * 1024):.1f}MB", color='blue')
+            self.upload_channel = channel
+            self.upload_queue = list(self.upload_files)
+            self.upload_results = []
+            self.upload_total = len(self.upload_queue)
+            self.upload_next()
+            return
+
+        self.log_message(f">> UPLOAD {channel} * ({len(self.upload_files)} files, "
+                         f"{needed / (1024 * 1024):.1f}MB)", color='blue')
+        self.serial.send_command(f"UPLOAD {channel} *")
+        self.schedule_ymodem_transfer(list(self.upload_files))
+
+    def upload_next(self):
+        """일괄 업로드: 다음 파일 전송 (UPLOAD <ch> <이름> 후 Y-MODEM)"""
+        if not self.upload_queue:
+            return
+
+        file_path = self.upload_queue.pop(0)
+        file_name = os.path.basename(file_path)
+        index = len(self.upload_results) + 1
+        self.log_message(f">> UPLOAD {self.upload_channel} {file_name} ({index}/{self.upload_total})",
+                         color='blue')
+        self.serial.send_command(f"UPLOAD {self.upload_channel} {file_name}")
+        self.schedule_ymodem_transfer(file_path)
+
+    def schedule_ymodem_transfer(self, file_path):
+        """UPLOAD 명령 후 보드가 Y-MODEM을 준비할 시간을 두고 전송 시작 (GUI를 멈추지 않음)"""
+        self.upload_pending = file_path
+        self.pushButton_Upload.setEnabled(False)
+        QTimer.singleShot(UPLOAD_NEXT_DELAY_MS, self.start_pending_transfer)
+
+    def start_pending_transfer(self):
+        """예약된 Y-MODEM 전송 시작 (그 사이 창을 닫았으면 시작하지 않음)"""
+        file_path, self.upload_pending = self.upload_pending, None
+        if file_path is not None:
+            self.start_ymodem_transfer(file_path)
+
+    def finish_upload_queue(self):
+        """
+        일괄 업로드 종료 (실패한 파일이 있으면 나머지는 보내지 않음)
+
+        Returns:
+            tuple: (전체 성공 여부, 요약 메시지)
+        """
+        total = self.upload_total
+        uploaded = sum(1 for _, ok, _ in self.upload_results if ok)
+        failed = [(path, error) for path, ok, error in self.upload_results if not ok]
+        skipped = len(self.upload_queue)
+        self.upload_queue = []
+        self.upload_total = 0
+
+        message = f"{uploaded}/{total} files uploaded"
+        if failed:
+            path, error = failed[0]
+            message += f"\n{os.path.basename(path)}: {error}"
+        if skipped:
+            message += f"\n나머지 {skipped}개 파일은 보내지 않았습니다"
+        return uploaded == total, message
+
     def start_ymodem_transfer(self, file_path):
-        """Y-MODEM 전송 시작"""
+        """Y-MODEM 전송 시작 (file_path: 경로 또는 경로 목록 - 배치)"""
+        from ymodem import YModemSender
+
         # 이전 전송이 있으면 취소
         if self.ymodem_sender and self.ymodem_sender.isRunning():
             self.ymodem_sender.cancel()
@@ -497,7 +983,9 @@ class MainWindow(QMainWindow):
         self.ymodem_sender = YModemSender(self.serial, file_path)
         self.ymodem_sender.progress.connect(self.on_ymodem_progress)
         self.ymodem_sender.status.connect(self.on_ymodem_status)
+        self.ymodem_sender.metrics.connect(self.on_ymodem_metrics)
         self.ymodem_sender.finished.connect(self.on_ymodem_finished)
+        self._ymodem_checkpoint = 0
 
         # UI 비활성화
         self.pushButton_Upload.setEnabled(False)
@@ -514,15 +1002,62 @@ class MainWindow(QMainWindow):
         """Y-MODEM 상태"""
         self.log_message(f"Y-MODEM: {status}", color='purple')
 
+    def on_ymodem_metrics(self, metrics):
+        """Y-MODEM 진행 지표 (UPLOAD_LOG_CHECKPOINT% 마다 로그에 기록)"""
+        checkpoint = metrics['percent'] // UPLOAD_LOG_CHECKPOINT * UPLOAD_LOG_CHECKPOINT
+        if checkpoint <= self._ymodem_checkpoint or checkpoint >= 100:
+            return
+        self._ymodem_checkpoint = checkpoint
+
+        eta = metrics['eta_seconds']
+        self.log_message(f"Y-MODEM: {checkpoint}% "
+                         f"({metrics['bytes'] // 1024}/{metrics['total_bytes'] // 1024} KB, "
+                         f"{metrics['bytes_per_sec'] / 1024:.1f} KB/s, "
+                         f"ETA {f'{eta:.0f}s' if eta is not None else 'n/a'}, "
+                         f"{metrics['retries']} retries)",
+                         color='purple')
+
     def on_ymodem_finished(self, success, message):
-        """Y-MODEM 완료"""
+        """Y-MODEM 완료 (전송 요약 한 줄)"""
+        transfer = self.ymodem_sender.stats.as_dict()
+        srtt = f"{transfer['srtt_ms']:.1f} ms" if transfer['srtt_ms'] is not None else "n/a"
+        summary = (f"{transfer['bytes'] // 1024} KB in {transfer['seconds']:.1f}s "
+                   f"({transfer['bytes_per_sec'] / 1024:.1f} KB/s), "
+                   f"{transfer['packets']} packets, {transfer['retries']} retries, "
+                   f"{transfer['timeouts']} timeouts, RTT {srtt}")
+
+        if self.metrics_path:
+            try:
+                instrumentation.export(self.metrics_path)
+            except OSError as e:
+                self.log_message(f"Metrics export error: {e}", color='orange')
+
+        if success:
+            self.log_message(f"Y-MODEM: {message} - {summary}", color='green')
+        else:
+            self.log_message(f"Y-MODEM Error: {message} - {summary}", color='red')
+
+        # 일괄 업로드 중이면 다음 파일 (대화상자는 마지막에 한 번)
+        if self.upload_total:
+            self.upload_results.append((self.ymodem_sender.file_path, success, message))
+            if success and self.upload_queue:
+                QTimer.singleShot(UPLOAD_NEXT_DELAY_MS, self.upload_next)
+                return
+            success, message = self.finish_upload_queue()
+
         if success:
-            self.log_message(f"Y-MODEM: {message}", color='green')
             QMessageBox.information(self, "Success", message)
         else:
-            self.log_message(f"Y-MODEM Error: {message}", color='red')
             QMessageBox.critical(self, "Transfer Failed", message)
 
+        # 송신 큐 통계
+        stats = self.serial.writer_stats()
+        if stats:
+            self.log_message(f"TX queue: max depth {stats['max_depth']}, "
+                             f"{stats['requests_written']} requests in {stats['write_calls']} writes, "
+                             f"drain waits {stats['drain_waits']} ({stats['drain_wait_seconds']:.2f}s)",
+                             color='purple')
+
         # UI 복원
         self.pushButton_Upload.setEnabled(True)
         self.progressBar_Upload.setValue(0)
@@ -537,19 +1072,46 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            self.lineEdit_InputFile.setText(file_path)
+            self.set_input_file(file_path)
 
-            # 파일 선택 시 재생 중이면 중지
-            if self.is_playing:
-                self.stop_preview()
+    def set_input_file(self, file_path):
+        """변환 입력 파일 설정 (출력 파일명 자동 생성)"""
+        self.lineEdit_InputFile.setText(file_path)
 
-            # 출력 파일명 자동 생성
-            base_name = os.path.splitext(file_path)[0]
-            output_path = base_name + "_32k16m.wav"
-            self.lineEdit_OutputFile.setText(output_path)
+        # 파일 선택 시 재생 중이면 중지
+        if self.is_playing:
+            self.stop_preview()
+
+        # 출력 파일명 자동 생성
+        base_name = os.path.splitext(file_path)[0]
+        output_path = base_name + "_32k16m.wav"
+        self.lineEdit_OutputFile.setText(output_path)
+
+    def show_library(self):
+        """오디오 라이브러리 창 (색인된 파일에서 변환/업로드 파일 선택)"""
+        if self.library_dialog is None:
+            from library_dialog import LibraryDialog
+            import library_index
+
+            try:
+                self.library_dialog = LibraryDialog(library_index.default_library_path(), self)
+            except (OSError, sqlite3.Error) as e:
+                self.log_message(f"라이브러리 색인을 열 수 없습니다: {e}", color='red')
+                return
+            self.library_dialog.convert_requested.connect(self.set_input_file)
+            self.library_dialog.upload_requested.connect(self.set_upload_file)
+            self.library_dialog.message.connect(self.log_message)
+
+        self.library_dialog.show()
+        self.library_dialog.raise_()
+        self.library_dialog.activateWindow()
 
     def convert_audio(self):
-        """오디오 변환"""
+        """오디오 변환 (변환 중에 누르면 취소)"""
+        if self.converter_thread and self.converter_thread.isRunning():
+            self.converter_thread.cancel()
+            return
+
         input_path = self.lineEdit_InputFile.text()
         output_path = self.lineEdit_OutputFile.text()
 
@@ -563,14 +1125,46 @@ class MainWindow(QMainWindow):
 
         self.log_message(f"변환 중: {input_path} -> {output_path}", color='blue')
 
-        # 변환
-        success, message = AudioConverter.convert(input_path, output_path)
+        # 변환 스레드 시작
+        from converter_thread import ConverterThread
+
+        self.converter_thread = ConverterThread(
+            input_path, output_path,
+            normalize=self.checkBox_Normalize.isChecked(),
+            trim_silence=self.checkBox_TrimSilence.isChecked()
+        )
+        self.converter_thread.progress.connect(self.on_convert_progress)
+        self.converter_thread.finished.connect(self.on_convert_finished)
+
+        self.pushButton_Convert.setText("변환 취소")
+        self.converter_thread.start()
+
+    def on_convert_progress(self, percent):
+        """변환 진행률"""
+        self.statusbar.showMessage(f"변환 중... {percent}%")
+
+    def on_convert_finished(self, success, message):
+        """변환 완료"""
+        self.pushButton_Convert.setText("WAV로 변환")
+        self.statusbar.clearMessage()
 
         if success:
             self.log_message(message, color='green')
-            QMessageBox.information(self, "완료", f"변환이 완료되었습니다!\n\n{message}")
+            # 재생 중이면 변환 결과를 바로 준비 (A/B 비교)
+            if self.is_playing:
+                self.preview.open(self.lineEdit_InputFile.text(), self.lineEdit_OutputFile.text())
         else:
             self.log_message(f"변환 실패: {message}", color='red')
+
+        # 캐시 적중/미스 통계
+        from audio_converter import AudioConverter
+
+        if AudioConverter.cache_enabled:
+            self.log_message(AudioConverter.get_cache().stats_text(), color='purple')
+
+        if success:
+            QMessageBox.information(self, "완료", f"변환이 완료되었습니다!\n\n{message}")
+        else:
             QMessageBox.critical(self, "변환 실패", message)
 
     def log_message(self, message, color='black', use_ansi=False):
@@ -610,7 +1204,7 @@ class MainWindow(QMainWindow):
         self.textEdit_Log.append(html)
 
     def clear_log(self):
-        """로그 클리어"""
+        """로그 클리어 (화면만 지움, 저장된 기록은 유지)"""
         self.textEdit_Log.clear()
 
     def show_about(self):
@@ -629,19 +1223,54 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """종료 이벤트"""
+        # 포트 감시 중지
+        self.port_monitor.stop()
+        self.port_monitor.wait()
+
+        # 장면 실행 취소 (재생한 채널 정지 명령을 보낸 뒤 연결 해제)
+        if self.scene_thread and self.scene_thread.isRunning():
+            self.scene_thread.cancel()
+            self.scene_thread.wait()
+
         # 시리얼 연결 해제
         if self.serial.is_connected():
             self.serial.disconnect()
             self.serial.wait()
+        self.serial.stop_capture()
+        if self.log_store:
+            self.log_store.close()
 
-        # Y-MODEM 전송 취소
+        # Y-MODEM 전송 취소 (일괄 업로드의 남은 파일 포함)
+        self.upload_queue = []
+        self.upload_pending = None
         if self.ymodem_sender and self.ymodem_sender.isRunning():
             self.ymodem_sender.cancel()
             self.ymodem_sender.wait()
 
-        # 미디어 재생 중지
-        if self.is_playing:
-            self.media_player.stop()
+        # 변환 취소
+        if self.converter_thread and self.converter_thread.isRunning():
+            self.converter_thread.cancel()
+            self.converter_thread.wait()
+
+        # FFmpeg 확인 스레드 종료 대기
+        if self.ffmpeg_check_thread and self.ffmpeg_check_thread.isRunning():
+            self.ffmpeg_check_thread.wait()
+
+        # 사전 점검 / 자동 변환 중단
+        if self.autoconvert_thread and self.autoconvert_thread.isRunning():
+            self.autoconvert_thread.cancel()
+            self.autoconvert_thread.wait()
+        if self.preflight_thread and self.preflight_thread.isRunning():
+            self.preflight_thread.wait()
+
+        # 라이브러리 색인 중단
+        if self.library_dialog is not None:
+            self.library_dialog.shutdown()
+
+        # 미리 듣기 중지 (디코딩 스레드 종료 대기)
+        if self._preview is not None:
+            self.preview_timer.stop()
+            self.preview.close()
             self.equalizer.stop()
 
         event.accept()
@@ -0,0 +1,193 @@
+"""
+port_monitor.py
+
+시리얼 포트 감시 스레드
+- 포트 목록 조회(comports)를 GUI 스레드 밖에서 실행하고 결과를 캐시
+- Linux: inotify로 /dev의 장치 파일 생성/삭제를 감시 (연결/분리 즉시 반영, 폴링 없음)
+- 그 외 (Windows, macOS): 주기적으로 다시 조회
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from serial_core import list_serial_ports
+
+
+POLL_INTERVAL = 2.0  # inotify를 사용할 수 없을 때 조회 주기 (초)
+DEBOUNCE = 0.1  # 장치 파일 변경 후 다시 조회하기까지 대기 (연속 이벤트 묶기)
+
+# 감시할 장치 파일 이름 (ttyUSB0, ttyACM0, ttyS0, rfcomm0 ...)
+_PORT_PREFIXES = ('tty', 'rfcomm')
+
+# inotify 상수 (<sys/inotify.h>)
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class _InotifyWatch:
+    """ctypes 기반 inotify 디렉토리 감시 (Linux 전용)"""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+        if libc.inotify_add_watch(self.fd, path.encode(), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed: {path}")
+
+    @staticmethod
+    def create(path='/dev'):
+        """감시 생성 (지원하지 않는 환경이면 None)"""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            return _InotifyWatch(path)
+        except (OSError, AttributeError):
+            return None
+
+    def read_names(self):
+        """
+        대기 중인 이벤트의 파일 이름 읽기
+
+        Returns:
+            list: 변경된 파일 이름
+        """
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return names
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                names.append(data[offset:offset + name_len].rstrip(b'\0').decode(errors='replace'))
+                offset += name_len
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PortMonitor(QThread):
+    """시리얼 포트 감시 스레드"""
+
+    # 시그널
+    ports_changed = pyqtSignal(list, bool)  # (포트 목록, 요청에 의한 조회 여부)
+
+    def __init__(self):
+        super().__init__()
+        self.is_running = False
+        self.mode = None  # 'inotify' 또는 'polling'
+        self._ports = []
+        self._lock = threading.Lock()
+        self._refresh_requested = True  # 시작 시 첫 조회 결과는 항상 전달
+        self._wake_event = threading.Event()
+        self._wake_pipe = None
+
+    def ports(self):
+        """마지막으로 조회한 포트 목록 (블로킹 없음)"""
+        with self._lock:
+            return list(self._ports)
+
+    def refresh(self):
+        """즉시 다시 조회 요청 (결과는 ports_changed 시그널로 전달)"""
+        self._refresh_requested = True
+        self._wake()
+
+    def stop(self):
+        """감시 중지"""
+        self.is_running = False
+        self._wake()
+
+    def run(self):
+        """감시 스레드"""
+        self.is_running = True
+        watch = _InotifyWatch.create('/dev')
+
+        try:
+            if watch is not None:
+                self.mode = 'inotify'
+                self._wake_pipe = os.pipe()
+                self._run_inotify(watch)
+            else:
+                self.mode = 'polling'
+                self._run_polling()
+        finally:
+            if watch is not None:
+                watch.close()
+            if self._wake_pipe is not None:
+                for fd in self._wake_pipe:
+                    os.close(fd)
+                self._wake_pipe = None
+
+    def _run_inotify(self, watch):
+        """장치 파일 변경 시에만 다시 조회"""
+        wake_fd = self._wake_pipe[0]
+
+        while self.is_running:
+            self._scan()
+
+            changed = False
+            while self.is_running and not changed and not self._refresh_requested:
+                readable, _, _ = select.select([watch.fd, wake_fd], [], [])
+                if wake_fd in readable:
+                    os.read(wake_fd, 512)
+                if watch.fd in readable:
+                    changed = any(name.startswith(_PORT_PREFIXES) for name in watch.read_names())
+
+            if changed:
+                # 연속 이벤트(노드 생성 + 심볼릭 링크 등)를 모은 뒤 한 번만 조회
+                time.sleep(DEBOUNCE)
+                watch.read_names()
+
+    def _run_polling(self):
+        """주기적으로 다시 조회"""
+        while self.is_running:
+            self._scan()
+            self._wake_event.wait(POLL_INTERVAL)
+            self._wake_event.clear()
+
+    def _scan(self):
+        """포트 목록 조회 후 변경되었거나 요청된 경우 시그널 발생"""
+        requested = self._refresh_requested
+        self._refresh_requested = False
+
+        try:
+            ports = sorted(list_serial_ports())
+        except Exception:
+            return  # 일시적인 조회 실패는 다음 이벤트에서 다시 시도
+
+        with self._lock:
+            changed = ports != self._ports
+            self._ports = ports
+
+        if changed or requested:
+            self.ports_changed.emit(ports, requested)
+
+    def _wake(self):
+        """대기 중인 감시 루프 깨우기"""
+        self._wake_event.set()
+        pipe = self._wake_pipe
+        if pipe is not None:
+            try:
+                os.write(pipe[1], b'\0')
+            except OSError:
+                pass
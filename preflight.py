@@ -0,0 +1,311 @@
+"""
+preflight.py
+
+일괄 업로드 사전 점검 (Qt 비의존)
+- 파일마다 WAV 청크를 직접 읽어 스펙(32kHz 16-bit Mono PCM), data 청크 길이, 잘림 여부 확인
+  (헤더만 읽으므로 파일 크기와 무관하게 빠름, 여러 파일은 스레드 풀에서 동시에)
+- 보드 STATUS 응답의 SD 여유 공간("SD: OK 15234MB free")과 업로드할 총 크기 비교
+- 결과는 보고서 하나로 모음: 업로드 가능 / 변환 필요 (자동 변환 대상) / 실패
+"""
+
+import math
+import os
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_converter import AudioConverter, find_ffmpeg_tool, wav_spec_errors
+
+
+PREFLIGHT_WORKERS = 8  # 동시에 점검할 파일 수 (헤더 읽기 위주라 CPU 수와 무관)
+
+CLUSTER_BYTES = 32 * 1024  # SD 카드(FAT32) 클러스터 크기 - 파일은 클러스터 단위로 공간 차지
+SD_RESERVE_BYTES = 1024 * 1024  # 여유 공간 중 남겨 둘 크기 (STATUS는 MB 단위로 내림)
+
+WAV_HEADER_BYTES = 44  # 변환 결과 WAV 헤더 크기 (크기 예상용)
+
+# 파일 상태
+PASS = 'pass'  # 그대로 업로드 가능
+CONVERT = 'convert'  # 변환하면 업로드 가능 (스펙 불일치, WAV 아님)
+FAIL = 'fail'  # 손상/잘림/읽기 실패 - 확인 필요
+
+_SD_FREE_RE = re.compile(r'SD:\s*OK\s+(\d+)\s*MB\s+free', re.IGNORECASE)
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_CHUNK = struct.Struct('<4sI')
+_FMT = struct.Struct('<HHIIHH')  # 형식, 채널, 샘플레이트, 초당 바이트, 블록 정렬, 비트
+
+
+def parse_sd_free(lines):
+    """
+    STATUS 응답에서 SD 여유 공간 추출
+
+    Args:
+        lines: 응답 줄 목록 (ANSI 코드 제거된 텍스트) 또는 문자열 하나
+
+    Returns:
+        int: 여유 공간 (바이트, 없으면 None)
+    """
+    if isinstance(lines, str):
+        lines = [lines]
+    for line in lines:
+        match = _SD_FREE_RE.search(line)
+        if match:
+            return int(match.group(1)) * 1024 * 1024
+    return None
+
+
+def card_bytes(size):
+    """SD 카드에서 차지하는 크기 (클러스터 단위 올림)"""
+    return max(math.ceil(size / CLUSTER_BYTES), 1) * CLUSTER_BYTES
+
+
+def converted_bytes(duration_sec):
+    """변환 결과(32kHz 16-bit Mono WAV) 예상 크기"""
+    frames = int(round(duration_sec * AudioConverter.SAMPLE_RATE))
+    return WAV_HEADER_BYTES + frames * AudioConverter.SAMPLE_WIDTH * AudioConverter.CHANNELS
+
+
+def read_wav_chunks(file_path):
+    """
+    WAV 청크 구조 읽기 (fmt / data 청크 헤더만, 오디오 데이터는 읽지 않음)
+
+    Returns:
+        dict: {'file_size', 'riff_size', 'format_tag', 'channels', 'sample_rate', 'block_align',
+               'bits', 'data_offset', 'data_size'} - 없는 청크의 항목은 None
+
+    Raises:
+        ValueError: RIFF/WAVE 파일이 아님
+        OSError: 파일을 읽을 수 없는 경우
+    """
+    info = {'file_size': os.path.getsize(file_path), 'riff_size': None, 'format_tag': None,
+            'channels': None, 'sample_rate': None, 'block_align': None, 'bits': None,
+            'data_offset': None, 'data_size': None}
+
+    with open(file_path, 'rb') as f:
+        head = f.read(12)
+        if len(head) < 12 or head[:4] != b'RIFF' or head[8:12] != b'WAVE':
+            raise ValueError("RIFF/WAVE 파일이 아님")
+        info['riff_size'] = struct.unpack('<I', head[4:8])[0]
+
+        pos = 12
+        while pos + _CHUNK.size <= info['file_size']:
+            f.seek(pos)
+            chunk_id, chunk_size = _CHUNK.unpack(f.read(_CHUNK.size))
+            if chunk_id == b'fmt ' and chunk_size >= _FMT.size:
+                (info['format_tag'], info['channels'], info['sample_rate'], _,
+                 info['block_align'], info['bits']) = _FMT.unpack(f.read(_FMT.size))
+            elif chunk_id == b'data':
+                info['data_offset'] = pos + _CHUNK.size
+                info['data_size'] = chunk_size
+                break  # data 뒤의 청크(LIST 등)는 보지 않음
+            pos += _CHUNK.size + chunk_size + (chunk_size & 1)  # 청크는 2바이트 정렬
+
+    return info
+
+
+def _check_wav(file_path, result):
+    """WAV 구조/스펙 점검 (result에 기록)"""
+    try:
+        info = read_wav_chunks(file_path)
+    except ValueError as e:
+        result['errors'].append(str(e))
+        return
+    except OSError as e:
+        result['errors'].append(f"읽기 오류: {e}")
+        return
+
+    if info['format_tag'] is None:
+        result['errors'].append("fmt 청크 없음")
+        return
+    if info['data_size'] is None:
+        result['errors'].append("data 청크 없음 (잘린 파일)")
+        return
+
+    # 구조: data 청크 길이 / 잘림
+    available = info['file_size'] - info['data_offset']
+    if info['data_size'] > available:
+        result['errors'].append(f"잘린 파일: data 청크 {info['data_size']} bytes 중 "
+                                f"{max(available, 0)} bytes만 있음")
+    elif info['riff_size'] + 8 > info['file_size']:
+        result['errors'].append(f"RIFF 크기 불일치: 헤더 {info['riff_size'] + 8} bytes, "
+                                f"파일 {info['file_size']} bytes")
+    if info['data_size'] == 0:
+        result['errors'].append("오디오 데이터 없음")
+    elif info['block_align'] and info['data_size'] % info['block_align']:
+        result['errors'].append(f"data 청크 길이({info['data_size']})가 "
+                                f"프레임 크기({info['block_align']})의 배수가 아님")
+
+    # 스펙
+    if info['format_tag'] != _WAVE_FORMAT_PCM:
+        name = 'EXTENSIBLE' if info['format_tag'] == _WAVE_FORMAT_EXTENSIBLE \
+            else f"0x{info['format_tag']:04X}"
+        result['spec_errors'].append(f"형식: {name} (필요: PCM)")
+    result['spec_errors'].extend(
+        wav_spec_errors(info['sample_rate'], info['bits'] // 8, info['channels']))
+
+    byte_rate = info['sample_rate'] * info['block_align']
+    if byte_rate:
+        result['duration_sec'] = round(min(info['data_size'], max(available, 0)) / byte_rate, 3)
+
+
+def check_file(file_path, can_probe=True):
+    """
+    파일 하나 점검
+
+    Args:
+        file_path: 업로드할 파일 경로
+        can_probe: ffprobe 사용 가능 여부 (WAV가 아닌 파일의 길이 확인용)
+
+    Returns:
+        dict: {'file', 'status', 'size', 'duration_sec', 'upload_bytes', 'spec_errors', 'errors'}
+              status: PASS / CONVERT / FAIL, upload_bytes: SD 카드에서 차지할 크기
+              (변환 필요 파일은 변환 후 예상 크기, 알 수 없으면 None)
+    """
+    result = {'file': file_path, 'status': FAIL, 'size': None, 'duration_sec': None,
+              'upload_bytes': None, 'spec_errors': [], 'errors': []}
+
+    if not os.path.isfile(file_path):
+        result['errors'].append("파일 없음")
+        return result
+    result['size'] = os.path.getsize(file_path)
+
+    if os.path.splitext(file_path)[1].lower() == '.wav':
+        _check_wav(file_path, result)
+    else:
+        result['spec_errors'].append(
+            f"형식: {os.path.splitext(file_path)[1].lstrip('.').upper() or '?'} (필요: WAV)")
+        if can_probe:
+            probe = AudioConverter.get_audio_info(file_path)
+            if probe is None:
+                result['errors'].append("오디오 정보를 읽을 수 없음")
+            else:
+                result['duration_sec'] = round(probe['duration_sec'], 3)
+
+    if result['errors']:
+        result['status'] = FAIL
+    elif result['spec_errors']:
+        result['status'] = CONVERT
+        if result['duration_sec'] is not None:
+            result['upload_bytes'] = card_bytes(converted_bytes(result['duration_sec']))
+    else:
+        result['status'] = PASS
+        result['upload_bytes'] = card_bytes(result['size'])
+    return result
+
+
+def preflight(file_paths, sd_free_bytes=None, include_conversions=True,
+              workers=PREFLIGHT_WORKERS):
+    """
+    일괄 업로드 사전 점검
+
+    Args:
+        file_paths: 업로드할 파일 목록 (한 채널로 업로드)
+        sd_free_bytes: SD 여유 공간 (parse_sd_free(), None이면 공간 확인 생략)
+        include_conversions: 변환 필요 파일도 변환 후 크기로 공간 계산에 포함
+        workers: 동시에 점검할 파일 수
+
+    Returns:
+        dict: {'ok', 'count', 'passed', 'convert', 'failed', 'results', 'upload_bytes',
+               'sd_free_bytes', 'fits', 'seconds'}
+              passed/convert/failed: 파일 경로 목록, fits: 공간 충분 여부 (확인 안 했으면 None)
+    """
+    start = time.monotonic()
+    can_probe = find_ffmpeg_tool('ffprobe') is not None
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(file_paths)), 1)) as pool:
+        results = list(pool.map(lambda path: check_file(path, can_probe), file_paths))
+
+    # 같은 이름은 보드에서 /audio/ch<N>/<이름>으로 덮어씀 - 뒤의 파일을 실패 처리
+    names = {}
+    for result in results:
+        if result['status'] == FAIL:
+            continue
+        name = _board_name(result)
+        if name in names:
+            result['errors'].append(f"같은 이름의 파일이 이미 목록에 있음: {names[name]}")
+            result['status'] = FAIL
+            result['upload_bytes'] = None
+        else:
+            names[name] = result['file']
+
+    grouped = {PASS: [], CONVERT: [], FAIL: []}
+    for result in results:
+        grouped[result['status']].append(result['file'])
+
+    counted = [r for r in results
+               if r['status'] == PASS or (include_conversions and r['status'] == CONVERT)]
+    upload_bytes = sum(r['upload_bytes'] or 0 for r in counted)
+    fits = None
+    if sd_free_bytes is not None:
+        fits = upload_bytes <= sd_free_bytes - SD_RESERVE_BYTES
+
+    return {
+        'ok': not grouped[CONVERT] and not grouped[FAIL] and fits is not False,
+        'count': len(results),
+        'passed': grouped[PASS],
+        'convert': grouped[CONVERT],
+        'failed': grouped[FAIL],
+        'results': results,
+        'upload_bytes': upload_bytes,
+        'sd_free_bytes': sd_free_bytes,
+        'fits': fits,
+        'seconds': round(time.monotonic() - start, 3),
+    }
+
+
+def _board_name(result):
+    """보드에 저장될 파일 이름 (변환 대상은 변환 결과 이름, 대소문자 무시 - FAT)"""
+    name = os.path.basename(result['file'])
+    if result['status'] == CONVERT:
+        name = converted_path(name)
+    return name.lower()
+
+
+def converted_path(file_path):
+    """자동 변환 결과 경로 (오디오 변환기의 출력 파일명 규칙과 같음)"""
+    return os.path.splitext(file_path)[0] + "_32k16m.wav"
+
+
+def fits(report, sd_free_bytes):
+    """
+    최신 SD 여유 공간으로 공간 충분 여부 다시 계산 (보고서 이후 STATUS를 받은 경우)
+
+    Returns:
+        bool: 충분하면 True (sd_free_bytes가 None이면 None)
+    """
+    if sd_free_bytes is None:
+        return None
+    return report['upload_bytes'] <= sd_free_bytes - SD_RESERVE_BYTES
+
+
+def summary_text(report):
+    """보고서 요약 한 줄"""
+    text = (f"사전 점검: {report['count']}개 중 업로드 가능 {len(report['passed'])}, "
+            f"변환 필요 {len(report['convert'])}, 실패 {len(report['failed'])} - "
+            f"{report['upload_bytes'] / (1024 * 1024):.1f}MB")
+    if report['sd_free_bytes'] is not None:
+        text += (f" / SD 여유 {report['sd_free_bytes'] // (1024 * 1024)}MB"
+                 f" ({'충분' if report['fits'] else '부족'})")
+    else:
+        text += " (SD 여유 공간 미확인)"
+    return text
+
+
+def report_lines(report):
+    """
+    보고서 상세 (문제가 있는 파일만)
+
+    Returns:
+        list: [(텍스트, 상태), ...] - 상태는 CONVERT / FAIL
+    """
+    lines = []
+    for result in report['results']:
+        if result['status'] == PASS:
+            continue
+        issues = result['errors'] + result['spec_errors']
+        lines.append((f"{os.path.basename(result['file'])}: {'; '.join(issues)}",
+                      result['status']))
+    return lines
@@ -0,0 +1,99 @@
+"""
+preflight_thread.py
+
+일괄 업로드 사전 점검 / 자동 변환 스레드 (preflight, ConversionJob의 Qt 어댑터)
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from audio_converter import ConversionJob
+from preflight import check_file, converted_path, preflight
+
+
+class PreflightThread(QThread):
+    """사전 점검 스레드"""
+
+    # 시그널
+    result = pyqtSignal(object)  # preflight() 보고서
+
+    def __init__(self, file_paths, sd_free_bytes=None):
+        """
+        Args:
+            file_paths: 업로드할 파일 목록
+            sd_free_bytes: SD 여유 공간 (None이면 공간 확인 생략)
+        """
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.sd_free_bytes = sd_free_bytes
+
+    def run(self):
+        """점검 실행"""
+        self.result.emit(preflight(self.file_paths, self.sd_free_bytes))
+
+
+class AutoConvertThread(QThread):
+    """변환 필요 파일 자동 변환 스레드 (여러 파일 동시, 결과 파일은 다시 점검)"""
+
+    # 시그널
+    converted = pyqtSignal(str, object)  # (원본 경로, 변환 결과 check_file() - 실패 시 None)
+    failed = pyqtSignal(str, str)  # (원본 경로, 오류 메시지)
+    finished = pyqtSignal(bool, str)  # (전체 성공 여부, 메시지)
+
+    def __init__(self, file_paths, jobs=None, normalize=False, trim_silence=False):
+        """
+        Args:
+            file_paths: 변환할 파일 목록 (결과는 preflight.converted_path())
+            jobs: 동시 변환 개수 (기본: CPU 수의 절반)
+        """
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.jobs = jobs or max((os.cpu_count() or 2) // 2, 1)
+        self.normalize = normalize
+        self.trim_silence = trim_silence
+        self._running_jobs = []
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def cancel(self):
+        """변환 취소 (진행 중인 변환도 중단)"""
+        self._cancelled = True
+        with self._lock:
+            for job in self._running_jobs:
+                job.cancel()
+
+    def run(self):
+        """변환 실행"""
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            outcomes = list(pool.map(self._convert_one, self.file_paths))
+
+        succeeded = sum(outcomes)
+        if self._cancelled:
+            self.finished.emit(False, f"Auto-conversion cancelled ({succeeded} converted)")
+        else:
+            self.finished.emit(succeeded == len(self.file_paths),
+                               f"Auto-converted {succeeded}/{len(self.file_paths)} files")
+
+    def _convert_one(self, input_path):
+        """파일 하나 변환 후 결과 점검"""
+        if self._cancelled:
+            return False
+
+        job = ConversionJob(input_path, converted_path(input_path),
+                            normalize=self.normalize, trim_silence=self.trim_silence)
+        with self._lock:
+            self._running_jobs.append(job)
+        try:
+            success, message = job.run()
+        finally:
+            with self._lock:
+                self._running_jobs.remove(job)
+
+        if not success:
+            self.failed.emit(input_path, message)
+            return False
+        self.converted.emit(input_path, check_file(converted_path(input_path)))
+        return True
@@ -0,0 +1,405 @@
+"""
+preview_player.py
+
+미리 듣기 플레이어 (QAudioOutput + 디코딩된 PCM 캐시)
+- 파일은 한 번만 디코딩해 디스크 캐시에 PCM으로 저장하고, 이후에는 캐시 파일을 바로 사용
+  (큰 파일은 메모리 매핑 - 재생 위치 부근만 실제로 읽음)
+- 원본과 변환 결과를 같은 재생 형식으로 디코딩해 같은 위치에서 즉시 전환 (A/B 비교)
+- 위치 이동은 버퍼 오프셋 변경뿐 (파일을 다시 열지 않음)
+- 같은 PCM에서 이퀄라이저 분석용 Mono 샘플을 만들어 전달 (이퀄라이저가 따로 디코딩하지 않음)
+"""
+
+import os
+
+import numpy as np
+from PyQt5.QtCore import QIODevice, QObject, QThread, pyqtSignal
+from PyQt5.QtMultimedia import QAudio, QAudioDeviceInfo, QAudioFormat, QAudioOutput
+
+from audio_converter import AudioConverter
+from cache_store import LruFileCache, default_cache_dir, file_digest, make_key
+
+
+# 재생 형식 (원본/변환 결과 모두 이 형식으로 디코딩해 같은 출력 장치로 재생)
+PLAYBACK_RATE = 44100
+PLAYBACK_CHANNELS = 2
+FRAME_BYTES = PLAYBACK_CHANNELS * 2  # 16-bit
+
+# 디코딩 방법이 바뀌면 올려서 이전 캐시 무효화
+PCM_VERSION = 1
+PCM_CACHE_MAX_BYTES = 1024 ** 3
+
+MMAP_THRESHOLD = 16 * 1024 * 1024  # 이보다 큰 PCM은 메모리 매핑 (작은 파일은 메모리로 읽기)
+OUTPUT_BUFFER_MS = 100  # 출력 버퍼 길이 (위치 이동/A/B 전환이 들리기까지의 지연)
+ANALYSIS_CHUNK = 1024 * 1024  # 분석용 샘플 변환 단위 (프레임)
+
+# A/B 비교 대상
+SOURCE = 'source'
+CONVERTED = 'converted'
+
+_cache = None
+
+
+def get_cache():
+    """디코딩된 PCM 캐시 반환"""
+    global _cache
+    if _cache is None:
+        _cache = LruFileCache(default_cache_dir('preview'),
+                              max_bytes=PCM_CACHE_MAX_BYTES,
+                              suffix='.pcm')
+    return _cache
+
+
+def pcm_cache_key(file_path):
+    """파일 내용 해시 + 재생 형식으로 캐시 키 생성"""
+    return make_key(file_digest(file_path), 'preview-pcm', PLAYBACK_RATE, PLAYBACK_CHANNELS,
+                    PCM_VERSION)
+
+
+class PcmBuffer:
+    """디코딩된 재생용 PCM (int16, PLAYBACK_CHANNELS 인터리브)"""
+
+    def __init__(self, samples, file_path):
+        """
+        Args:
+            samples: int16 배열 (np.memmap 가능)
+            file_path: 원래 오디오 파일 경로
+        """
+        self.samples = samples
+        self.file_path = file_path
+        self.size = len(samples) * 2 // FRAME_BYTES * FRAME_BYTES  # 바이트 (프레임 단위)
+        self.analysis = None  # 이퀄라이저 분석용 Mono 샘플 (analysis_samples())
+
+    @property
+    def duration_ms(self):
+        """길이 (ms)"""
+        return self.size // FRAME_BYTES * 1000 // PLAYBACK_RATE
+
+    def read(self, offset, size):
+        """offset 바이트부터 size 바이트 (프레임 단위로 정렬된 값)"""
+        return self.samples[offset // 2:(offset + size) // 2].tobytes()
+
+    def analysis_samples(self, sample_rate):
+        """
+        이퀄라이저 분석용 Mono 샘플 (채널 평균 + 정수배 간축)
+
+        메모리 매핑된 큰 파일도 ANALYSIS_CHUNK 단위로 처리해 임시 메모리를 제한
+
+        Args:
+            sample_rate: 분석 샘플레이트 (PLAYBACK_RATE의 약수)
+
+        Returns:
+            np.ndarray: int16 Mono PCM
+        """
+        factor = PLAYBACK_RATE // sample_rate
+        if factor < 1 or PLAYBACK_RATE % sample_rate:
+            raise ValueError(f"Analysis rate must divide {PLAYBACK_RATE}: {sample_rate}")
+
+        frames = self.size // FRAME_BYTES
+        count = frames // factor
+        out = np.empty(count, dtype=np.int16)
+        chunk = ANALYSIS_CHUNK // factor * factor
+        for start in range(0, count * factor, chunk):
+            stop = min(start + chunk, count * factor)
+            block = self.samples[start * PLAYBACK_CHANNELS:stop * PLAYBACK_CHANNELS]
+            block = block.reshape(-1, factor * PLAYBACK_CHANNELS).astype(np.int32)
+            out[start // factor:stop // factor] = block.sum(axis=1) // (factor * PLAYBACK_CHANNELS)
+        return out
+
+
+def load_pcm(file_path):
+    """
+    재생용 PCM 읽기 (캐시에 없으면 FFmpeg로 디코딩해 캐시에 저장)
+
+    Returns:
+        PcmBuffer: 실패 시 None
+    """
+    cache = get_cache()
+    key = pcm_cache_key(file_path)
+    path = cache.get(key)
+
+    if path is None:
+        tmp_path = cache.path_for(key) + '.decode.part'
+        os.makedirs(os.path.dirname(tmp_path), exist_ok=True)
+        try:
+            if not AudioConverter.decode_pcm_file(file_path, tmp_path,
+                                                  PLAYBACK_RATE, PLAYBACK_CHANNELS):
+                return None
+            path = cache.put(key, tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    size = os.path.getsize(path)
+    if size < FRAME_BYTES:
+        return None
+    if size > MMAP_THRESHOLD:
+        samples = np.memmap(path, dtype='<i2', mode='r')
+    else:
+        samples = np.fromfile(path, dtype='<i2')
+    return PcmBuffer(samples, file_path)
+
+
+class PcmDecodeThread(QThread):
+    """PCM 디코딩(또는 캐시 읽기) + 분석용 샘플 준비 스레드"""
+
+    # 시그널
+    loaded = pyqtSignal(str, object)  # (A/B 대상, PcmBuffer 또는 None)
+
+    def __init__(self, variant, file_path, analysis_rate):
+        super().__init__()
+        self.variant = variant
+        self.file_path = file_path
+        self.analysis_rate = analysis_rate
+
+    def run(self):
+        """디코딩 실행"""
+        try:
+            buffer = load_pcm(self.file_path)
+        except OSError:
+            buffer = None
+        if buffer is not None:
+            buffer.analysis = buffer.analysis_samples(self.analysis_rate)
+        self.loaded.emit(self.variant, buffer)
+
+
+class PcmSource(QIODevice):
+    """QAudioOutput에 PCM 버퍼를 공급하는 장치 (pull 모드, 위치/버퍼 교체 즉시 반영)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = None
+        self.pos = 0  # 다음에 읽을 바이트 위치
+
+    def set_buffer(self, buffer):
+        """버퍼 교체 (위치 유지, 새 버퍼 길이로 제한)"""
+        self.buffer = buffer
+        self.pos = min(self.pos, buffer.size)
+
+    def seek_bytes(self, pos):
+        """읽기 위치 변경 (프레임 단위로 정렬)"""
+        size = self.buffer.size if self.buffer else 0
+        self.pos = min(max(pos, 0) // FRAME_BYTES * FRAME_BYTES, size)
+
+    def at_end(self):
+        """버퍼 끝까지 읽음"""
+        return self.buffer is None or self.pos >= self.buffer.size
+
+    def readData(self, maxlen):
+        if self.buffer is None:
+            return b''
+        size = min(maxlen // FRAME_BYTES * FRAME_BYTES, self.buffer.size - self.pos)
+        if size <= 0:
+            return b''
+        data = self.buffer.read(self.pos, size)
+        self.pos += size
+        return data
+
+    def writeData(self, data):
+        return -1
+
+    def bytesAvailable(self):
+        remaining = self.buffer.size - self.pos if self.buffer else 0
+        return remaining + super().bytesAvailable()
+
+    def isSequential(self):
+        return True
+
+
+class PreviewPlayer(QObject):
+    """
+    미리 듣기 플레이어
+
+    open()으로 원본(과 변환 결과)을 백그라운드에서 준비하고, play() 전에 준비가 끝나지 않았으면
+    준비되는 즉시 재생한다.
+    """
+
+    # 시그널
+    loaded = pyqtSignal(str, bool)  # (A/B 대상, 성공 여부)
+    analysis_ready = pyqtSignal(str, object)  # (파일 경로, 분석용 Mono 샘플) - 재생 중인 대상
+    finished = pyqtSignal()  # 끝까지 재생
+    error = pyqtSignal(str)  # 오류 메시지
+
+    def __init__(self, analysis_rate=22050, parent=None):
+        """
+        Args:
+            analysis_rate: 이퀄라이저 분석 샘플레이트 (PLAYBACK_RATE의 약수)
+        """
+        super().__init__(parent)
+        self.analysis_rate = analysis_rate
+        self.variant = SOURCE  # 재생 중인 A/B 대상
+        self.buffers = {}  # A/B 대상 → PcmBuffer
+        self._paths = {}  # A/B 대상 → (파일 경로, mtime) - 같은 파일은 다시 준비하지 않음
+        self._threads = []
+        self._play_when_ready = False
+        self._playing = False
+
+        self.source = PcmSource(self)
+        self.source.open(QIODevice.ReadOnly)
+        self.audio = None  # QAudioOutput (처음 재생할 때 생성)
+
+    @property
+    def is_playing(self):
+        return self._playing
+
+    def open(self, source_path, converted_path=None):
+        """
+        미리 듣기 파일 준비 (이미 준비된 파일은 그대로 사용)
+
+        Args:
+            source_path: 원본 파일
+            converted_path: 변환 결과 파일 (없으면 A/B 비교 불가)
+        """
+        for variant, path in ((SOURCE, source_path), (CONVERTED, converted_path)):
+            identity = None
+            if path and os.path.exists(path):
+                identity = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+            if self._paths.get(variant) == identity:
+                continue
+
+            # 재생 중인 파일이 바뀌면 정지 후 원본부터
+            if variant in (SOURCE, self.variant):
+                self.stop()
+                self.variant = SOURCE
+            self.buffers.pop(variant, None)
+            if identity is None:
+                self._paths.pop(variant, None)
+                continue
+            self._paths[variant] = identity
+
+            thread = PcmDecodeThread(variant, path, self.analysis_rate)
+            thread.loaded.connect(self._on_loaded)
+            thread.finished.connect(lambda t=thread: self._threads.remove(t))
+            self._threads.append(thread)
+            thread.start()
+
+    def has_variant(self, variant):
+        """A/B 대상이 준비되었는지"""
+        return variant in self.buffers
+
+    def play(self):
+        """재생 (준비 중이면 준비되는 즉시)"""
+        buffer = self.buffers.get(self.variant)
+        if buffer is None:
+            self._play_when_ready = True
+            return
+
+        self._play_when_ready = False
+        self.source.set_buffer(buffer)
+        if self.source.at_end():
+            self.source.pos = 0
+
+        audio = self._output()
+        if audio is None:
+            return
+        if audio.state() == QAudio.SuspendedState:
+            audio.resume()
+        elif audio.state() != QAudio.ActiveState:
+            audio.start(self.source)
+        self._playing = True
+
+    def pause(self):
+        """일시 정지 (위치 유지)"""
+        self._play_when_ready = False
+        if self.audio is not None and self._playing:
+            self.audio.suspend()
+        self._playing = False
+
+    def stop(self):
+        """정지 (처음 위치로)"""
+        self._play_when_ready = False
+        self._playing = False
+        if self.audio is not None:
+            self.audio.stop()
+        self.source.pos = 0
+
+    def seek(self, position_ms):
+        """재생 위치 이동 (출력 버퍼에 남은 OUTPUT_BUFFER_MS 이후부터 들림)"""
+        self.source.seek_bytes(int(position_ms) * PLAYBACK_RATE // 1000 * FRAME_BYTES)
+
+    def set_variant(self, variant):
+        """
+        A/B 전환 (같은 재생 위치에서 계속)
+
+        Returns:
+            bool: 전환 성공 (대상이 준비되지 않았으면 False)
+        """
+        buffer = self.buffers.get(variant)
+        if buffer is None:
+            return False
+        if variant != self.variant:
+            position = self.position_ms()
+            self.variant = variant
+            self.source.set_buffer(buffer)
+            self.seek(position)
+            self.analysis_ready.emit(buffer.file_path, buffer.analysis)
+        return True
+
+    def position_ms(self):
+        """현재 들리는 위치 (ms) - 출력 장치에 넘겼지만 아직 재생되지 않은 양 제외"""
+        pos = self.source.pos
+        if self.audio is not None and self._playing:
+            pos -= self.audio.bufferSize() - self.audio.bytesFree()
+        return max(pos, 0) // FRAME_BYTES * 1000 // PLAYBACK_RATE
+
+    def duration_ms(self):
+        """재생 중인 대상의 길이 (ms, 준비 전이면 0)"""
+        buffer = self.buffers.get(self.variant)
+        return buffer.duration_ms if buffer else 0
+
+    def close(self):
+        """정지 및 디코딩 스레드 종료 대기"""
+        self.stop()
+        for thread in list(self._threads):
+            thread.wait()
+
+    def _output(self):
+        """QAudioOutput (처음 호출 시 생성, 출력 장치가 형식을 지원하지 않으면 None)"""
+        if self.audio is not None:
+            return self.audio
+
+        fmt = QAudioFormat()
+        fmt.setSampleRate(PLAYBACK_RATE)
+        fmt.setChannelCount(PLAYBACK_CHANNELS)
+        fmt.setSampleSize(16)
+        fmt.setSampleType(QAudioFormat.SignedInt)
+        fmt.setByteOrder(QAudioFormat.LittleEndian)
+        fmt.setCodec('audio/pcm')
+
+        device = QAudioDeviceInfo.defaultOutputDevice()
+        if device.isNull() or not device.isFormatSupported(fmt):
+            self.error.emit("No audio output device for 44.1kHz 16-bit stereo")
+            return None
+
+        self.audio = QAudioOutput(device, fmt, self)
+        self.audio.setBufferSize(PLAYBACK_RATE * FRAME_BYTES * OUTPUT_BUFFER_MS // 1000)
+        self.audio.stateChanged.connect(self._on_state_changed)
+        return self.audio
+
+    def _on_state_changed(self, state):
+        """출력 상태 변경: 버퍼 끝에서 Idle이 되면 재생 완료"""
+        if state == QAudio.IdleState and self._playing and self.source.at_end():
+            self.stop()
+            self.finished.emit()
+        elif state == QAudio.StoppedState and self.audio.error() != QAudio.NoError:
+            self._playing = False
+            self.error.emit(f"Audio output error ({int(self.audio.error())})")
+
+    def _on_loaded(self, variant, buffer):
+        """디코딩 완료 (그 사이 다른 파일이 열렸으면 무시)"""
+        if buffer is None:
+            self._paths.pop(variant, None)
+            self.loaded.emit(variant, False)
+            if variant == self.variant:
+                self._play_when_ready = False
+            return
+
+        identity = self._paths.get(variant)
+        if identity is None or identity[0] != os.path.abspath(buffer.file_path):
+            return
+
+        self.buffers[variant] = buffer
+        self.loaded.emit(variant, True)
+        if variant == self.variant:
+            self.analysis_ready.emit(buffer.file_path, buffer.analysis)
+            if self._play_when_ready:
+                self.play()
@@ -0,0 +1,311 @@
+"""
+scene_engine.py
+
+장면(여러 채널 동시 재생) 실행 엔진 (Qt 비의존)
+- load_scene(): 장면 파일(JSON) 읽기 + 검증
+- compile_scene(): 장면 → 전체 명령 일정 미리 계산 (같은 시각의 명령은 한 번의 쓰기로 묶음)
+- SceneScheduler: 고해상도 타이머로 일정대로 전송, 쓰기 지연을 측정해 그만큼 먼저 전송
+
+장면 파일 예:
+    {
+      "name": "opening",
+      "cues": [
+        {"at": 0, "action": "play", "channels": [0, 1, 2, 3], "file": "/audio/ch{ch}/intro.wav"},
+        {"at": 0, "action": "play", "channels": 4, "file": "/audio/ch4/bgm.wav", "loop": true},
+        {"at": 5, "action": "fade", "channels": 5, "from": 0, "to": 80, "duration": 3},
+        {"at": 60, "action": "stop", "channels": [0, 1, 2, 3]}
+      ]
+    }
+
+동작: play (file, loop, volume), stop, stopall, volume (level), loop (on), fade (from, to, duration, step)
+file의 {ch}는 채널 번호로 바뀜, fade의 from을 생략하면 to가 0일 때 100 (페이드 아웃), 그 외 0
+"""
+
+import json
+import math
+import os
+import time
+
+
+CHANNELS = 6
+MAX_VOLUME = 100
+
+FADE_STEP = 0.1  # 페이드 VOLUME 명령 간격 (초)
+SETUP_LEAD = 0.05  # play의 LOOP/VOLUME 설정을 PLAY보다 먼저 보내는 시간 (초)
+COINCIDENT = 0.001  # 이 간격 안의 명령은 한 번의 쓰기로 묶음 (초)
+
+# 목표 시각 직전에는 sleep 대신 바쁜 대기 (Windows의 sleep 해상도는 최대 15.6ms)
+SPIN_THRESHOLD = 0.016 if os.name == 'nt' else 0.002
+CANCEL_POLL = 0.05  # 대기 중 취소 확인 간격 (초)
+LATENCY_ALPHA = 0.25  # 쓰기 지연 추정 가중치 (지수 이동 평균)
+INITIAL_LATENCY = 0.0005  # 첫 전송 전의 쓰기 지연 추정값 (송신 스레드 전달 + write(), 초)
+
+ACTIONS = ('play', 'stop', 'stopall', 'volume', 'loop', 'fade')
+
+
+def load_scene(path):
+    """
+    장면 파일 읽기
+
+    Returns:
+        dict: 장면 ({'name', 'cues'})
+
+    Raises:
+        ValueError: 형식 오류 (JSON 오류 포함)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            scene = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid scene file: {e}")
+
+    if not isinstance(scene, dict) or not isinstance(scene.get('cues'), list):
+        raise ValueError("Scene must be an object with a 'cues' list")
+    scene.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    return scene
+
+
+def _channels(cue, index):
+    """cue의 채널 목록 (검증 포함)"""
+    channels = cue.get('channels', cue.get('channel'))
+    if channels is None:
+        raise ValueError(f"cue {index}: 'channels' is required")
+    if isinstance(channels, int):
+        channels = [channels]
+    for ch in channels:
+        if not isinstance(ch, int) or not 0 <= ch < CHANNELS:
+            raise ValueError(f"cue {index}: invalid channel {ch!r} (must be 0~{CHANNELS - 1})")
+    return channels
+
+
+def _volume(value, index):
+    """볼륨 값 검증"""
+    if not isinstance(value, (int, float)) or not 0 <= value <= MAX_VOLUME:
+        raise ValueError(f"cue {index}: invalid volume {value!r} (must be 0~{MAX_VOLUME})")
+    return int(round(value))
+
+
+def _cue_commands(cue, index):
+    """
+    cue 하나의 명령 목록
+
+    Returns:
+        list: [(cue 시작 기준 시각, 명령), ...]
+    """
+    action = cue.get('action')
+    if action not in ACTIONS:
+        raise ValueError(f"cue {index}: unknown action {action!r} (one of {', '.join(ACTIONS)})")
+    if action == 'stopall':
+        return [(0.0, 'STOPALL')]
+
+    channels = _channels(cue, index)
+    commands = []
+
+    if action == 'play':
+        file_name = cue.get('file')
+        if not file_name:
+            raise ValueError(f"cue {index}: 'file' is required for play")
+        for ch in channels:
+            if 'loop' in cue:
+                commands.append((-SETUP_LEAD, f"LOOP {ch} {'ON' if cue['loop'] else 'OFF'}"))
+            if 'volume' in cue:
+                commands.append((-SETUP_LEAD, f"VOLUME {ch} {_volume(cue['volume'], index)}"))
+        for ch in channels:
+            commands.append((0.0, f"PLAY {ch} {file_name.replace('{ch}', str(ch))}"))
+
+    elif action == 'stop':
+        commands = [(0.0, f"STOP {ch}") for ch in channels]
+
+    elif action == 'volume':
+        level = _volume(cue.get('level'), index)
+        commands = [(0.0, f"VOLUME {ch} {level}") for ch in channels]
+
+    elif action == 'loop':
+        state = 'ON' if cue.get('on', True) else 'OFF'
+        commands = [(0.0, f"LOOP {ch} {state}") for ch in channels]
+
+    elif action == 'fade':
+        target = _volume(cue.get('to'), index)
+        duration = cue.get('duration', 1.0)
+        if not isinstance(duration, (int, float)) or duration <= 0:
+            raise ValueError(f"cue {index}: invalid fade duration {duration!r}")
+        start = _volume(cue.get('from', MAX_VOLUME if target == 0 else 0), index)
+
+        step_seconds = cue.get('step', FADE_STEP)
+        if not isinstance(step_seconds, (int, float)) or step_seconds <= 0:
+            raise ValueError(f"cue {index}: invalid fade step {step_seconds!r}")
+
+        steps = max(int(math.ceil(duration / step_seconds)), 1)
+        last = None
+        for step in range(steps + 1):
+            level = int(round(start + (target - start) * step / steps))
+            if level == last:
+                continue  # 같은 볼륨은 다시 보내지 않음
+            last = level
+            offset = duration * step / steps
+            commands.extend((offset, f"VOLUME {ch} {level}") for ch in channels)
+
+    return commands
+
+
+def compile_scene(scene):
+    """
+    장면 → 명령 일정
+
+    같은 시각(COINCIDENT 이내)의 명령은 한 번의 쓰기로 묶어 연속된 바이트로 전송되게 한다.
+    PLAY 전에 보내야 하는 설정(LOOP/VOLUME) 때문에 음수 시각이 생기면 전체를 뒤로 민다.
+
+    Returns:
+        list: [(장면 시작 후 초, [명령, ...]), ...] (시각 순서)
+
+    Raises:
+        ValueError: cue 형식 오류
+    """
+    timed = []
+    for index, cue in enumerate(scene.get('cues', [])):
+        at = cue.get('at', 0.0)
+        if not isinstance(at, (int, float)) or at < 0:
+            raise ValueError(f"cue {index}: invalid time {at!r}")
+        for offset, command in _cue_commands(cue, index):
+            timed.append((at + offset, index, command))
+
+    if not timed:
+        return []
+
+    # 시각 순서 (같은 시각은 장면 파일 순서)
+    timed.sort(key=lambda item: (item[0], item[1]))
+    shift = -min(timed[0][0], 0.0)
+
+    schedule = []
+    for t, _, command in timed:
+        t += shift
+        if schedule and t - schedule[-1][0] <= COINCIDENT:
+            schedule[-1][1].append(command)
+        else:
+            schedule.append((round(t, 6), [command]))
+    return schedule
+
+
+def scene_duration(schedule):
+    """일정의 마지막 명령 시각 (초)"""
+    return schedule[-1][0] if schedule else 0.0
+
+
+class SceneScheduler:
+    """
+    명령 일정 실행 (호출 측 스레드에서 블로킹)
+
+    목표 시각 직전까지는 sleep, 마지막 SPIN_THRESHOLD 동안은 perf_counter로 바쁜 대기.
+    write() 호출 시간을 측정해 지연 추정값만큼 먼저 호출하므로, 쓰기가 끝나는 시각이
+    일정과 맞춰진다 (같은 시각의 명령은 이미 한 번의 쓰기로 묶여 있음).
+    """
+
+    def __init__(self, schedule, write, on_dispatch=None, latency=INITIAL_LATENCY):
+        """
+        Args:
+            schedule: compile_scene() 결과
+            write: 명령 목록 전송 함수 f(commands) → bool (전송 완료까지 블로킹)
+            on_dispatch: 전송 후 호출 f(예정 시각, 명령 목록, 오차 초)
+            latency: 초기 쓰기 지연 추정값 (초)
+        """
+        self.schedule = schedule
+        self.write = write
+        self.on_dispatch = on_dispatch
+        self.latency = latency  # 쓰기 지연 추정값 (초)
+        self.errors = []  # 전송별 오차 (쓰기 완료 시각 - 예정 시각, 초)
+        self.write_times = []  # 전송별 write() 소요 시간 (초)
+        self._cancelled = False
+        self._playing = set()  # 취소 시 정지할 채널
+
+    def cancel(self):
+        """실행 취소 (재생 중인 채널은 정지)"""
+        self._cancelled = True
+
+    def run(self):
+        """
+        일정 실행
+
+        Returns:
+            tuple: (성공 여부, 메시지)
+        """
+        self.errors = []
+        self.write_times = []
+        start = time.perf_counter()
+
+        for t, commands in self.schedule:
+            if not self._wait_until(start + t - self.latency):
+                self.stop_playing()
+                return False, "Scene cancelled"
+
+            sent = time.perf_counter()
+            if not self.write(commands):
+                return False, f"Send failed at {t:.3f}s: {'; '.join(commands)}"
+            done = time.perf_counter()
+
+            elapsed = done - sent
+            self.latency += LATENCY_ALPHA * (elapsed - self.latency)
+            self.write_times.append(elapsed)
+            self.errors.append(done - (start + t))
+            self._track(commands)
+
+            if self.on_dispatch:
+                self.on_dispatch(t, commands, self.errors[-1])
+
+        summary = self.summary()
+        return True, (f"Scene finished: {summary['commands']} commands in "
+                      f"{summary['dispatches']} writes, max error {summary['max_error_ms']:.3f}ms")
+
+    def summary(self):
+        """
+        실행 결과 요약
+
+        Returns:
+            dict: {'dispatches', 'commands', 'mean_error_ms', 'max_error_ms',
+                   'mean_write_ms', 'latency_ms'}
+        """
+        errors = [abs(e) for e in self.errors]
+        return {
+            'dispatches': len(self.errors),
+            'commands': sum(len(c) for _, c in self.schedule[:len(self.errors)]),
+            'mean_error_ms': round(sum(errors) / len(errors) * 1000, 3) if errors else 0.0,
+            'max_error_ms': round(max(errors) * 1000, 3) if errors else 0.0,
+            'mean_write_ms': (round(sum(self.write_times) / len(self.write_times) * 1000, 3)
+                              if self.write_times else 0.0),
+            'latency_ms': round(self.latency * 1000, 3),
+        }
+
+    def _wait_until(self, target):
+        """
+        목표 시각까지 대기
+
+        Returns:
+            bool: 취소되지 않고 목표 시각에 도달
+        """
+        while True:
+            if self._cancelled:
+                return False
+            remaining = target - time.perf_counter()
+            if remaining <= SPIN_THRESHOLD:
+                break
+            time.sleep(min(remaining - SPIN_THRESHOLD, CANCEL_POLL))
+
+        while time.perf_counter() < target:
+            pass
+        return True
+
+    def _track(self, commands):
+        """재생 중인 채널 추적 (취소 시 정지용)"""
+        for command in commands:
+            parts = command.split()
+            if parts[0] == 'PLAY':
+                self._playing.add(parts[1])
+            elif parts[0] == 'STOP':
+                self._playing.discard(parts[1])
+            elif parts[0] == 'STOPALL':
+                self._playing.clear()
+
+    def stop_playing(self):
+        """이 장면이 시작한 채널 정지"""
+        if self._playing:
+            self.write([f"STOP {ch}" for ch in sorted(self._playing)])
+            self._playing.clear()
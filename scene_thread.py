@@ -0,0 +1,38 @@
+"""
+scene_thread.py
+
+장면 실행 스레드 (SceneScheduler의 Qt 어댑터)
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from scene_engine import SceneScheduler
+
+
+class SceneThread(QThread):
+    """장면 실행 스레드"""
+
+    # 시그널
+    dispatched = pyqtSignal(float, list, float)  # (예정 시각, 명령 목록, 오차 초)
+    finished = pyqtSignal(bool, str)  # (성공 여부, 메시지)
+
+    def __init__(self, serial_comm, schedule):
+        """
+        Args:
+            serial_comm: SerialComm
+            schedule: scene_engine.compile_scene() 결과
+        """
+        super().__init__()
+        self.serial = serial_comm
+        self.scheduler = SceneScheduler(schedule,
+                                        write=self.serial.send_commands_now,
+                                        on_dispatch=self.dispatched.emit)
+
+    def cancel(self):
+        """실행 취소 (이 장면이 재생한 채널은 정지)"""
+        self.scheduler.cancel()
+
+    def run(self):
+        """장면 실행"""
+        success, message = self.scheduler.run()
+        self.finished.emit(success, message)
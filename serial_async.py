@@ -0,0 +1,268 @@
+"""
+serial_async.py
+
+asyncio 시리얼 포트 (Qt 비의존, 이벤트 루프 하나로 보드 여러 대 처리)
+"""
+
+import asyncio
+import functools
+import os
+
+import instrumentation
+from serial_core import (DEFAULT_BAUDRATE, RESPONSE_TIMEOUT, RESPONSE_IDLE,
+                         open_serial)
+
+
+class AsyncSerialPort:
+    """
+    asyncio 시리얼 포트
+
+    - POSIX: 파일 디스크립터를 이벤트 루프에 등록 (add_reader / add_writer)
+    - 그 외 (Windows 등): 짧은 주기로 in_waiting 폴링, 쓰기는 executor에서 실행
+    - 포트당 전용 스레드 없음
+    """
+
+    POLL_INTERVAL = 0.005  # 폴링 방식일 때 확인 주기 (초)
+
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE, executor=None):
+        """
+        Args:
+            port: 시리얼 포트
+            baudrate: 보드레이트
+            executor: 포트 열기 / 폴링 방식 쓰기에 사용할 executor (None이면 루프 기본 executor)
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.executor = executor
+        self.ser = None
+        self._loop = None
+        self._buffer = bytearray()
+        self._data_event = None
+        self._write_lock = None
+        self._reader_fd = None
+        self._poll_task = None
+        self._error = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def is_open(self):
+        """연결 상태"""
+        return bool(self.ser and self.ser.is_open) and self._error is None
+
+    async def open(self):
+        """
+        포트 열기
+
+        Raises:
+            serial.SerialException: 포트 열기 실패
+        """
+        loop = self._loop = asyncio.get_running_loop()
+        self.ser = await loop.run_in_executor(
+            self.executor, functools.partial(open_serial, self.port, self.baudrate, timeout=0))
+
+        self._buffer.clear()
+        self._data_event = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._error = None
+
+        try:
+            fd = self.ser.fileno()
+            loop.add_reader(fd, self._on_readable)
+            self._reader_fd = fd
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            # fileno 없음 (Windows) 또는 add_reader 미지원 루프 (Proactor)
+            self._poll_task = loop.create_task(self._poll())
+
+    def close(self):
+        """포트 닫기"""
+        self._stop_reader()
+        if self.ser and self.ser.is_open:
+            self.ser.close()
+        if self._error is None:
+            self._error = ConnectionError(f"{self.port} closed")
+        if self._data_event is not None:
+            self._data_event.set()  # 대기 중인 읽기 깨우기
+
+    async def write(self, data):
+        """데이터 쓰기 (str은 UTF-8로 인코딩)"""
+        self._check_error()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        async with self._write_lock:
+            with instrumentation.timer('serial_write_seconds'):
+                if self._reader_fd is not None:
+                    await self._write_fd(data)
+                else:
+                    await self._loop.run_in_executor(self.executor, self.ser.write, data)
+        instrumentation.count('serial_tx_bytes_total', len(data))
+
+    async def send_command(self, command):
+        """명령 전송 (자동으로 \\r\\n 추가)"""
+        await self.write(command + '\r\n')
+
+    async def read(self, size, timeout=1.0):
+        """
+        최대 size 바이트 읽기
+
+        size 바이트가 모이거나 timeout이 지나면 반환 (블로킹 read_raw와 같은 의미)
+
+        Returns:
+            bytes: 읽은 데이터 (타임아웃 시 size보다 짧거나 빈 값)
+        """
+        await self._wait_until(lambda: len(self._buffer) >= size, timeout)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def readline(self, timeout=RESPONSE_TIMEOUT):
+        """
+        한 줄 읽기 (빈 줄은 건너뜀)
+
+        Returns:
+            str: 수신된 줄 (앞뒤 공백 제거), 타임아웃 시 None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            found = await self._wait_until(lambda: b'\n' in self._buffer,
+                                           deadline - loop.time())
+            if not found:
+                return None
+
+            end = self._buffer.index(b'\n')
+            line = self._buffer[:end].decode('utf-8', errors='replace').strip()
+            del self._buffer[:end + 1]
+            if line:
+                return line
+
+    async def read_response(self, timeout=RESPONSE_TIMEOUT, idle=RESPONSE_IDLE):
+        """
+        응답 줄 수집
+
+        첫 줄은 timeout까지 기다리고, 이후에는 idle 동안 추가 줄이 없거나
+        여러 줄 응답의 끝(END)을 받으면 종료
+
+        Returns:
+            list: 수신된 줄
+        """
+        lines = []
+        line = await self.readline(timeout)
+        while line is not None:
+            lines.append(line)
+            if line == 'END':
+                break
+            line = await self.readline(idle)
+        return lines
+
+    async def command(self, command, timeout=RESPONSE_TIMEOUT, idle=RESPONSE_IDLE):
+        """
+        명령 전송 및 응답 수집 (이전 수신 데이터는 버림)
+
+        Returns:
+            list: 응답 줄
+        """
+        self.discard()
+        await self.send_command(command)
+        return await self.read_response(timeout, idle)
+
+    def discard(self):
+        """수신 버퍼 비우기"""
+        self._buffer.clear()
+
+    async def _wait_until(self, predicate, timeout):
+        """조건을 만족하는 데이터가 들어올 때까지 대기 (타임아웃 시 False)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(timeout, 0)
+
+        while not predicate():
+            self._check_error()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+
+            self._data_event.clear()
+            try:
+                await asyncio.wait_for(self._data_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return predicate()
+        return True
+
+    def _check_error(self):
+        """수신 오류/연결 종료 시 예외 발생"""
+        if self._error is not None:
+            raise ConnectionError(str(self._error))
+
+    async def _write_fd(self, data):
+        """논블로킹 쓰기 (pyserial POSIX 포트는 O_NONBLOCK으로 열림)"""
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._reader_fd, view)
+            except BlockingIOError:
+                written = 0
+            view = view[written:]
+
+            if view:
+                # 송신 버퍼가 찰 때까지 쓰기 가능 대기
+                writable = self._loop.create_future()
+                self._loop.add_writer(self._reader_fd,
+                                      lambda: writable.done() or writable.set_result(None))
+                try:
+                    await writable
+                finally:
+                    self._loop.remove_writer(self._reader_fd)
+
+    def _on_readable(self):
+        """수신 가능 (add_reader 콜백)"""
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+        except Exception as e:
+            self._fail(e)
+            return
+
+        if data:
+            self._buffer += data
+            self._data_event.set()
+            instrumentation.count('serial_rx_bytes_total', len(data))
+
+    async def _poll(self):
+        """수신 폴링 (add_reader를 사용할 수 없는 경우)"""
+        while self.ser and self.ser.is_open:
+            try:
+                waiting = self.ser.in_waiting
+                data = self.ser.read(waiting) if waiting else b''
+            except Exception as e:
+                self._fail(e)
+                return
+
+            if data:
+                self._buffer += data
+                self._data_event.set()
+                instrumentation.count('serial_rx_bytes_total', len(data))
+            else:
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    def _fail(self, error):
+        """수신 오류 기록 후 수신 중지"""
+        self._error = error
+        self._stop_reader()
+        self._data_event.set()
+
+    def _stop_reader(self):
+        """수신 등록 해제"""
+        if self._reader_fd is not None:
+            if not self._loop.is_closed():
+                self._loop.remove_reader(self._reader_fd)
+            self._reader_fd = None
+
+        if self._poll_task is not None:
+            self._poll_task.cancel()  # _poll 내부에서 호출된 경우 곧바로 반환하므로 무해
+            self._poll_task = None
@@ -1,52 +1,55 @@
 """
 serial_comm.py
 
-시리얼 통신 모듈
+시리얼 통신 스레드 (serial_core의 Qt 어댑터)
 """
 
-import serial
-import serial.tools.list_ports
 from PyQt5.QtCore import QThread, pyqtSignal
 import time
 
+from serial_core import (SerialPort, PRIORITY_CONTROL, PRIORITY_COMMAND, PRIORITY_BULK,
+                         MODE_LINE, MODE_BINARY, command_priority, list_serial_ports)  # noqa: F401 (기존 import 경로 호환)
+
 
 class SerialComm(QThread):
     """시리얼 통신 스레드"""
 
     # 시그널 정의
     received = pyqtSignal(str)  # 수신 데이터
+    sent = pyqtSignal(str)  # 전송한 명령 (\r\n 제외)
     error = pyqtSignal(str)  # 에러 메시지
     connected = pyqtSignal()  # 연결됨
     disconnected = pyqtSignal()  # 연결 해제됨
 
     def __init__(self):
         super().__init__()
-        self.ser = None
+        self.core = SerialPort()
         self.is_running = False
-        self.port = None
-        self.baudrate = 115200
+
+    @property
+    def ser(self):
+        """pyserial 객체 (연결 전에는 None)"""
+        return self.core.ser
+
+    @property
+    def port(self):
+        return self.core.port
+
+    @property
+    def baudrate(self):
+        return self.core.baudrate
 
     def set_port(self, port, baudrate=115200):
         """포트 설정"""
-        self.port = port
-        self.baudrate = baudrate
+        self.core.port = port
+        self.core.baudrate = baudrate
 
     def connect(self):
         """시리얼 포트 연결"""
         try:
-            if self.ser and self.ser.is_open:
-                self.ser.close()
-
-            self.ser = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=1
-            )
-
-            if self.ser.is_open:
+            self.core.open()
+
+            if self.core.is_open:
                 self.is_running = True
                 self.start()  # 수신 스레드 시작
                 self.connected.emit()
@@ -63,23 +66,27 @@ class SerialComm(QThread):
         """시리얼 포트 연결 해제"""
         self.is_running = False
 
-        if self.ser and self.ser.is_open:
+        if self.core.is_open:
             time.sleep(0.1)  # 스레드 종료 대기
-            self.ser.close()
+            self.core.close()
 
         self.disconnected.emit()
 
-    def send(self, data):
-        """데이터 전송"""
-        if not self.ser or not self.ser.is_open:
+    def send(self, data, priority=PRIORITY_COMMAND):
+        """
+        데이터 전송 (송신 큐에 추가 후 바로 반환, 실패는 error 시그널로 전달)
+
+        Args:
+            data: 전송할 데이터
+            priority: 송신 우선순위 (serial_core.PRIORITY_*)
+        """
+        if not self.core.is_open:
             self.error.emit("Serial port not connected")
             return False
 
         try:
-            if isinstance(data, str):
-                data = data.encode('utf-8')
-
-            self.ser.write(data)
+            self.core.enqueue(data, priority,
+                              on_error=lambda e: self.error.emit(f"Send error: {str(e)}"))
             return True
 
         except Exception as e:
@@ -87,20 +94,57 @@ class SerialComm(QThread):
             return False
 
     def send_command(self, command):
-        """명령 전송 (자동으로 \r\n 추가)"""
-        return self.send(command + '\r\n')
+        """명령 전송 (자동으로 \r\n 추가, STOP 등 제어 명령은 대기 중인 대량 데이터보다 먼저 전송)"""
+        success = self.send(command + '\r\n', priority=command_priority(command))
+        if success:
+            self.sent.emit(command)
+        return success
+
+    def send_commands_now(self, commands, timeout=1.0):
+        """
+        여러 명령을 한 번의 쓰기로 전송하고 완료까지 대기 (장면 실행용)
+
+        대기 중인 다른 송신 데이터보다 먼저 전송되며, 명령들은 연속된 바이트로 나간다.
+
+        Args:
+            commands: 명령 목록 (\r\n 제외)
+            timeout: 전송 완료 대기 시간 (초)
+
+        Returns:
+            bool: 전송 성공 여부 (실패는 error 시그널로도 전달)
+        """
+        if not self.core.is_open:
+            self.error.emit("Serial port not connected")
+            return False
+
+        try:
+            self.core.write(''.join(command + '\r\n' for command in commands),
+                            PRIORITY_CONTROL, timeout)
+        except Exception as e:
+            self.error.emit(f"Send error: {str(e)}")
+            return False
+
+        for command in commands:
+            self.sent.emit(command)
+        return True
+
+    def set_binary_mode(self, enabled):
+        """
+        바이너리 수신 모드 전환 (Y-MODEM 전송 시작/종료 시 호출)
+
+        바이너리 모드에서는 수신 스레드가 받은 바이트를 줄로 해석하지 않고
+        read_raw()로 전달 (ACK 등이 received 시그널로 새지 않음)
+        """
+        for line in self.core.set_mode(MODE_BINARY if enabled else MODE_LINE):
+            self.received.emit(line)
 
     def read_raw(self, size, timeout=1.0):
-        """원시 데이터 읽기 (Y-MODEM용)"""
-        if not self.ser or not self.ser.is_open:
+        """원시 데이터 읽기 (Y-MODEM용, 바이너리 모드에서는 수신 버퍼에서 읽음)"""
+        if not self.core.is_open:
             return None
 
         try:
-            old_timeout = self.ser.timeout
-            self.ser.timeout = timeout
-            data = self.ser.read(size)
-            self.ser.timeout = old_timeout
-            return data
+            return self.core.read(size, timeout)
 
         except Exception as e:
             self.error.emit(f"Read error: {str(e)}")
@@ -108,11 +152,11 @@ class SerialComm(QThread):
 
     def write_raw(self, data):
         """원시 데이터 쓰기 (Y-MODEM용)"""
-        if not self.ser or not self.ser.is_open:
+        if not self.core.is_open:
             return False
 
         try:
-            self.ser.write(data)
+            self.core.write(data, PRIORITY_BULK)
             return True
 
         except Exception as e:
@@ -121,34 +165,40 @@ class SerialComm(QThread):
 
     def run(self):
         """수신 스레드"""
-        rx_buffer = ""
-
         while self.is_running:
             try:
-                if self.ser and self.ser.is_open and self.ser.in_waiting > 0:
-                    # 데이터 수신
-                    data = self.ser.read(self.ser.in_waiting)
-                    rx_buffer += data.decode('utf-8', errors='replace')
-
-                    # 줄바꿈으로 분리
-                    while '\n' in rx_buffer:
-                        line, rx_buffer = rx_buffer.split('\n', 1)
-                        line = line.strip()
-                        if line:
-                            self.received.emit(line)
-
-                time.sleep(0.01)  # CPU 사용률 감소
+                if self.core.is_open:
+                    # 데이터가 오면 즉시, 없으면 RX_TIMEOUT 후 반환
+                    for line in self.core.receive():
+                        self.received.emit(line)
+                else:
+                    time.sleep(0.01)
 
             except Exception as e:
                 self.error.emit(f"Reception error: {str(e)}")
                 time.sleep(0.1)
 
-    def is_connected(self):
-        """연결 상태 확인"""
-        return self.ser and self.ser.is_open
+    def start_capture(self, path, **options):
+        """
+        송수신 데이터 캡처 시작 (session_capture 형식, 크기 기준 파일 교체)
+
+        Returns:
+            tuple: (성공 여부, 메시지)
+        """
+        try:
+            self.core.start_capture(path, **options)
+            return True, f"Capturing to {path}"
+        except OSError as e:
+            return False, f"Capture error: {str(e)}"
 
+    def stop_capture(self):
+        """캡처 종료"""
+        self.core.stop_capture()
 
-def list_serial_ports():
-    """사용 가능한 시리얼 포트 목록 반환"""
-    ports = serial.tools.list_ports.comports()
-    return [port.device for port in ports]
+    def writer_stats(self):
+        """송신 큐 통계"""
+        return self.core.writer_stats()
+
+    def is_connected(self):
+        """연결 상태 확인"""
+        return self.core.is_open
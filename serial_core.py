@@ -0,0 +1,520 @@
+"""
+serial_core.py
+
+시리얼 통신 코어 (Qt 비의존)
+- LineFramer: 바이트 스트림 → 줄 단위 분리
+- SerialWriter: 송신 전용 스레드 (우선순위 큐, 쓰기 병합, out_waiting 기반 흐름 제어)
+- RxBuffer: 바이너리 수신 버퍼 (수신 스레드 → Y-MODEM 등 다른 스레드)
+- SerialPort: 블로킹 API (수신 루프는 호출 측 스레드에서 실행)
+  수신은 한 스레드만 담당하고 모드에 따라 분배 (줄 모드: LineFramer, 바이너리 모드: RxBuffer)
+- asyncio API는 serial_async.AsyncSerialPort (GUI 시작 시 asyncio import 방지)
+"""
+
+import codecs
+import heapq
+import itertools
+import threading
+import time
+
+import serial
+import serial.tools.list_ports
+
+import instrumentation
+from session_capture import RX, TX, REPLAY_SCHEME, CaptureWriter, ReplaySerial
+
+
+DEFAULT_BAUDRATE = 115200
+
+# 명령 응답 대기 (PC_UART_PROTOCOL.md 7.3: 2초 타임아웃)
+RESPONSE_TIMEOUT = 2.0
+RESPONSE_IDLE = 0.3  # 첫 응답 이후 이 시간 동안 추가 줄이 없으면 응답 종료
+
+# 송신 우선순위 (작을수록 먼저 전송)
+PRIORITY_CONTROL = 0  # 즉시 처리할 제어 명령 (STOP 등) - 대량 전송 패킷 사이에 끼어듦
+PRIORITY_COMMAND = 1  # 일반 명령
+PRIORITY_BULK = 2  # 대량 데이터 (Y-MODEM 패킷)
+
+# PRIORITY_CONTROL로 보낼 명령
+CONTROL_COMMANDS = ('STOP',)
+
+# 수신 모드
+MODE_LINE = 'line'  # 텍스트 응답 (줄 단위)
+MODE_BINARY = 'binary'  # 파일 전송 (Y-MODEM)
+
+RX_TIMEOUT = 0.05  # 수신 스레드의 read 대기 시간 (초) - 데이터가 오면 즉시 반환
+
+
+def open_serial(port, baudrate=DEFAULT_BAUDRATE, timeout=1):
+    """
+    시리얼 포트 열기 (8N1)
+
+    'replay://<캡처 파일>?speed=N'은 기록된 세션을 재생하는 가상 포트 (session_capture)
+
+    Raises:
+        serial.SerialException: 포트 열기 실패
+    """
+    if port and port.startswith(REPLAY_SCHEME):
+        return ReplaySerial.from_url(port, timeout=timeout)
+
+    return serial.Serial(
+        port=port,
+        baudrate=baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=timeout
+    )
+
+
+def list_serial_ports():
+    """사용 가능한 시리얼 포트 목록 반환"""
+    ports = serial.tools.list_ports.comports()
+    return [port.device for port in ports]
+
+
+class LineFramer:
+    """
+    바이트 스트림을 줄 단위로 분리
+
+    여러 번에 나뉘어 들어온 UTF-8 문자도 깨지지 않도록 증분 디코더 사용
+    """
+
+    def __init__(self, encoding='utf-8'):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._buffer = ''
+
+    def feed(self, data):
+        """
+        수신 데이터 추가
+
+        Returns:
+            list: 완성된 줄 (앞뒤 공백 제거, 빈 줄 제외)
+        """
+        self._buffer += self._decoder.decode(data)
+        if '\n' not in self._buffer:
+            return []
+
+        *lines, self._buffer = self._buffer.split('\n')
+        return [line.strip() for line in lines if line.strip()]
+
+    def take_partial(self):
+        """
+        아직 줄바꿈이 오지 않은 데이터를 꺼내고 버퍼 비우기
+
+        Returns:
+            bytes: 미완성 줄 (디코더에 남은 바이트 포함)
+        """
+        pending = self._buffer.encode('utf-8') + self._decoder.getstate()[0]
+        self.reset()
+        return pending
+
+    def reset(self):
+        """버퍼 비우기"""
+        self._decoder.reset()
+        self._buffer = ''
+
+
+class RxBuffer:
+    """
+    바이너리 수신 버퍼
+
+    수신 스레드가 feed()로 추가하고, 다른 스레드가 read()로 필요한 만큼 대기 후 꺼냄
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self.bytes_received = 0
+
+    def feed(self, data):
+        """수신 데이터 추가"""
+        with self._cond:
+            self._buffer += data
+            self.bytes_received += len(data)
+            self._cond.notify_all()
+
+    def read(self, size, timeout=1.0):
+        """
+        최대 size 바이트 읽기
+
+        size 바이트가 모이거나 timeout이 지나면 반환 (pyserial read와 같은 의미)
+
+        Returns:
+            bytes: 읽은 데이터 (타임아웃 시 size보다 짧거나 빈 값)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._buffer) >= size, timeout)
+            data = bytes(memoryview(self._buffer)[:size])
+            del self._buffer[:len(data)]
+            return data
+
+    def take_all(self):
+        """남은 데이터 모두 꺼내기"""
+        with self._cond:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            return data
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+def command_priority(command):
+    """명령 종류에 따른 송신 우선순위"""
+    name = command.split(' ', 1)[0].upper()
+    return PRIORITY_CONTROL if name in CONTROL_COMMANDS else PRIORITY_COMMAND
+
+
+class WriteRequest:
+    """송신 요청 (완료 대기 가능)"""
+
+    __slots__ = ('data', 'priority', 'on_error', 'error', '_done')
+
+    def __init__(self, data, priority, on_error=None):
+        self.data = data
+        self.priority = priority
+        self.on_error = on_error  # 실패 시 송신 스레드에서 호출 f(exception)
+        self.error = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        """
+        전송 완료 대기
+
+        Returns:
+            bool: 오류 없이 전송 완료
+        """
+        return self._done.wait(timeout) and self.error is None
+
+    def _finish(self, error=None):
+        self.error = error
+        self._done.set()
+        if error is not None and self.on_error is not None:
+            self.on_error(error)
+
+
+class SerialWriter:
+    """
+    송신 전용 스레드
+
+    - 우선순위 큐: 제어 명령이 대기 중인 대량 데이터보다 먼저 전송
+    - 쓰기 병합: 대기 중인 작은 요청을 write() 한 번으로 전송
+    - 흐름 제어: 드라이버 송신 버퍼(out_waiting)가 high_water를 넘으면 비워질 때까지 대기,
+      큐에 쌓인 대량 데이터가 max_queued_bytes를 넘으면 생산자(submit)가 대기
+    """
+
+    def __init__(self, ser, coalesce_bytes=4096, high_water=4096, max_queued_bytes=64 * 1024):
+        self.ser = ser
+        self.coalesce_bytes = coalesce_bytes
+        self.high_water = high_water
+        self.max_queued_bytes = max_queued_bytes
+
+        self._heap = []  # (우선순위, 순번, 요청)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._queued_bytes = 0
+        self._running = False
+        self._thread = None
+        self.capture = None  # session_capture.CaptureWriter (송신 데이터 기록)
+
+        # 통계
+        self.bytes_written = 0
+        self.write_calls = 0
+        self.requests_written = 0
+        self.max_depth = 0
+        self.drain_waits = 0  # out_waiting 때문에 대기한 횟수
+        self.drain_wait_seconds = 0.0
+        self.producer_waits = 0  # 큐가 가득 차 submit이 대기한 횟수
+
+    def start(self):
+        """송신 스레드 시작"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='SerialWriter', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """송신 스레드 중지 (대기 중인 요청은 실패 처리)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+        with self._cond:
+            pending = [item[2] for item in self._heap]
+            self._heap.clear()
+            self._queued_bytes = 0
+        for request in pending:
+            request._finish(ConnectionError("Serial port closed"))
+
+    def submit(self, data, priority=PRIORITY_COMMAND, on_error=None):
+        """
+        송신 요청 추가
+
+        Args:
+            data: 전송할 데이터 (str은 UTF-8로 인코딩)
+            priority: PRIORITY_CONTROL / PRIORITY_COMMAND / PRIORITY_BULK
+            on_error: 실패 시 호출 f(exception) (송신 스레드에서 호출)
+
+        Returns:
+            WriteRequest
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        request = WriteRequest(bytes(data), priority, on_error)
+
+        with self._cond:
+            # 대량 데이터는 큐가 가득 차면 대기 (명령은 대기 없이 추가)
+            if priority >= PRIORITY_BULK and self._queued_bytes > self.max_queued_bytes:
+                self.producer_waits += 1
+                while self._running and self._queued_bytes > self.max_queued_bytes:
+                    self._cond.wait()
+
+            if not self._running:
+                request._finish(ConnectionError("Serial port closed"))
+                return request
+
+            heapq.heappush(self._heap, (priority, next(self._seq), request))
+            self._queued_bytes += len(request.data)
+            self.max_depth = max(self.max_depth, len(self._heap))
+            self._cond.notify_all()
+
+        return request
+
+    def stats(self):
+        """큐 / 송신 통계"""
+        with self._cond:
+            depth = {PRIORITY_CONTROL: 0, PRIORITY_COMMAND: 0, PRIORITY_BULK: 0}
+            for priority, _, _ in self._heap:
+                depth[priority] = depth.get(priority, 0) + 1
+
+            return {
+                'queue_depth': len(self._heap),
+                'queued_bytes': self._queued_bytes,
+                'depth_control': depth[PRIORITY_CONTROL],
+                'depth_command': depth[PRIORITY_COMMAND],
+                'depth_bulk': depth[PRIORITY_BULK],
+                'max_depth': self.max_depth,
+                'bytes_written': self.bytes_written,
+                'write_calls': self.write_calls,
+                'requests_written': self.requests_written,
+                'drain_waits': self.drain_waits,
+                'drain_wait_seconds': self.drain_wait_seconds,
+                'producer_waits': self.producer_waits,
+            }
+
+    def _run(self):
+        """송신 루프"""
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                # 우선순위 순서대로 coalesce_bytes까지 병합
+                batch = [heapq.heappop(self._heap)[2]]
+                size = len(batch[0].data)
+                while self._heap and size + len(self._heap[0][2].data) <= self.coalesce_bytes:
+                    request = heapq.heappop(self._heap)[2]
+                    batch.append(request)
+                    size += len(request.data)
+
+                self._queued_bytes -= size
+                self._cond.notify_all()  # 대기 중인 생산자 깨우기
+
+            self._wait_for_drain()
+
+            error = None
+            data = batch[0].data if len(batch) == 1 else b''.join(r.data for r in batch)
+            try:
+                with instrumentation.timer('serial_write_seconds'):
+                    self.ser.write(data)
+            except Exception as e:
+                error = e
+
+            capture = self.capture
+            if capture is not None and error is None:
+                capture.record(TX, data)
+
+            self.write_calls += 1
+            self.requests_written += len(batch)
+            if error is None:
+                self.bytes_written += size
+                instrumentation.count('serial_tx_bytes_total', size)
+
+            for request in batch:
+                request._finish(error)
+
+    def _wait_for_drain(self):
+        """드라이버 송신 버퍼가 high_water 이하가 될 때까지 대기"""
+        try:
+            if self.ser.out_waiting <= self.high_water:
+                return
+        except Exception:
+            return  # out_waiting을 지원하지 않는 포트
+
+        start = time.monotonic()
+        self.drain_waits += 1
+        try:
+            while self._running and self.ser.out_waiting > self.high_water // 2:
+                time.sleep(0.002)
+        except Exception:
+            pass
+        waited = time.monotonic() - start
+        self.drain_wait_seconds += waited
+        instrumentation.observe('serial_drain_wait_seconds', waited)
+
+
+class SerialPort:
+    """
+    블로킹 시리얼 포트
+
+    입출력 오류는 예외로 전달 (메시지 표시는 호출 측에서 처리)
+    """
+
+    def __init__(self, port=None, baudrate=DEFAULT_BAUDRATE):
+        self.port = port
+        self.baudrate = baudrate
+        self.ser = None
+        self.writer = None
+        self.framer = LineFramer()
+        self.rx = RxBuffer()
+        self.mode = MODE_LINE
+        self._rx_lock = threading.Lock()  # 수신 분배와 모드 전환 사이의 경합 방지
+        self.capture = None  # session_capture.CaptureWriter
+
+    def open(self):
+        """포트 열기 (송신 스레드 시작)"""
+        self.close()
+        self.ser = open_serial(self.port, self.baudrate, timeout=RX_TIMEOUT)
+        self.framer.reset()
+        self.rx.take_all()
+        self.mode = MODE_LINE
+        self.writer = SerialWriter(self.ser)
+        self.writer.capture = self.capture
+        self.writer.start()
+
+    def close(self):
+        """포트 닫기 (대기 중인 송신 요청은 실패 처리)"""
+        if self.writer is not None:
+            self.writer.stop()
+        if self.ser and self.ser.is_open:
+            self.ser.close()
+
+    def start_capture(self, path, **options):
+        """
+        송수신 데이터 캡처 시작 (session_capture.CaptureWriter, 연결/해제와 무관하게 유지)
+
+        Args:
+            path: 캡처 파일 경로
+            options: CaptureWriter 옵션 (max_bytes, backups)
+        """
+        self.stop_capture()
+        self.capture = CaptureWriter(path, port=self.port or '', baudrate=self.baudrate, **options)
+        if self.writer is not None:
+            self.writer.capture = self.capture
+        return self.capture
+
+    def stop_capture(self):
+        """캡처 종료 (남은 데이터 기록)"""
+        capture, self.capture = self.capture, None
+        if self.writer is not None:
+            self.writer.capture = None
+        if capture is not None:
+            capture.close()
+
+    @property
+    def is_open(self):
+        """연결 상태"""
+        return bool(self.ser and self.ser.is_open)
+
+    def enqueue(self, data, priority=PRIORITY_COMMAND, on_error=None):
+        """
+        송신 큐에 추가 (블로킹 없음)
+
+        Returns:
+            WriteRequest
+        """
+        return self.writer.submit(data, priority, on_error)
+
+    def write(self, data, priority=PRIORITY_BULK, timeout=None):
+        """
+        데이터 쓰기 (송신 완료까지 대기)
+
+        Raises:
+            Exception: 송신 실패 또는 시간 초과
+        """
+        request = self.writer.submit(data, priority)
+        if not request.wait(timeout):
+            raise request.error or TimeoutError("Write timed out")
+
+    def writer_stats(self):
+        """송신 큐 통계 (연결 전에는 빈 dict)"""
+        return self.writer.stats() if self.writer is not None else {}
+
+    def set_mode(self, mode):
+        """
+        수신 모드 전환
+
+        - 바이너리 모드로: 줄바꿈 전까지 모인 데이터(예: 수신측의 첫 'C')를 바이너리 버퍼로 이동
+        - 줄 모드로: 바이너리 버퍼에 남은 데이터(예: 전송 완료 응답)를 줄 단위로 분리
+
+        Returns:
+            list: 줄 모드로 전환하면서 완성된 줄
+        """
+        with self._rx_lock:
+            if mode == self.mode:
+                return []
+            self.mode = mode
+
+            if mode == MODE_BINARY:
+                self.rx.take_all()
+                pending = self.framer.take_partial()
+                if pending:
+                    self.rx.feed(pending)
+                return []
+
+            return self.framer.feed(self.rx.take_all())
+
+    def read(self, size, timeout=1.0):
+        """
+        최대 size 바이트 읽기 (timeout 초까지 대기)
+
+        바이너리 모드에서는 수신 스레드가 채운 버퍼에서 읽음 (포트를 직접 읽지 않음)
+        """
+        if self.mode == MODE_BINARY:
+            return self.rx.read(size, timeout)
+
+        old_timeout = self.ser.timeout
+        self.ser.timeout = timeout
+        try:
+            data = self.ser.read(size)
+        finally:
+            self.ser.timeout = old_timeout
+
+        capture = self.capture
+        if capture is not None and data:
+            capture.record(RX, data)
+        return data
+
+    def receive(self):
+        """
+        수신 처리 (수신 스레드에서 반복 호출, 데이터가 없으면 최대 RX_TIMEOUT 대기)
+
+        Returns:
+            list: 줄 모드에서 완성된 줄 (바이너리 모드에서는 항상 빈 목록)
+        """
+        data = self.ser.read(max(self.ser.in_waiting, 1))
+        if not data:
+            return []
+        instrumentation.count('serial_rx_bytes_total', len(data))
+        capture = self.capture
+        if capture is not None:
+            capture.record(RX, data)
+
+        with self._rx_lock:
+            if self.mode == MODE_BINARY:
+                self.rx.feed(data)
+                return []
+            return self.framer.feed(data)
@@ -0,0 +1,351 @@
+"""
+session_capture.py
+
+시리얼 세션 캡처 / 재생 (Qt 비의존)
+- CaptureWriter: 송수신 데이터를 단조 시각과 함께 이진 파일로 기록
+  (호출 측은 큐에 추가만 하고 파일 쓰기는 별도 스레드, 크기 기준 파일 교체)
+- read_capture(): 캡처 파일(교체된 이전 파일 포함)을 시간 순서로 읽기
+- ReplaySerial: 캡처의 수신 데이터를 시리얼 포트처럼 제공
+  (open_serial('replay://<파일>?speed=N')으로 열면 SerialComm 수신 경로를 그대로 통과)
+
+파일 형식:
+    MAGIC (8 bytes) + 헤더 길이 (uint32) + 헤더 JSON
+    레코드 반복: 방향 (uint8, RX=0 / TX=1) + 시각 (uint64, 캡처 시작 후 ns) + 길이 (uint32) + 데이터
+"""
+
+import collections
+import json
+import os
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+MAGIC = b'AMUXCAP1'
+CAPTURE_VERSION = 1
+
+RX = 0
+TX = 1
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024  # 파일 하나의 최대 크기
+DEFAULT_BACKUPS = 4  # 보관할 이전 파일 수 (<path>.1 ~ <path>.N)
+FLUSH_INTERVAL = 0.2  # 기록 스레드가 큐를 비우는 주기 (초)
+
+REPLAY_SCHEME = 'replay://'
+
+CAPTURE_ENV = 'AUDIO_MUX_CAPTURE'  # GUI: 이 경로로 세션 캡처
+REPLAY_ENV = 'AUDIO_MUX_REPLAY'  # GUI: 이 캡처 파일을 재생하는 가상 포트를 포트 목록에 추가
+
+_HEADER_LENGTH = struct.Struct('<I')
+_RECORD = struct.Struct('<BQI')  # 방향, 시각 (ns), 길이
+
+
+def capture_files(path):
+    """
+    캡처 파일 목록 (오래된 것부터)
+
+    Returns:
+        list: [<path>.N, ..., <path>.1, <path>] 중 존재하는 파일
+    """
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.append(f"{path}.{index}")
+        index += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_header(f):
+    """
+    파일 헤더 읽기
+
+    Returns:
+        dict: {'version', 'port', 'baudrate', 'started', 'segment'}
+
+    Raises:
+        ValueError: 캡처 파일이 아님
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a capture file")
+    (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+    return json.loads(f.read(length).decode('utf-8'))
+
+
+def read_capture(path):
+    """
+    캡처 레코드 읽기 (제너레이터, 교체된 이전 파일부터 순서대로)
+
+    마지막 레코드가 잘린 경우(기록 중 종료)는 그 앞까지만 반환
+
+    Yields:
+        tuple: (방향, 캡처 시작 후 초, 데이터)
+    """
+    for file_path in capture_files(path):
+        with open(file_path, 'rb') as f:
+            read_header(f)
+            while True:
+                head = f.read(_RECORD.size)
+                if len(head) < _RECORD.size:
+                    break
+                direction, t_ns, length = _RECORD.unpack(head)
+                data = f.read(length)
+                if len(data) < length:
+                    break
+                yield direction, t_ns / 1e9, data
+
+
+def summarize(path):
+    """
+    캡처 요약
+
+    Returns:
+        dict: {'files', 'header', 'rx_chunks', 'rx_bytes', 'tx_chunks', 'tx_bytes', 'seconds'}
+    """
+    files = capture_files(path)
+    header = None
+    if files:
+        with open(files[0], 'rb') as f:
+            header = read_header(f)
+
+    counts = {RX: [0, 0], TX: [0, 0]}
+    last = 0.0
+    for direction, seconds, data in read_capture(path):
+        counts.setdefault(direction, [0, 0])
+        counts[direction][0] += 1
+        counts[direction][1] += len(data)
+        last = seconds
+
+    return {
+        'files': files,
+        'header': header,
+        'rx_chunks': counts[RX][0],
+        'rx_bytes': counts[RX][1],
+        'tx_chunks': counts[TX][0],
+        'tx_bytes': counts[TX][1],
+        'seconds': round(last, 3),
+    }
+
+
+class CaptureWriter:
+    """
+    세션 캡처 기록
+
+    record()는 큐에 추가만 하므로 수신/송신 스레드에서 바로 호출해도 된다.
+    """
+
+    def __init__(self, path, port='', baudrate=0, max_bytes=DEFAULT_MAX_BYTES,
+                 backups=DEFAULT_BACKUPS):
+        """
+        Args:
+            path: 캡처 파일 경로 (기존 파일은 <path>.1로 교체)
+            port: 헤더에 기록할 포트 이름
+            baudrate: 헤더에 기록할 보드레이트
+            max_bytes: 파일 하나의 최대 크기 (넘으면 교체)
+            backups: 보관할 이전 파일 수
+        """
+        self.path = path
+        self.port = port
+        self.baudrate = baudrate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.records = 0
+        self.bytes = 0
+
+        self._queue = collections.deque()
+        self._wake = threading.Event()
+        self._running = True
+        self._origin_ns = time.monotonic_ns()
+        self._started = time.time()
+        self._segment = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._open_segment()
+
+        self._thread = threading.Thread(target=self._run, name='capture-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, direction, data):
+        """송수신 데이터 기록 요청 (블로킹 없음)"""
+        self._queue.append((direction, time.monotonic_ns() - self._origin_ns, bytes(data)))
+
+    def flush(self):
+        """대기 중인 레코드를 바로 기록하도록 요청"""
+        self._wake.set()
+
+    def close(self):
+        """남은 레코드를 기록하고 종료"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        """기록 루프"""
+        while self._running:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        """큐의 레코드를 파일에 쓰기"""
+        if not self._queue:
+            return
+        while self._queue:
+            direction, t_ns, data = self._queue.popleft()
+            self._file.write(_RECORD.pack(direction, t_ns, len(data)))
+            self._file.write(data)
+            self.records += 1
+            self.bytes += len(data)
+            if self._file.tell() >= self.max_bytes:
+                self._open_segment()
+        self._file.flush()
+
+    def _open_segment(self):
+        """기존 파일을 <path>.1, <path>.2 ...로 밀어내고 새 파일 시작"""
+        if self._file is not None:
+            self._file.close()
+
+        if os.path.exists(self.path):
+            if self.backups > 0:
+                for index in range(self.backups - 1, 0, -1):
+                    src = f"{self.path}.{index}"
+                    if os.path.exists(src):
+                        os.replace(src, f"{self.path}.{index + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+
+        header = json.dumps({
+            'version': CAPTURE_VERSION,
+            'port': self.port,
+            'baudrate': self.baudrate,
+            'started': self._started,
+            'segment': self._segment,
+        }).encode('utf-8')
+        self._segment += 1
+
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+
+
+def replay_url(path, speed=1.0):
+    """캡처 파일 재생 포트 이름 (open_serial()에 전달)"""
+    return f"{REPLAY_SCHEME}{quote(os.path.abspath(path))}?speed={speed:g}"
+
+
+def parse_replay_url(url):
+    """
+    'replay://<파일>?speed=N' 해석
+
+    speed: 1 실시간 (기본), 2 두 배속, 0 최대 속도
+
+    Returns:
+        tuple: (파일 경로, 속도) - 재생 URL이 아니면 None
+    """
+    if not url.startswith(REPLAY_SCHEME):
+        return None
+    parts = urlsplit(url)
+    path = unquote(parts.netloc + parts.path)
+    speed = float(parse_qs(parts.query).get('speed', ['1'])[0])
+    return path, speed
+
+
+class ReplaySerial:
+    """
+    캡처의 수신(RX) 데이터를 시리얼 포트처럼 제공 (pyserial 최소 인터페이스)
+
+    기록된 시각 간격을 speed 배로 재현하고(speed 0은 대기 없음), 쓰기는 버림
+    """
+
+    def __init__(self, path, speed=1.0, timeout=None):
+        if not capture_files(path):
+            raise FileNotFoundError(f"Capture not found: {path}")
+        self.port = f"{REPLAY_SCHEME}{path}"
+        self.path = path
+        self.speed = speed
+        self.timeout = timeout
+        self.is_open = True
+        self.out_waiting = 0
+        self.finished = False  # 모든 데이터를 읽어 감
+
+        self._records = ((t, data) for direction, t, data in read_capture(path)
+                         if direction == RX)
+        self._next = next(self._records, None)
+        self._buffer = bytearray()
+        self._start = time.monotonic()
+        self._offset = self._next[0] if self._next else 0.0  # 첫 수신까지의 공백 생략
+
+    @classmethod
+    def from_url(cls, url, timeout=None):
+        path, speed = parse_replay_url(url)
+        return cls(path, speed, timeout)
+
+    def _due_in(self):
+        """다음 레코드까지 남은 시간 (초, 없으면 None)"""
+        if self._next is None:
+            return None
+        if self.speed <= 0:
+            return 0.0
+        due = self._start + (self._next[0] - self._offset) / self.speed
+        return due - time.monotonic()
+
+    def _pump(self):
+        """시각이 된 레코드를 버퍼로 이동"""
+        while self._next is not None and self._due_in() <= 0:
+            self._buffer += self._next[1]
+            self._next = next(self._records, None)
+            if self.speed <= 0:
+                break  # 최대 속도에서도 한 번에 한 레코드씩 (수신 청크 크기 유지)
+        if self._next is None and not self._buffer:
+            self.finished = True
+
+    @property
+    def in_waiting(self):
+        self._pump()
+        return len(self._buffer)
+
+    def read(self, size=1):
+        """최대 size 바이트 읽기 (pyserial과 같이 size 바이트 또는 timeout까지 대기)"""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            self._pump()
+            if len(self._buffer) >= size or (self._buffer and self._next is None):
+                break
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+
+            wait = self._due_in()
+            if wait is None:
+                wait = 0.05 if deadline is None else deadline - now
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+            if wait > 0:
+                time.sleep(wait)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:len(data)]
+        if self._next is None and not self._buffer:
+            self.finished = True
+        return data
+
+    def write(self, data):
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._buffer.clear()
+
+    def close(self):
+        self.is_open = False
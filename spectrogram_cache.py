@@ -0,0 +1,159 @@
+"""
+spectrogram_cache.py
+
+미리 듣기 파일의 스펙트로그램/파형 사전 계산 및 디스크 캐시
+- 대역 에너지 행렬: 20ms 프레임당 대역별 uint8
+- 파형 개요: 구간별 최소/최대값
+"""
+
+import io
+
+import numpy as np
+
+from audio_converter import AudioConverter
+from cache_store import LruFileCache, default_cache_dir, file_digest, make_key
+from spectrum_analyzer import waveform_overview
+
+
+# 계산 방법이 바뀌면 올려서 이전 캐시 무효화
+SPECTROGRAM_VERSION = 1
+
+FRAME_MS = 20  # 프레임 간격
+WAVEFORM_COLUMNS = 2048  # 파형 개요 구간 수
+
+_cache = None
+
+
+class SpectrogramData:
+    """사전 계산된 스펙트로그램 + 파형 개요"""
+
+    def __init__(self, bands, waveform, sample_rate, frame_ms=FRAME_MS):
+        """
+        Args:
+            bands: (프레임 수, 대역 수) uint8 레벨
+            waveform: (구간 수, 2) int16 최소/최대
+            sample_rate: 분석 샘플레이트 (Hz)
+            frame_ms: 프레임 간격 (ms)
+        """
+        self.bands = bands
+        self.waveform = waveform
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+
+        # uint8 → 0.0~1.0 변환 테이블 (조회 시 나눗셈 없음)
+        self._level_table = np.arange(256, dtype=np.float32) / 255.0
+
+    @property
+    def duration_ms(self):
+        """길이 (ms)"""
+        return len(self.bands) * self.frame_ms
+
+    def frame_index(self, position_ms):
+        """재생 위치(ms) → 프레임 인덱스"""
+        index = int(position_ms) // self.frame_ms
+        return min(max(index, 0), len(self.bands) - 1)
+
+    def levels_at(self, position_ms):
+        """
+        재생 위치의 대역별 레벨 (O(1) 조회)
+
+        Returns:
+            np.ndarray: 대역별 레벨 (0.0 ~ 1.0)
+        """
+        return self._level_table[self.bands[self.frame_index(position_ms)]]
+
+    def to_bytes(self):
+        """npz 직렬화"""
+        buf = io.BytesIO()
+        np.savez(buf, bands=self.bands, waveform=self.waveform,
+                 meta=np.array([self.sample_rate, self.frame_ms], dtype=np.int64))
+        return buf.getvalue()
+
+    @staticmethod
+    def from_file(path):
+        """npz 파일에서 읽기"""
+        with np.load(path, allow_pickle=False) as data:
+            sample_rate, frame_ms = (int(v) for v in data['meta'])
+            return SpectrogramData(data['bands'], data['waveform'], sample_rate, frame_ms)
+
+
+def get_cache():
+    """스펙트로그램 캐시 반환"""
+    global _cache
+    if _cache is None:
+        _cache = LruFileCache(default_cache_dir('spectrogram'),
+                              max_bytes=256 * 1024 * 1024,
+                              suffix='.npz')
+    return _cache
+
+
+def build_spectrogram(samples, analyzer):
+    """
+    PCM에서 스펙트로그램 + 파형 개요 계산
+
+    Args:
+        samples: int16 Mono PCM 배열
+        analyzer: SpectrumAnalyzer (샘플레이트/대역 수 기준)
+
+    Returns:
+        SpectrogramData
+    """
+    hop = analyzer.sample_rate * FRAME_MS // 1000
+    bands = analyzer.analyze_frames(samples, hop)
+    waveform = waveform_overview(samples, WAVEFORM_COLUMNS)
+    return SpectrogramData(bands, waveform, analyzer.sample_rate, FRAME_MS)
+
+
+def cache_key(file_path, analyzer):
+    """파일 내용 해시 + 분석 설정으로 캐시 키 생성"""
+    return make_key(file_digest(file_path), 'spectrogram',
+                    analyzer.sample_rate, analyzer.num_bands, analyzer.fft_size,
+                    FRAME_MS, WAVEFORM_COLUMNS, SPECTROGRAM_VERSION)
+
+
+def load_cached(file_path, analyzer):
+    """
+    캐시된 스펙트로그램 읽기
+
+    Returns:
+        SpectrogramData: 캐시에 없으면 None
+    """
+    try:
+        path = get_cache().get(cache_key(file_path, analyzer))
+        return SpectrogramData.from_file(path) if path else None
+    except (OSError, ValueError, KeyError):
+        return None  # 손상된 캐시 파일은 다시 계산
+
+
+def load_or_build(file_path, analyzer, on_samples=None, samples=None):
+    """
+    캐시에서 읽거나 새로 계산 후 캐시에 저장
+
+    Args:
+        file_path: 오디오 파일 경로
+        analyzer: SpectrumAnalyzer
+        on_samples: 디코딩 직후 호출되는 콜백 f(samples) - 계산 중에도 실시간 분석 가능
+        samples: 이미 디코딩된 int16 Mono PCM (analyzer 샘플레이트, 있으면 디코딩 생략)
+
+    Returns:
+        SpectrogramData: 실패 시 None
+    """
+    data = load_cached(file_path, analyzer)
+    if data is not None:
+        return data
+
+    if samples is None:
+        pcm = AudioConverter.decode_pcm(file_path, sample_rate=analyzer.sample_rate)
+        if not pcm:
+            return None
+        samples = np.frombuffer(pcm, dtype=np.int16)
+
+    if on_samples is not None:
+        on_samples(samples)
+
+    data = build_spectrogram(samples, analyzer)
+    try:
+        get_cache().put_bytes(cache_key(file_path, analyzer), data.to_bytes())
+    except OSError:
+        pass  # 캐시 저장 실패는 표시에 영향 없음
+    return data
@@ -0,0 +1,153 @@
+"""
+spectrum_analyzer.py
+
+오디오 스펙트럼 분석 모듈
+윈도우 적용 rFFT → 로그 간격 주파수 대역별 에너지 (0.0 ~ 1.0)
+"""
+
+import numpy as np
+
+
+class SpectrumAnalyzer:
+    """로그 간격 대역 스펙트럼 분석기"""
+
+    def __init__(self, sample_rate, num_bands=20, fft_size=1024,
+                 f_min=50.0, f_max=None, db_floor=-70.0):
+        """
+        Args:
+            sample_rate: 샘플레이트 (Hz)
+            num_bands: 대역(막대) 개수
+            fft_size: FFT 크기 (샘플)
+            f_min: 최저 주파수 (Hz)
+            f_max: 최고 주파수 (Hz, None이면 나이퀴스트의 90%)
+            db_floor: 0.0으로 표시할 레벨 (dBFS)
+        """
+        self.sample_rate = sample_rate
+        self.num_bands = num_bands
+        self.fft_size = fft_size
+        self.db_floor = db_floor
+
+        # 윈도우 및 정규화 계수 (풀스케일 사인파 = 0dB)
+        self.window = np.hanning(fft_size).astype(np.float32)
+        self._power_ref = (self.window.sum() / 2.0) ** 2
+
+        # 로그 간격 대역 경계 → FFT bin 인덱스
+        nyquist = sample_rate / 2.0
+        f_max = f_max or nyquist * 0.9
+        freqs = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+        edges = np.geomspace(f_min, f_max, num_bands + 1)
+        bins = np.searchsorted(freqs, edges)
+
+        # 저역은 bin이 부족하므로 대역마다 최소 1개 bin 보장
+        for i in range(1, len(bins)):
+            if bins[i] <= bins[i - 1]:
+                bins[i] = bins[i - 1] + 1
+        bins = np.minimum(bins, len(freqs) - 1)
+
+        self._band_starts = bins[:-1]
+        self._band_stop = int(bins[-1])
+
+        # 미리 할당된 작업 버퍼
+        self._frame = np.zeros(fft_size, dtype=np.float32)
+
+    def analyze(self, frame):
+        """
+        한 프레임의 대역별 레벨 계산
+
+        Args:
+            frame: 샘플 배열 (float, -1.0 ~ 1.0), 길이 fft_size 이하
+
+        Returns:
+            np.ndarray: 대역별 레벨 (0.0 ~ 1.0), 길이 num_bands
+        """
+        n = min(len(frame), self.fft_size)
+        buf = self._frame
+        buf[:n] = frame[:n]
+        buf[n:] = 0.0
+        buf *= self.window
+
+        spectrum = np.fft.rfft(buf)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+
+        band_power = np.add.reduceat(power[:self._band_stop], self._band_starts)
+        db = 10.0 * np.log10(band_power / self._power_ref + 1e-12)
+
+        return np.clip((db - self.db_floor) / -self.db_floor, 0.0, 1.0)
+
+    def analyze_at(self, samples, index):
+        """
+        int16 PCM에서 index 위치까지의 한 프레임 분석
+
+        Args:
+            samples: int16 Mono PCM 배열
+            index: 현재 재생 위치 (샘플)
+
+        Returns:
+            np.ndarray: 대역별 레벨 (0.0 ~ 1.0)
+        """
+        end = min(max(int(index), 0), len(samples))
+        start = max(end - self.fft_size, 0)
+        frame = samples[start:end] * (1.0 / 32768.0)
+
+        # 파일 시작 부분은 앞쪽을 0으로 채움 (analyze_frames와 같은 정렬)
+        if len(frame) < self.fft_size:
+            frame = np.concatenate((np.zeros(self.fft_size - len(frame)), frame))
+        return self.analyze(frame)
+
+    def analyze_frames(self, samples, hop, chunk_frames=512):
+        """
+        PCM 전체를 hop 간격 프레임으로 나누어 대역별 레벨 계산 (벡터화)
+
+        Args:
+            samples: int16 Mono PCM 배열
+            hop: 프레임 간격 (샘플)
+            chunk_frames: 한 번에 처리할 프레임 수 (메모리 제한)
+
+        Returns:
+            np.ndarray: (프레임 수, num_bands) uint8 레벨 (0 ~ 255)
+        """
+        # 프레임 i는 (i+1)*hop 샘플까지의 구간 (analyze_at과 같은 기준)
+        num_frames = max(len(samples) // hop, 1)
+        padded = np.zeros(self.fft_size + num_frames * hop, dtype=np.int16)
+        padded[self.fft_size:self.fft_size + len(samples)] = samples[:num_frames * hop]
+
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.fft_size)
+        windows = windows[hop::hop][:num_frames]
+
+        scale = self.window * (1.0 / 32768.0)
+        result = np.empty((num_frames, self.num_bands), dtype=np.uint8)
+
+        for start in range(0, num_frames, chunk_frames):
+            block = windows[start:start + chunk_frames] * scale
+            spectrum = np.fft.rfft(block, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+
+            band_power = np.add.reduceat(power[:, :self._band_stop], self._band_starts, axis=1)
+            db = 10.0 * np.log10(band_power / self._power_ref + 1e-12)
+            levels = np.clip((db - self.db_floor) / -self.db_floor, 0.0, 1.0)
+            result[start:start + len(block)] = np.round(levels * 255)
+
+        return result
+
+
+def waveform_overview(samples, columns=2048):
+    """
+    파형 개요 (구간별 최소/최대값)
+
+    Args:
+        samples: int16 Mono PCM 배열
+        columns: 구간 개수
+
+    Returns:
+        np.ndarray: (columns, 2) int16 [최소, 최대]
+    """
+    if len(samples) == 0:
+        return np.zeros((0, 2), dtype=np.int16)
+
+    columns = min(columns, len(samples))
+    starts = (np.arange(columns) * len(samples)) // columns
+
+    overview = np.empty((columns, 2), dtype=np.int16)
+    overview[:, 0] = np.minimum.reduceat(samples, starts)
+    overview[:, 1] = np.maximum.reduceat(samples, starts)
+    return overview
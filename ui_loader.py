@@ -0,0 +1,116 @@
+"""
+ui_loader.py
+
+.ui 파일 로더 (미리 컴파일된 Python 모듈 캐시 사용)
+- 처음 실행 시 uic.compileUi로 .ui → Python 변환 후 캐시 디렉토리에 저장
+- .ui 파일(크기, 수정 시각) 또는 PyQt5 버전이 바뀌면 다시 컴파일
+- 이후 실행은 XML 파싱 없이 컴파일된 모듈(바이트코드 캐시 포함)만 import
+
+미리 컴파일 (배포/설치 시):
+    python ui_loader.py mainwindow.ui
+"""
+
+import importlib.util
+import io
+import os
+import sys
+
+from PyQt5.QtCore import PYQT_VERSION_STR
+
+from cache_store import default_cache_dir
+
+
+# 컴파일 방식이 바뀌면 올려서 이전 캐시 무효화
+UI_CACHE_VERSION = 1
+
+
+def compiled_path(ui_path):
+    """컴파일된 모듈 경로"""
+    name = os.path.splitext(os.path.basename(ui_path))[0]
+    return os.path.join(default_cache_dir('ui'), f"{name}_ui.py")
+
+
+def _stamp(ui_path):
+    """캐시 유효성 확인용 헤더 (원본 크기/수정 시각 + PyQt5 버전)"""
+    st = os.stat(ui_path)
+    return (f"# ui-cache: v{UI_CACHE_VERSION} pyqt={PYQT_VERSION_STR} "
+            f"source={os.path.abspath(ui_path)} size={st.st_size} mtime={st.st_mtime_ns}\n")
+
+
+def is_stale(ui_path, py_path=None):
+    """컴파일된 모듈이 없거나 원본보다 오래되었는지 확인"""
+    py_path = py_path or compiled_path(ui_path)
+    try:
+        with open(py_path, 'r', encoding='utf-8') as f:
+            return f.readline() != _stamp(ui_path)
+    except OSError:
+        return True
+
+
+def compile_ui(ui_path, py_path=None):
+    """
+    .ui 파일을 Python 모듈로 컴파일
+
+    Returns:
+        str: 컴파일된 모듈 경로
+    """
+    from PyQt5 import uic
+
+    py_path = py_path or compiled_path(ui_path)
+    os.makedirs(os.path.dirname(py_path), exist_ok=True)
+
+    buf = io.StringIO()
+    buf.write(_stamp(ui_path))
+    uic.compileUi(ui_path, buf)
+
+    tmp_path = py_path + '.part'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(buf.getvalue())
+    os.replace(tmp_path, py_path)
+    return py_path
+
+
+def load_ui(ui_path, widget):
+    """
+    .ui를 위젯에 적용 (uic.loadUi와 같이 하위 위젯을 widget 속성으로 설정)
+
+    컴파일/캐시에 실패하면 uic.loadUi로 대체
+
+    Args:
+        ui_path: .ui 파일 경로
+        widget: 최상위 위젯 (QMainWindow 등)
+    """
+    try:
+        py_path = compiled_path(ui_path)
+        if is_stale(ui_path, py_path):
+            compile_ui(ui_path, py_path)
+        ui_class = _load_ui_class(py_path)
+    except Exception:
+        from PyQt5 import uic
+        uic.loadUi(ui_path, widget)
+        return
+
+    ui = ui_class()
+    ui.setupUi(widget)
+
+    # uic.loadUi와 같은 방식으로 접근할 수 있도록 위젯 속성으로 복사
+    for name, value in vars(ui).items():
+        setattr(widget, name, value)
+
+
+def _load_ui_class(py_path):
+    """컴파일된 모듈에서 Ui_* 클래스 찾기"""
+    module_name = '_ui_' + os.path.splitext(os.path.basename(py_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, py_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    for name, value in vars(module).items():
+        if name.startswith('Ui_') and isinstance(value, type):
+            return value
+    raise ImportError(f"No Ui_ class in {py_path}")
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:] or [os.path.join(os.path.dirname(__file__), 'mainwindow.ui')]:
+        print(compile_ui(path))
@@ -0,0 +1,127 @@
+"""
+waveform_widget.py
+
+미리 듣기 파형 개요 위젯 (SpectrogramData.waveform의 구간별 최소/최대)
+- 재생 위치 표시, 클릭/드래그로 위치 이동
+- 파형은 크기당 한 번 이미지로 그려 두고 위치 선만 다시 그림
+"""
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPixmap
+
+
+class WaveformWidget(QWidget):
+    """파형 개요 위젯"""
+
+    # 시그널
+    seek_requested = pyqtSignal(int)  # 이동할 위치 (ms)
+
+    # 그리기 설정
+    BACKGROUND_COLOR = QColor(26, 26, 26)
+    WAVE_COLOR = QColor(0, 200, 120)
+    POSITION_COLOR = QColor(255, 255, 255)
+    TEXT_COLOR = QColor(100, 100, 100)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.waveform = None  # (구간 수, 2) int16 최소/최대 (없으면 안내 문구 표시)
+        self.position_ms = 0
+        self.duration_ms = 0
+        self._pixmap = None  # 현재 크기로 그린 파형 (크기/데이터가 바뀌면 다시 생성)
+
+    def set_waveform(self, waveform):
+        """
+        파형 개요 설정
+
+        Args:
+            waveform: SpectrogramData.waveform (None이면 지움)
+        """
+        self.waveform = waveform if waveform is not None and len(waveform) else None
+        self._pixmap = None
+        self.update()
+
+    def set_position(self, position_ms, duration_ms):
+        """재생 위치 표시 (위치 선이 움직인 부분만 다시 그림)"""
+        old_x = self._position_x()
+        self.position_ms = position_ms
+        self.duration_ms = duration_ms
+        new_x = self._position_x()
+        if new_x == old_x:
+            return
+        for x in (old_x, new_x):
+            if x is not None:
+                self.update(x - 1, 0, 3, self.height())
+
+    def _position_x(self):
+        """위치 선의 x 좌표 (표시할 수 없으면 None)"""
+        if self.waveform is None or self.duration_ms <= 0:
+            return None
+        ratio = min(max(self.position_ms / self.duration_ms, 0.0), 1.0)
+        return int(ratio * (self.width() - 1))
+
+    def resizeEvent(self, event):
+        """크기 변경 시 파형 이미지 다시 생성"""
+        self._pixmap = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        """파형 + 재생 위치 그리기"""
+        painter = QPainter(self)
+
+        if self.waveform is None:
+            painter.fillRect(event.rect(), self.BACKGROUND_COLOR)
+            painter.setPen(self.TEXT_COLOR)
+            painter.drawText(self.rect(), Qt.AlignCenter, "파형 (미리 듣기 시 표시)")
+            return
+
+        if self._pixmap is None:
+            self._pixmap = self._render()
+        painter.drawPixmap(event.rect(), self._pixmap, event.rect())
+
+        x = self._position_x()
+        if x is not None:
+            painter.setPen(self.POSITION_COLOR)
+            painter.drawLine(x, 0, x, self.height())
+
+    def _render(self):
+        """파형 이미지 생성 (화면 열마다 해당 구간들의 최소/최대를 세로선으로)"""
+        import numpy as np
+
+        width = max(self.width(), 1)
+        height = max(self.height(), 1)
+        pixmap = QPixmap(width, height)
+        pixmap.fill(self.BACKGROUND_COLOR)
+
+        waveform = self.waveform
+        starts = (np.arange(width) * len(waveform)) // width
+        lows = np.minimum.reduceat(waveform[:, 0], starts).tolist()
+        highs = np.maximum.reduceat(waveform[:, 1], starts).tolist()
+
+        middle = height / 2
+        scale = (height / 2 - 1) / 32768
+
+        painter = QPainter(pixmap)
+        painter.setPen(self.WAVE_COLOR)
+        for x, (low, high) in enumerate(zip(lows, highs)):
+            painter.drawLine(x, int(middle - high * scale), x, int(middle - low * scale))
+        painter.end()
+        return pixmap
+
+    def mousePressEvent(self, event):
+        """클릭한 위치로 이동"""
+        if event.button() == Qt.LeftButton:
+            self._seek_to(event.x())
+
+    def mouseMoveEvent(self, event):
+        """드래그 중 위치 이동"""
+        if event.buttons() & Qt.LeftButton:
+            self._seek_to(event.x())
+
+    def _seek_to(self, x):
+        """x 좌표에 해당하는 위치로 이동 요청"""
+        if self.waveform is None or self.duration_ms <= 0:
+            return
+        ratio = min(max(x / max(self.width() - 1, 1), 0.0), 1.0)
+        self.seek_requested.emit(int(ratio * self.duration_ms))
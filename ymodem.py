@@ -1,37 +1,40 @@
 """
 ymodem.py
 
-Y-MODEM 파일 전송 프로토콜 구현
+Y-MODEM 파일 전송 스레드 (ymodem_core의 Qt 어댑터)
+- 파일 경로 목록을 주면 한 세션으로 배치 전송
 """
 
-import os
-import time
 from PyQt5.QtCore import QThread, pyqtSignal
 
-
-# Y-MODEM 제어 문자
-SOH = 0x01  # 128-byte block
-STX = 0x02  # 1024-byte block
-EOT = 0x04  # End of transmission
-ACK = 0x06  # Acknowledge
-NAK = 0x15  # Negative acknowledge
-CAN = 0x18  # Cancel
-CRC16 = 0x43  # 'C' for CRC mode
+from ymodem_core import (  # noqa: F401 (기존 import 경로 호환)
+    SOH, STX, EOT, ACK, NAK, CAN, CRC16, crc16, send_file, send_files, run_blocking, TransferStats
+)
 
 
 class YModemSender(QThread):
     """Y-MODEM 파일 전송 스레드"""
 
     # 시그널
-    progress = pyqtSignal(int)  # 진행률 (0~100)
-    status = pyqtSignal(str)  # 상태 메시지
+    progress = pyqtSignal(int)  # 전체 진행률 (0~100)
+    file_started = pyqtSignal(int, int, str)  # (파일 번호, 파일 수, 파일명)
+    file_progress = pyqtSignal(int, int)  # (파일 번호, 파일별 진행률)
+    status = pyqtSignal(str)  # 상태 메시지 (대기, 재시도, 완료 등 이벤트만)
+    metrics = pyqtSignal(dict)  # 진행 지표 (bytes, bytes_per_sec, eta_seconds, retries ...)
     finished = pyqtSignal(bool, str)  # (성공 여부, 메시지)
 
     def __init__(self, serial_comm, file_path):
+        """
+        Args:
+            serial_comm: SerialComm
+            file_path: 전송할 파일 경로 또는 경로 목록 (배치)
+        """
         super().__init__()
         self.serial = serial_comm
-        self.file_path = file_path
+        self.file_paths = [file_path] if isinstance(file_path, str) else list(file_path)
+        self.file_path = self.file_paths[0] if self.file_paths else None
         self.cancel_flag = False
+        self.stats = TransferStats()  # 전송 통계 (재시도, 타임아웃, RTT, 전송 속도)
 
     def cancel(self):
         """전송 취소"""
@@ -39,176 +42,22 @@ class YModemSender(QThread):
 
     def run(self):
         """Y-MODEM 전송 실행"""
-        try:
-            # 파일 열기
-            if not os.path.exists(self.file_path):
-                self.finished.emit(False, "File not found")
-                return
-
-            file_size = os.path.getsize(self.file_path)
-            file_name = os.path.basename(self.file_path)
-
-            self.status.emit(f"Waiting for receiver... ({file_name}, {file_size} bytes)")
-
-            # 수신측 준비 대기 (C 문자)
-            if not self._wait_for_c():
-                self.finished.emit(False, "Timeout waiting for receiver")
-                return
-
-            # 첫 번째 패킷 (파일 정보) 전송
-            if not self._send_file_info_packet(file_name, file_size):
-                self.finished.emit(False, "Failed to send file info")
-                return
-
-            # 파일 데이터 전송
-            with open(self.file_path, 'rb') as f:
-                packet_num = 1
-                total_packets = (file_size + 1023) // 1024
-
-                while True:
-                    if self.cancel_flag:
-                        self._send_cancel()
-                        self.finished.emit(False, "Cancelled by user")
-                        return
-
-                    # 데이터 읽기
-                    data = f.read(1024)
-                    if not data:
-                        break  # 파일 끝
-
-                    # 패킷 전송
-                    if not self._send_data_packet(packet_num, data):
-                        self.finished.emit(False, f"Failed to send packet {packet_num}")
-                        return
-
-                    # 진행률 업데이트
-                    progress_pct = int((packet_num / total_packets) * 100)
-                    self.progress.emit(progress_pct)
-                    self.status.emit(f"Sending... {packet_num}/{total_packets} packets")
-
-                    packet_num += 1
-
-            # EOT 전송
-            if not self._send_eot():
-                self.finished.emit(False, "Failed to send EOT")
-                return
-
-            self.status.emit("Transfer complete!")
-            self.progress.emit(100)
-            self.finished.emit(True, "File transferred successfully")
-
-        except Exception as e:
-            self.finished.emit(False, f"Error: {str(e)}")
-
-    def _wait_for_c(self, timeout=10.0):
-        """'C' 문자 대기"""
-        start_time = time.time()
-
-        while (time.time() - start_time) < timeout:
-            data = self.serial.read_raw(1, timeout=0.5)
-            if data and len(data) > 0 and data[0] == CRC16:
-                return True
-
-        return False
-
-    def _send_file_info_packet(self, file_name, file_size):
-        """파일 정보 패킷 전송 (Packet 0)"""
-        # 패킷 구성: SOH + 0x00 + 0xFF + filename\0 + size + padding + CRC
-        packet = bytearray(128)
-
-        # 파일명 및 크기 저장
-        file_info = f"{file_name}\x00{file_size}".encode('utf-8')
-        packet[:len(file_info)] = file_info
-
-        # 패킷 전송
-        return self._send_packet(0, packet)
+        self.stats = TransferStats()
+        protocol = send_files(self.file_paths, cancelled=lambda: self.cancel_flag,
+                              stats=self.stats)
 
-    def _send_data_packet(self, packet_num, data):
-        """데이터 패킷 전송"""
-        # 1024 바이트로 패딩
-        packet = bytearray(data)
-        if len(packet) < 1024:
-            packet.extend(b'\x1A' * (1024 - len(packet)))  # SUB 문자로 패딩
-
-        return self._send_packet(packet_num, packet)
-
-    def _send_packet(self, packet_num, data):
-        """패킷 전송 (재시도 포함)"""
-        max_retries = 10
-
-        for retry in range(max_retries):
-            # 패킷 구성
-            if len(data) == 128:
-                header = SOH
-            else:
-                header = STX
-
-            packet_bytes = bytearray()
-            packet_bytes.append(header)
-            packet_bytes.append(packet_num & 0xFF)
-            packet_bytes.append((~packet_num) & 0xFF)
-            packet_bytes.extend(data)
-
-            # CRC-16 계산 및 추가
-            crc = self._crc16(data)
-            packet_bytes.append((crc >> 8) & 0xFF)
-            packet_bytes.append(crc & 0xFF)
-
-            # 전송
-            if not self.serial.write_raw(bytes(packet_bytes)):
-                return False
-
-            # ACK 대기
-            response = self.serial.read_raw(1, timeout=5.0)
-            if response and len(response) > 0:
-                if response[0] == ACK:
-                    return True  # 성공
-                elif response[0] == NAK:
-                    self.status.emit(f"NAK received, retrying... ({retry + 1}/{max_retries})")
-                    continue  # 재시도
-                elif response[0] == CAN:
-                    return False  # 취소
-
-            # 타임아웃
-            self.status.emit(f"Timeout, retrying... ({retry + 1}/{max_retries})")
-
-        return False  # 최대 재시도 초과
-
-    def _send_eot(self):
-        """EOT 전송"""
-        # EOT 전송
-        self.serial.write_raw(bytes([EOT]))
-
-        # ACK 대기
-        response = self.serial.read_raw(1, timeout=5.0)
-        if response and len(response) > 0 and response[0] == ACK:
-            # Null 패킷 대기 (일부 수신기)
-            self._wait_for_c(timeout=2.0)
-            # Null 패킷 전송
-            null_packet = bytes([SOH, 0x00, 0xFF] + [0] * 128 + [0, 0])
-            self.serial.write_raw(null_packet)
-            response = self.serial.read_raw(1, timeout=5.0)
-            return True
-
-        return False
-
-    def _send_cancel(self):
-        """전송 취소"""
-        self.serial.write_raw(bytes([CAN, CAN, CAN, CAN, CAN]))
-
-    def _crc16(self, data):
-        """CRC-16 계산"""
-        crc = 0
-
-        for byte in data:
-            crc ^= byte << 8
-
-            for _ in range(8):
-                if crc & 0x8000:
-                    crc = (crc << 1) ^ 0x1021
-                else:
-                    crc = crc << 1
-
-                crc &= 0xFFFF
-
-        return crc
+        # 전송 중에는 수신 데이터를 모두 프로토콜로 전달 (텍스트 줄로 해석하지 않음)
+        self.serial.set_binary_mode(True)
+        try:
+            success, message = run_blocking(protocol,
+                                            write=self.serial.write_raw,
+                                            read=self.serial.read_raw,
+                                            on_progress=self.progress.emit,
+                                            on_status=self.status.emit,
+                                            on_file=self.file_started.emit,
+                                            on_file_progress=self.file_progress.emit,
+                                            on_metrics=self.metrics.emit)
+        finally:
+            self.serial.set_binary_mode(False)
+
+        self.finished.emit(success, message)
@@ -0,0 +1,696 @@
+"""
+ymodem_core.py
+
+Y-MODEM 송신 프로토콜 (Qt / 입출력 비의존)
+
+프로토콜은 제너레이터로 구현:
+- 입출력 요청 (WRITE, READ)과 이벤트 (PROGRESS, STATUS, FILE, FILE_PROGRESS, METRICS)를 yield
+- 구동 함수(run_blocking / run_async)가 실제 포트에서 처리 후 결과를 send
+- 종료 시 (성공 여부, 메시지)를 반환
+- 진행률 이벤트는 패킷마다가 아니라 시간 + 퍼센트 변화 기준으로 제한 (PROGRESS_INTERVAL, PROGRESS_STEP)
+- send_files(): 여러 파일을 한 세션으로 전송 (배치, 파일 사이 핸드셰이크 없음)
+
+ACK 대기 시간은 고정값이 아니라 측정한 왕복 시간(RTT)으로 계산 (RFC 6298 방식)
+- 재전송한 패킷의 ACK는 어느 전송에 대한 응답인지 알 수 없으므로 측정에서 제외 (Karn)
+- 타임아웃마다 대기 시간을 2배로 늘리되 MAX_RTO를 넘지 않음
+"""
+
+import os
+import time
+
+import instrumentation
+
+
+# Y-MODEM 제어 문자
+SOH = 0x01  # 128-byte block
+STX = 0x02  # 1024-byte block
+EOT = 0x04  # End of transmission
+ACK = 0x06  # Acknowledge
+NAK = 0x15  # Negative acknowledge
+CAN = 0x18  # Cancel
+CRC16 = 0x43  # 'C' for CRC mode
+
+BLOCK_SIZE = 1024
+MAX_RETRIES = 10
+
+# ACK 대기 시간 (초)
+INITIAL_RTO = 1.0  # 측정 전 초기값
+MIN_RTO = 1.0  # 하한 (보드의 SD 쓰기 지연 대비)
+MAX_RTO = 5.0  # 상한 (백오프 포함)
+C_TIMEOUT = 10.0  # 수신측 'C' 대기
+
+# 프로토콜 요청 종류
+WRITE = 'write'  # (WRITE, data) → bool
+READ = 'read'  # (READ, size, timeout) → bytes (실패 시 None)
+PROGRESS = 'progress'  # (PROGRESS, percent) - 전체 진행률 (배치는 바이트 기준)
+FILE = 'file'  # (FILE, index, count, name) - 파일 전송 시작
+FILE_PROGRESS = 'file_progress'  # (FILE_PROGRESS, index, percent) - 파일별 진행률
+METRICS = 'metrics'  # (METRICS, dict) - 진행 지표 (_ProgressReporter.metrics())
+STATUS = 'status'  # (STATUS, message)
+
+# 진행률 이벤트 제한: 마지막 보고 후 PROGRESS_INTERVAL초가 지나고 PROGRESS_STEP% 이상 진행했을 때만
+# (파일 끝에서는 항상 보고)
+PROGRESS_INTERVAL = 0.1
+PROGRESS_STEP = 1
+
+# 배치 업로드 (UPLOAD <CH> *) - 제안 단계, 펌웨어 미구현
+# HELLO 응답에 BATCH_CAPABILITY가 있는 보드에만 사용 (그 외에는 파일마다 UPLOAD <CH> <이름>)
+BATCH_FILE_NAME = '*'
+BATCH_CAPABILITY = 'BATCH'
+
+
+def supports_batch(hello_response):
+    """
+    HELLO 응답으로 배치 업로드 지원 여부 확인
+
+    Args:
+        hello_response: HELLO 응답 줄 목록 (예: ['OK AUDIO_MUX v1.10 STM32H723 BATCH'])
+
+    Returns:
+        bool: 응답에 BATCH_CAPABILITY가 있으면 True
+    """
+    return any(line.startswith('OK AUDIO_MUX') and BATCH_CAPABILITY in line.split()[2:]
+               for line in hello_response)
+
+
+def _make_crc_table():
+    """CRC-16/XMODEM 테이블 (다항식 0x1021)"""
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC_TABLE = _make_crc_table()
+
+
+def crc16(data):
+    """CRC-16 계산 (테이블 방식)"""
+    crc = 0
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+class RttEstimator:
+    """ACK 왕복 시간 추정 (SRTT / RTTVAR, RFC 6298)"""
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, initial=INITIAL_RTO, min_rto=MIN_RTO, max_rto=MAX_RTO):
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.srtt = None
+        self.rttvar = None
+        self.rto = initial
+        self.samples = 0
+
+    def sample(self, rtt):
+        """측정값 반영 후 대기 시간 다시 계산 (백오프 해제)"""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.samples += 1
+        self.rto = min(max(self.srtt + self.K * self.rttvar, self.min_rto), self.max_rto)
+
+    def backoff(self):
+        """타임아웃 후 대기 시간 2배 (상한 max_rto)"""
+        self.rto = min(self.rto * 2, self.max_rto)
+
+    @property
+    def timeout(self):
+        """현재 ACK 대기 시간 (초)"""
+        return self.rto
+
+
+class TransferStats:
+    """전송 1회의 통계 (재시도, 타임아웃, RTT, 실효 전송 속도)"""
+
+    def __init__(self):
+        self.rtt = RttEstimator()
+        self.packets = 0  # ACK 받은 패킷 수
+        self.bytes = 0  # ACK 받은 파일 데이터 (바이트)
+        self.retries = 0  # 재전송 횟수
+        self.timeouts = 0  # ACK 타임아웃 횟수
+        self.naks = 0  # NAK 수신 횟수
+        self.files = []  # 완료된 파일별 {'file', 'bytes', 'seconds'}
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def seconds(self):
+        """수신측 준비('C') 이후 경과 시간"""
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.monotonic()
+        return end - self.start_time
+
+    def as_dict(self):
+        """
+        통계 dict
+
+        Returns:
+            dict: {'packets', 'bytes', 'retries', 'timeouts', 'naks', 'seconds',
+                   'bytes_per_sec', 'srtt_ms', 'rttvar_ms', 'rto_ms', 'files'}
+        """
+        seconds = self.seconds
+        rtt = self.rtt
+        return {
+            'packets': self.packets,
+            'bytes': self.bytes,
+            'retries': self.retries,
+            'timeouts': self.timeouts,
+            'naks': self.naks,
+            'seconds': round(seconds, 3),
+            'bytes_per_sec': round(self.bytes / seconds) if seconds > 0 else 0,
+            'srtt_ms': round(rtt.srtt * 1000, 1) if rtt.srtt is not None else None,
+            'rttvar_ms': round(rtt.rttvar * 1000, 1) if rtt.rttvar is not None else None,
+            'rto_ms': round(rtt.rto * 1000, 1),
+            'files': list(self.files),
+        }
+
+
+class _ProgressReporter:
+    """진행률 이벤트 제한 (시간 + 퍼센트 변화 기준) 및 진행 지표 계산"""
+
+    def __init__(self, stats, total_bytes, file_count,
+                 interval=PROGRESS_INTERVAL, step=PROGRESS_STEP):
+        self.stats = stats
+        self.total_bytes = total_bytes
+        self.file_count = file_count
+        self.interval = interval
+        self.step = step
+        self.file_index = 0
+        self.file_name = ''
+        self.last_percent = -step
+        self.last_time = 0.0
+
+    def start_file(self, index, file_name):
+        """파일 전송 시작"""
+        self.file_index = index
+        self.file_name = file_name
+
+    @property
+    def percent(self):
+        """전체 진행률 (바이트 기준)"""
+        if not self.total_bytes:
+            return 100
+        return int(self.stats.bytes * 100 / self.total_bytes)
+
+    def metrics(self):
+        """
+        현재 진행 지표
+
+        Returns:
+            dict: {'file_index', 'file_count', 'file', 'bytes', 'total_bytes', 'percent',
+                   'seconds', 'bytes_per_sec', 'eta_seconds', 'retries', 'timeouts', 'naks'}
+        """
+        stats = self.stats
+        seconds = stats.seconds
+        rate = stats.bytes / seconds if seconds > 0 else 0.0
+        remaining = self.total_bytes - stats.bytes
+        return {
+            'file_index': self.file_index,
+            'file_count': self.file_count,
+            'file': self.file_name,
+            'bytes': stats.bytes,
+            'total_bytes': self.total_bytes,
+            'percent': self.percent,
+            'seconds': round(seconds, 3),
+            'bytes_per_sec': round(rate),
+            'eta_seconds': round(remaining / rate, 1) if rate > 0 else None,
+            'retries': stats.retries,
+            'timeouts': stats.timeouts,
+            'naks': stats.naks,
+        }
+
+    def report(self, file_percent, force=False):
+        """
+        보고할 때가 되었으면 FILE_PROGRESS / PROGRESS / METRICS 이벤트 yield (제너레이터)
+
+        Args:
+            file_percent: 현재 파일 진행률
+            force: 제한 없이 보고 (파일 끝)
+        """
+        percent = self.percent
+        now = time.monotonic()
+        if not force and (percent - self.last_percent < self.step
+                          or now - self.last_time < self.interval):
+            return
+
+        self.last_percent = percent
+        self.last_time = now
+        yield (FILE_PROGRESS, self.file_index, file_percent)
+        yield (PROGRESS, percent)
+        yield (METRICS, self.metrics())
+
+
+def build_packet(packet_num, data):
+    """
+    패킷 구성: 헤더 + 번호 + ~번호 + 데이터 + CRC
+
+    Args:
+        packet_num: 패킷 번호
+        data: 128 또는 1024 바이트 데이터
+    """
+    header = SOH if len(data) == 128 else STX
+    crc = crc16(data)
+    return (bytes([header, packet_num & 0xFF, (~packet_num) & 0xFF])
+            + bytes(data)
+            + bytes([(crc >> 8) & 0xFF, crc & 0xFF]))
+
+
+def send_file(file_path, cancelled=None, stats=None):
+    """
+    파일 1개 송신 프로토콜 (제너레이터)
+
+    Args:
+        file_path: 전송할 파일 경로
+        cancelled: 취소 여부를 반환하는 함수 (패킷마다 확인)
+        stats: 통계를 기록할 TransferStats (None이면 내부에서 생성)
+
+    Returns:
+        tuple: (성공 여부, 메시지) - StopIteration 값으로 전달
+    """
+    return (yield from send_files([file_path], cancelled, stats))
+
+
+def send_files(file_paths, cancelled=None, stats=None):
+    """
+    여러 파일을 한 세션으로 송신하는 프로토콜 (Y-MODEM 배치, 제너레이터)
+
+    파일마다 Packet 0 (이름, 크기 - 여러 파일이면 수정 시각, 모드 포함) → 데이터 → EOT를
+    보내고, 마지막 파일 뒤에 Null Packet 0으로 세션 종료
+
+    Args:
+        file_paths: 전송할 파일 경로 목록
+        cancelled: 취소 여부를 반환하는 함수 (패킷마다 확인)
+        stats: 통계를 기록할 TransferStats (None이면 내부에서 생성)
+
+    Returns:
+        tuple: (성공 여부, 메시지) - StopIteration 값으로 전달
+    """
+    stats = stats if stats is not None else TransferStats()
+    result = (False, "Interrupted")
+    try:
+        result = yield from _send_batch(list(file_paths), cancelled, stats)
+        return result
+    finally:
+        stats.end_time = time.monotonic()
+        if instrumentation.enabled:
+            _record_transfer(stats, result[0])
+
+
+def _record_transfer(stats, success):
+    """전송 1회의 합계를 계측값에 기록"""
+    instrumentation.count('ymodem_transfers_total')
+    if not success:
+        instrumentation.count('ymodem_failed_transfers_total')
+    instrumentation.count('ymodem_bytes_total', stats.bytes)
+    instrumentation.count('ymodem_retries_total', stats.retries)
+    instrumentation.count('ymodem_timeouts_total', stats.timeouts)
+    instrumentation.count('ymodem_naks_total', stats.naks)
+    if stats.bytes and stats.seconds > 0:
+        instrumentation.observe('ymodem_throughput_bytes_per_second', stats.bytes / stats.seconds)
+
+
+def _send_batch(file_paths, cancelled, stats):
+    """send_files() 본체"""
+    missing = [p for p in file_paths if not os.path.exists(p)]
+    if missing:
+        return False, "File not found" if len(file_paths) == 1 else f"File not found: {missing[0]}"
+
+    sizes = [os.path.getsize(p) for p in file_paths]
+    total_bytes = sum(sizes)
+    count = len(file_paths)
+
+    if count == 1:
+        summary = f"{os.path.basename(file_paths[0])}, {sizes[0]} bytes"
+    else:
+        summary = f"{count} files, {total_bytes} bytes"
+    yield (STATUS, f"Waiting for receiver... ({summary})")
+
+    # 수신측 준비 대기 (C 문자)
+    if not (yield from _wait_for_c()):
+        return False, "Timeout waiting for receiver"
+    stats.start_time = time.monotonic()
+    progress = _ProgressReporter(stats, total_bytes, count)
+
+    for index, file_path in enumerate(file_paths):
+        # 다음 파일의 Packet 0 요청 (이전 파일의 EOT ACK 뒤에 'C')
+        if index and not (yield from _wait_for_c()):
+            return False, "Timeout waiting for receiver"
+
+        ok, message = yield from _send_one(file_path, index, count, progress, cancelled, stats,
+                                           batch=count > 1)
+        if not ok:
+            return False, message if count == 1 else f"{os.path.basename(file_path)}: {message}"
+
+    # Null Packet 0으로 세션 종료
+    yield from _end_batch(stats)
+
+    yield (STATUS, "Transfer complete!")
+    if count == 1:
+        return True, "File transferred successfully"
+    return True, f"{count} files transferred successfully"
+
+
+def _send_one(file_path, index, count, progress, cancelled, stats, batch=False):
+    """배치 중 파일 1개 전송 (Packet 0 ~ EOT, batch면 Packet 0에 수정 시각/모드 포함)"""
+    file_stat = os.stat(file_path)
+    file_size = file_stat.st_size
+    file_name = os.path.basename(file_path)
+    file_start = time.monotonic()
+    bytes_before = stats.bytes
+
+    progress.start_file(index, file_name)
+    yield (FILE, index, count, file_name)
+
+    # 첫 번째 패킷 (파일 정보) 전송
+    if not (yield from _send_file_info_packet(file_name, file_stat, stats, batch)):
+        return False, "Failed to send file info"
+
+    # 파일 데이터 전송
+    with open(file_path, 'rb') as f:
+        packet_num = 1
+        total_packets = (file_size + BLOCK_SIZE - 1) // BLOCK_SIZE
+
+        while True:
+            if cancelled is not None and cancelled():
+                yield (WRITE, bytes([CAN] * 5))
+                return False, "Cancelled by user"
+
+            with instrumentation.timer('ymodem_disk_read_seconds'):
+                data = f.read(BLOCK_SIZE)
+            if not data:
+                break  # 파일 끝
+
+            if not (yield from _send_data_packet(packet_num, data, stats)):
+                return False, f"Failed to send packet {packet_num}"
+            stats.bytes += len(data)
+
+            yield from progress.report(int((packet_num / total_packets) * 100))
+
+            packet_num += 1
+
+    # EOT 전송
+    if not (yield from _send_eot(stats)):
+        return False, "Failed to send EOT"
+
+    yield from progress.report(100, force=True)
+    stats.files.append({
+        'file': file_name,
+        'bytes': stats.bytes - bytes_before,
+        'seconds': round(time.monotonic() - file_start, 3),
+    })
+    return True, "File transferred successfully"
+
+
+def _wait_for_c(timeout=C_TIMEOUT):
+    """'C' 문자 대기 (수신 즉시 반환, 다른 문자는 무시)"""
+    deadline = time.monotonic() + timeout
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        data = yield (READ, 1, remaining)
+        if data and data[0] == CRC16:
+            return True
+
+
+def file_info(file_name, file_stat, batch=False):
+    """
+    Packet 0 내용: filename\0 + 크기
+
+    batch면 크기 뒤에 수정 시각(8진수, epoch 초) + 모드(8진수) 추가
+    (모드는 Unix에서 만든 파일이 아니면 0 - Y-MODEM 규격)
+    """
+    if not batch:
+        return f"{file_name}\x00{file_stat.st_size}".encode('utf-8')
+    mode = file_stat.st_mode if os.name == 'posix' else 0
+    return (f"{file_name}\x00{file_stat.st_size} {int(file_stat.st_mtime):o} {mode:o}"
+            .encode('utf-8'))
+
+
+def _send_file_info_packet(file_name, file_stat, stats, batch=False):
+    """파일 정보 패킷 전송 (Packet 0, 128 바이트에 들어가지 않으면 1024 바이트)"""
+    info = file_info(file_name, file_stat, batch)
+    packet = bytearray(128 if len(info) < 128 else BLOCK_SIZE)
+    packet[:len(info)] = info
+
+    if not (yield from _send_packet(0, packet, stats)):
+        return False
+
+    # 수신측은 Packet 0의 ACK 뒤에 데이터 수신 준비로 'C'를 다시 보냄
+    # (기다리지 않으면 이 'C'가 Packet 1의 응답 자리에 읽혀 불필요한 재전송 발생)
+    yield from _wait_for_c(timeout=stats.rtt.timeout)
+    return True
+
+
+def _send_data_packet(packet_num, data, stats):
+    """데이터 패킷 전송 (SUB 문자로 1024 바이트 패딩)"""
+    packet = bytearray(data)
+    if len(packet) < BLOCK_SIZE:
+        packet.extend(b'\x1A' * (BLOCK_SIZE - len(packet)))
+
+    return (yield from _send_packet(packet_num, packet, stats))
+
+
+def _send_packet(packet_num, data, stats):
+    """패킷 전송 (재시도 포함)"""
+    with instrumentation.timer('ymodem_packet_build_seconds'):
+        frame = build_packet(packet_num, data)
+    ok = yield from _send_with_retry(frame, stats)
+    if ok:
+        stats.packets += 1
+    return ok
+
+
+def _send_with_retry(frame, stats):
+    """
+    프레임 전송 후 ACK 대기 (NAK는 즉시, 타임아웃은 백오프 후 재전송)
+
+    재전송 전에는 수신 버퍼를 비움 (늦게 도착한 이전 프레임의 ACK를
+    재전송한 프레임의 응답으로 읽으면 stop-and-wait 순서가 어긋남)
+
+    Returns:
+        bool: ACK 수신 여부
+    """
+    rtt = stats.rtt
+
+    for retry in range(MAX_RETRIES):
+        if retry:
+            stats.retries += 1
+            yield from _discard_input()
+
+        sent_at = time.monotonic()
+        with instrumentation.timer('ymodem_write_seconds'):
+            written = yield (WRITE, frame)
+        if not written:
+            return False
+
+        # ACK 대기 (그 외 문자는 무시하고 남은 시간 동안 계속 대기)
+        written_at = time.monotonic()
+        response = yield from _read_control(sent_at + rtt.timeout)
+        if response == ACK:
+            acked_at = time.monotonic()
+            instrumentation.observe('ymodem_ack_latency_seconds', acked_at - written_at)
+            if not retry:
+                rtt.sample(acked_at - sent_at)
+            return True
+        elif response == NAK:
+            stats.naks += 1
+            yield (STATUS, f"NAK received, retrying... ({retry + 1}/{MAX_RETRIES})")
+            continue
+        elif response == CAN:
+            return False
+
+        stats.timeouts += 1
+        rtt.backoff()
+        yield (STATUS, f"Timeout, retrying... ({retry + 1}/{MAX_RETRIES})")
+
+    return False  # 최대 재시도 초과
+
+
+def _discard_input():
+    """이미 수신된 데이터를 모두 읽어서 버림 (대기하지 않음)"""
+    while (yield (READ, BLOCK_SIZE, 0)):
+        pass
+
+
+def _read_control(deadline):
+    """
+    deadline까지 ACK / NAK / CAN 중 하나를 기다림
+
+    Returns:
+        int: 수신한 제어 문자 (타임아웃 시 None)
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        data = yield (READ, 1, remaining)
+        if data and data[0] in (ACK, NAK, CAN):
+            return data[0]
+
+
+def _send_eot(stats):
+    """EOT 전송"""
+    return (yield from _send_with_retry(bytes([EOT]), stats))
+
+
+def _end_batch(stats):
+    """Null 패킷으로 배치 종료"""
+    # Null 패킷 대기 (일부 수신기)
+    yield from _wait_for_c(timeout=2.0)
+    yield (WRITE, bytes([SOH, 0x00, 0xFF] + [0] * 128 + [0, 0]))
+    yield (READ, 1, stats.rtt.timeout)
+    return True
+
+
+def run_blocking(protocol, write, read, on_progress=None, on_status=None, on_file=None,
+                 on_file_progress=None, on_metrics=None):
+    """
+    프로토콜을 블로킹 입출력으로 실행
+
+    Args:
+        protocol: send_file() / send_files() 제너레이터
+        write: f(data) → bool
+        read: f(size, timeout) → bytes
+        on_progress: f(percent)
+        on_status: f(message)
+        on_file: f(index, count, name) - 배치 중 파일 전송 시작
+        on_file_progress: f(index, percent) - 파일별 진행률
+        on_metrics: f(dict) - 진행 지표 (바이트, 속도, 남은 시간, 재시도)
+
+    Returns:
+        tuple: (성공 여부, 메시지)
+    """
+    try:
+        request = next(protocol)
+        while True:
+            kind = request[0]
+            result = None
+            if kind == WRITE:
+                result = write(request[1])
+            elif kind == READ:
+                result = read(request[1], request[2])
+            elif kind == PROGRESS and on_progress:
+                on_progress(request[1])
+            elif kind == STATUS and on_status:
+                on_status(request[1])
+            elif kind == FILE and on_file:
+                on_file(*request[1:])
+            elif kind == FILE_PROGRESS and on_file_progress:
+                on_file_progress(*request[1:])
+            elif kind == METRICS and on_metrics:
+                on_metrics(request[1])
+            request = protocol.send(result)
+
+    except StopIteration as e:
+        return e.value
+
+    except Exception as e:
+        protocol.close()
+        return False, f"Error: {str(e)}"
+
+
+async def run_async(protocol, port, on_progress=None, on_status=None, on_file=None,
+                    on_file_progress=None, on_metrics=None):
+    """
+    프로토콜을 AsyncSerialPort에서 실행
+
+    Args:
+        protocol: send_file() / send_files() 제너레이터
+        port: serial_async.AsyncSerialPort
+        on_progress: f(percent)
+        on_status: f(message)
+        on_file: f(index, count, name) - 배치 중 파일 전송 시작
+        on_file_progress: f(index, percent) - 파일별 진행률
+        on_metrics: f(dict) - 진행 지표 (바이트, 속도, 남은 시간, 재시도)
+
+    Returns:
+        tuple: (성공 여부, 메시지)
+    """
+    try:
+        request = next(protocol)
+        while True:
+            kind = request[0]
+            result = None
+            if kind == WRITE:
+                await port.write(request[1])
+                result = True
+            elif kind == READ:
+                result = await port.read(request[1], request[2])
+            elif kind == PROGRESS and on_progress:
+                on_progress(request[1])
+            elif kind == STATUS and on_status:
+                on_status(request[1])
+            elif kind == FILE and on_file:
+                on_file(*request[1:])
+            elif kind == FILE_PROGRESS and on_file_progress:
+                on_file_progress(*request[1:])
+            elif kind == METRICS and on_metrics:
+                on_metrics(request[1])
+            request = protocol.send(result)
+
+    except StopIteration as e:
+        return e.value
+
+    except Exception as e:
+        protocol.close()
+        return False, f"Error: {str(e)}"
+
+
+async def send_file_async(port, file_path, on_progress=None, on_status=None, cancel_event=None,
+                          stats=None):
+    """
+    AsyncSerialPort로 파일 1개 전송
+
+    Args:
+        port: serial_async.AsyncSerialPort (UPLOAD 명령으로 수신 준비된 상태)
+        file_path: 전송할 파일 경로
+        on_progress: f(percent)
+        on_status: f(message)
+        cancel_event: 설정되면 전송 취소 (asyncio.Event 등 is_set() 지원 객체)
+        stats: 통계를 기록할 TransferStats
+
+    Returns:
+        tuple: (성공 여부, 메시지)
+    """
+    cancelled = cancel_event.is_set if cancel_event is not None else None
+    return await run_async(send_file(file_path, cancelled, stats), port, on_progress, on_status)
+
+
+async def send_files_async(port, file_paths, on_progress=None, on_status=None, on_file=None,
+                           on_file_progress=None, on_metrics=None, cancel_event=None, stats=None):
+    """
+    AsyncSerialPort로 여러 파일을 한 세션에 전송 (Y-MODEM 배치)
+
+    Args:
+        port: serial_async.AsyncSerialPort (UPLOAD 명령으로 수신 준비된 상태)
+        file_paths: 전송할 파일 경로 목록
+        on_progress: f(percent) - 전체 진행률
+        on_status: f(message)
+        on_file: f(index, count, name)
+        on_file_progress: f(index, percent)
+        on_metrics: f(dict)
+        cancel_event: 설정되면 전송 취소 (asyncio.Event 등 is_set() 지원 객체)
+        stats: 통계를 기록할 TransferStats
+
+    Returns:
+        tuple: (성공 여부, 메시지)
+    """
+    cancelled = cancel_event.is_set if cancel_event is not None else None
+    return await run_async(send_files(file_paths, cancelled, stats), port, on_progress, on_status,
+                           on_file, on_file_progress, on_metrics)